@@ -45,7 +45,6 @@ setup(
     install_requires=[
         "fastapi>=0.70.0,<1",
         "pydantic>=1.8,<2.0.0",
-        "starlette_context",
         "python-dateutil",
         "babel",
         "uvicorn[standard]",
@@ -81,6 +80,7 @@ setup(
         "all": [
             "starlette-opentracing",
             "starlette-exporter",
+            "numpy",
         ],
     },
     entry_points={"console_scripts": ["vs = skill_sdk.__main__:main"]},
@@ -21,21 +21,67 @@
 
 """Magenta Voice Skill SDK for Python"""
 
+import importlib
+from typing import Any, Text, TYPE_CHECKING
+
 from .__version__ import __version__
 
-from skill_sdk.skill import init_app, Skill
-
-from skill_sdk.responses import (
-    Card,
-    CardAction,
-    Response,
-    ResponseType,
-    Reprompt,
-    SkillInfoResponse,
-    SkillInvokeResponse,
-    ask,
-    ask_freetext,
-    tell,
-)
-
-from skill_sdk.intents import Request
+if TYPE_CHECKING:  # pragma: no cover
+    from skill_sdk.skill import init_app, Skill
+    from skill_sdk.responses import (
+        Card,
+        CardAction,
+        Response,
+        ResponseType,
+        Reprompt,
+        SkillInfoResponse,
+        SkillInvokeResponse,
+        ask,
+        ask_freetext,
+        tell,
+    )
+    from skill_sdk.intents import Request
+
+#
+# Public names are imported lazily (on first access) to speed up cold start:
+#   importing the package itself does not import FastAPI, Babel, Pydantic models etc.
+#
+_EXPORTS = {
+    "init_app": "skill_sdk.skill",
+    "Skill": "skill_sdk.skill",
+    "Card": "skill_sdk.responses",
+    "CardAction": "skill_sdk.responses",
+    "Response": "skill_sdk.responses",
+    "ResponseType": "skill_sdk.responses",
+    "Reprompt": "skill_sdk.responses",
+    "SkillInfoResponse": "skill_sdk.responses",
+    "SkillInvokeResponse": "skill_sdk.responses",
+    "ask": "skill_sdk.responses",
+    "ask_freetext": "skill_sdk.responses",
+    "tell": "skill_sdk.responses",
+    "Request": "skill_sdk.intents",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+
+def __getattr__(name: Text) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        # Submodules accessed as attributes ("skill_sdk.intents" after "import skill_sdk")
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as ex:
+            if ex.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
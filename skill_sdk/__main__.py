@@ -13,8 +13,12 @@ import argparse
 
 from skill_sdk.cli import (
     add_logging_options,
+    bench,
     init,
     develop,
+    openapi,
+    profile_startup,
+    replay,
     run,
     translate,
     version,
@@ -48,6 +52,18 @@ def main() -> None:
     # Run the skill in development mode (with Designer UI)
     develop.add_subparser(subparsers)
 
+    # Generate OpenAPI schema file
+    openapi.add_subparser(subparsers)
+
+    # Profile the skill startup
+    profile_startup.add_subparser(subparsers)
+
+    # Benchmark the skill throughput
+    bench.add_subparser(subparsers)
+
+    # Replay captured invoke requests
+    replay.add_subparser(subparsers)
+
     # Extracts translatable strings from Python modules
     translate.add_subparser(subparsers)
 
@@ -0,0 +1,516 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""CLI: "bench" command"""
+
+#
+# Throughput benchmark:
+#
+#   - invoke requests are created from intent examples (the ones shown in Swagger UI),
+#   - the app is driven in-process (ASGI transport) or a running server is called ("--url"),
+#   - reports RPS, latency percentiles, error rate, total and per intent,
+#   - with "--soak", samples resource usage of the app driven in-process and fails if it keeps growing
+#
+
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import logging
+import pathlib
+from collections import Counter
+from contextlib import asynccontextmanager, closing
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Text
+
+import httpx
+import orjson
+
+from skill_sdk.cli import (
+    add_env_file_argument,
+    add_module_argument,
+    import_module_app,
+    process_env_file,
+    soak,
+)
+
+logger = logging.getLogger(__name__)
+
+# Latency percentiles reported
+PERCENTILES = (50, 90, 95, 99)
+
+# Base URL of the app driven in-process
+IN_PROCESS = "http://in-process"
+
+# Number of latencies kept per intent in soak mode: the benchmark itself should not grow
+SOAK_RESERVOIR = 10000
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile
+
+    :param values:  sorted values
+    :param p:       percentile (0-100)
+    :return:
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class Stats:
+    """Request latencies and errors"""
+
+    __slots__ = ("latencies", "errors", "count", "total", "maximum", "reservoir")
+
+    def __init__(self, reservoir: Optional[int] = None) -> None:
+        """
+        :param reservoir:   number of latencies kept (uniform sample for percentiles), all if not set
+        """
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.reservoir = reservoir
+
+    def add(self, seconds: float, ok: bool) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        if self.reservoir is None or len(self.latencies) < self.reservoir:
+            self.latencies.append(seconds)
+        else:
+            index = random.randrange(self.count)  # nosec: not for security
+            if index < self.reservoir:
+                self.latencies[index] = seconds
+        if not ok:
+            self.errors += 1
+
+    def merge(self, other: "Stats") -> None:
+        """Add the latencies and errors of other stats (exact if both keep all latencies)"""
+
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    def summary(self, duration: float) -> Dict[Text, Any]:
+        """
+        Number of requests, RPS, error rate and latency percentiles (in milliseconds)
+
+        :param duration:    benchmark duration in seconds
+        :return:
+        """
+        latencies = sorted(self.latencies)
+        count = self.count
+        latency = dict(
+            mean=round(self.total / count * 1000, 3) if count else 0.0,
+            **{f"p{p}": round(percentile(latencies, p) * 1000, 3) for p in PERCENTILES},
+            max=round(self.maximum * 1000, 3),
+        )
+        return dict(
+            requests=count,
+            errors=self.errors,
+            error_rate=round(self.errors / count, 6) if count else 0.0,
+            rps=round(count / duration, 3) if duration else 0.0,
+            latency=latency,
+        )
+
+
+def parse_mix(
+    values: Optional[Iterable[Text]], intents: Iterable[Text]
+) -> Dict[Text, float]:
+    """
+    Parse intent mix: "INTENT" or "INTENT=WEIGHT" values (all intents with equal weights, if empty)
+
+    :param values:  intent mix values
+    :param intents: intents implemented by the skill
+    :return:        {intent name: weight}
+    """
+    intents = list(intents)
+    if not values:
+        return {intent: 1.0 for intent in intents}
+
+    mix: Dict[Text, float] = {}
+    for value in values:
+        intent, _, weight = value.partition("=")
+        if intent not in intents:
+            raise ValueError(
+                f"Intent {repr(intent)} is not implemented, use one of {intents}"
+            )
+        mix[intent] = float(weight) if weight else 1.0
+    return mix
+
+
+class Bench:
+    """Load generator: a number of concurrent clients sending invoke requests"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        path: Text,
+        bodies: Dict[Text, Dict[Text, Any]],
+        mix: Dict[Text, float],
+        concurrency: int = 10,
+        duration: float = 10,
+        requests: Optional[int] = None,
+        seed: Optional[int] = None,
+        reservoir: Optional[int] = None,
+    ) -> None:
+        """
+        :param client:      HTTP client (with base URL and credentials)
+        :param path:        invoke endpoint path
+        :param bodies:      invoke request bodies by intent name
+        :param mix:         intent weights
+        :param concurrency: number of concurrent requests
+        :param duration:    benchmark duration in seconds
+        :param requests:    maximal number of requests (unlimited if not set)
+        :param seed:        random seed to repeat the intent sequence
+        :param reservoir:   number of latencies kept per intent (all if not set)
+        """
+        self.client = client
+        self.path = path
+        self.bodies = {intent: orjson.dumps(bodies[intent]) for intent in mix}
+        self.intents = list(mix)
+        self.weights = list(mix.values())
+        self.concurrency = concurrency
+        self.duration = duration
+        self.requests = requests
+        self.random = random.Random(seed)
+
+        self.stats: Dict[Text, Stats] = {intent: Stats(reservoir) for intent in mix}
+        self.total = Stats(reservoir)
+        self.status: Dict[Text, int] = Counter()
+        self.sent = 0
+        self.elapsed = 0.0
+
+    async def run(self) -> Dict[Text, Any]:
+        """Run the benchmark and return the report"""
+
+        begin = time.perf_counter()
+        deadline = begin + self.duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(self.concurrency)))
+        self.elapsed = time.perf_counter() - begin
+        return self.report()
+
+    async def worker(self, deadline: float) -> None:
+        """Send the requests one after another until deadline"""
+
+        headers = {"Content-Type": "application/json"}
+        while time.perf_counter() < deadline:
+            if self.requests is not None and self.sent >= self.requests:
+                break
+            self.sent += 1
+
+            intent = self.random.choices(self.intents, self.weights)[0]
+            begin = time.perf_counter()
+            try:
+                response = await self.client.post(
+                    self.path, content=self.bodies[intent], headers=headers
+                )
+                status, ok = str(response.status_code), response.is_success
+            except httpx.HTTPError as ex:
+                status, ok = type(ex).__name__, False
+            seconds = time.perf_counter() - begin
+            self.stats[intent].add(seconds, ok)
+            self.total.add(seconds, ok)
+            self.status[status] += 1
+
+            # In-process app may complete a request without suspending: let other tasks run
+            await asyncio.sleep(0)
+
+    def report(self) -> Dict[Text, Any]:
+        """Totals and per intent statistics"""
+
+        return dict(
+            target=str(self.client.base_url),
+            concurrency=self.concurrency,
+            duration=round(self.elapsed, 3),
+            **self.total.summary(self.elapsed),
+            status=dict(self.status),
+            intents={
+                intent: stats.summary(self.elapsed)
+                for intent, stats in self.stats.items()
+            },
+        )
+
+
+def format_table(report: Dict[Text, Any]) -> Text:
+    """
+    Format the report as table
+
+    :param report:
+    :return:
+    """
+    columns = ["mean", *(f"p{p}" for p in PERCENTILES), "max"]
+    header = f"{'Intent':<32}{'Requests':>10}{'Errors':>8}{'RPS':>10}" + "".join(
+        f"{column:>9}" for column in columns
+    )
+
+    def row(name: Text, summary: Dict[Text, Any]) -> Text:
+        return (
+            f"{name:<32}{summary['requests']:>10}{summary['errors']:>8}{summary['rps']:>10.1f}"
+            + "".join(f"{summary['latency'][column]:>9.2f}" for column in columns)
+        )
+
+    lines = [
+        f"Target: {report['target']}, concurrency: {report['concurrency']}, "
+        f"duration: {report['duration']:.1f}s",
+        f"Requests: {report['requests']}, RPS: {report['rps']:.1f}, "
+        f"errors: {report['errors']} ({report['error_rate']:.2%})",
+        f"Status codes: {report['status']}",
+        "",
+        header + "  (latency in ms)",
+        "-" * len(header),
+    ]
+    lines += [row(intent, summary) for intent, summary in report["intents"].items()]
+    lines += ["-" * len(header), row("TOTAL", report)]
+    if "soak" in report:
+        lines += ["", soak.format_table(report["soak"])]
+    return "\n".join(lines)
+
+
+@asynccontextmanager
+async def connect(
+    app, url: Optional[Text] = None, concurrency: int = 10, dry_run: bool = False
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    HTTP client sending requests to the app in-process (app is started and stopped) or to a running server
+
+    :param app:         skill
+    :param url:         running server URL
+    :param concurrency: maximal number of connections
+    :param dry_run:     do not call partner services (in-process only)
+    :return:
+    """
+    from skill_sdk import requests
+    from skill_sdk.config import settings
+
+    transport: httpx.AsyncBaseTransport
+    if url:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=concurrency)
+        )
+    else:
+        transport = httpx.ASGITransport(app=app)
+
+    client = httpx.AsyncClient(
+        transport=transport,
+        base_url=url or IN_PROCESS,
+        auth=(settings.SKILL_API_USER, settings.SKILL_API_KEY),
+        timeout=None,
+    )
+
+    token = requests.dry_run.set(dry_run)
+    try:
+        async with client:
+            if url:
+                yield client
+                return
+
+            await app.router.startup()
+            try:
+                yield client
+            finally:
+                await app.router.shutdown()
+    finally:
+        requests.dry_run.reset(token)
+
+
+async def bench(app, arguments) -> Dict[Text, Any]:
+    """
+    Run the benchmark against the app (in-process) or a running server
+
+    :param app:         skill
+    :param arguments:   command line arguments
+    :return:
+    """
+    from skill_sdk.routes import api_base
+    from skill_sdk.utils.util import DEFAULT_LOCALE, invoke_examples
+
+    locale = getattr(arguments, "locale", None) or DEFAULT_LOCALE
+    bodies = invoke_examples(app.intents, locale)
+    mix = parse_mix(getattr(arguments, "intent", None), bodies)
+    concurrency = getattr(arguments, "concurrency", None) or 10
+    duration = getattr(arguments, "duration", None) or 10
+    url = getattr(arguments, "url", None)
+
+    sampler = None
+    if getattr(arguments, "soak", False):
+        if url:
+            raise ValueError(
+                "Soak mode samples the app driven in-process, --url is not supported"
+            )
+        sampler = soak.Sampler(
+            getattr(arguments, "soak_interval", None) or 10,
+            getattr(arguments, "soak_warmup", None) or 0,
+            soak.parse_slopes(getattr(arguments, "max_slope", None)),
+        )
+        if duration < sampler.warmup + 2 * sampler.interval:
+            raise ValueError(
+                f"Soak duration {duration}s is too short: "
+                f"at least warm-up and two sampling intervals are required"
+            )
+
+    async with connect(
+        app, url, concurrency, bool(getattr(arguments, "dry_run", False))
+    ) as client:
+        runner = Bench(
+            client,
+            api_base(),
+            bodies,
+            mix,
+            concurrency=concurrency,
+            duration=duration,
+            requests=getattr(arguments, "requests", None),
+            seed=getattr(arguments, "seed", None),
+            reservoir=SOAK_RESERVOIR if sampler else None,
+        )
+        if sampler is None:
+            return await runner.run()
+
+        report = await sampler.watch(runner.run())
+        return dict(report, soak=sampler.report())
+
+
+def execute(arguments):
+    """Run the benchmark and print the report"""
+
+    from skill_sdk import log
+    from skill_sdk.utils.util import run_until_complete
+
+    process_env_file(arguments)
+
+    # Set default log level to WARNING, if not explicitly overridden with "--verbose"/"--debug"
+    loglevel = getattr(arguments, "loglevel", None) or logging.WARNING
+    log.setup_logging(loglevel)
+
+    _, app = import_module_app(arguments.module)
+    if not app.intents:
+        raise RuntimeError(
+            "No intent handlers loaded. Check the log messages for import errors..."
+        )
+
+    with closing(app):
+        report = run_until_complete(bench(app, arguments))
+
+    if getattr(arguments, "format", "table") == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(report))
+
+    output = getattr(arguments, "output", None)
+    if output:
+        pathlib.Path(output).write_text(json.dumps(report, indent=2))
+
+    if "soak" in report and not report["soak"]["ok"]:
+        failed = [m for m, trend in report["soak"]["trends"].items() if not trend["ok"]]
+        raise SystemExit(f"Resource usage keeps growing: {', '.join(failed)}")
+
+    return report
+
+
+def add_subparser(subparsers):
+    """
+    Command arguments parser
+
+    :param subparsers:
+    :return:
+    """
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="Benchmark the skill throughput.",
+        description="Send invoke requests created from intent examples "
+        "to the skill (in-process or a running server) and report throughput and latencies.",
+    )
+    add_env_file_argument(bench_parser)
+    bench_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Number of concurrent requests.",
+    )
+    bench_parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=10,
+        help="Benchmark duration in seconds.",
+    )
+    bench_parser.add_argument(
+        "-n",
+        "--requests",
+        type=int,
+        help="Stop after a number of requests.",
+    )
+    bench_parser.add_argument(
+        "-i",
+        "--intent",
+        action="append",
+        metavar="INTENT[=WEIGHT]",
+        help="Intent to invoke with optional weight (can be repeated, all intents if not set).",
+    )
+    bench_parser.add_argument(
+        "-u",
+        "--url",
+        help="URL of a running skill (the app is driven in-process if not set).",
+    )
+    bench_parser.add_argument("--locale", help="Request locale.")
+    bench_parser.add_argument(
+        "--seed", type=int, help="Random seed to repeat the intent sequence."
+    )
+    bench_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Do not call partner services (in-process only).",
+    )
+    bench_parser.add_argument(
+        "--soak",
+        action="store_true",
+        help="Sample resource usage (in-process only), fail if it keeps growing. "
+        "Run for hours with --duration.",
+    )
+    bench_parser.add_argument(
+        "--soak-interval",
+        type=float,
+        default=10,
+        help="Soak sampling interval in seconds.",
+    )
+    bench_parser.add_argument(
+        "--soak-warmup",
+        type=float,
+        default=60,
+        help="Seconds of the soak ignored in the trends.",
+    )
+    bench_parser.add_argument(
+        "--max-slope",
+        action="append",
+        metavar="METRIC=VALUE",
+        help="Maximal growth per hour (can be repeated): "
+        + ", ".join(f"{m}={v:g}" for m, v in soak.DEFAULT_SLOPES.items())
+        + " (RSS in MB).",
+    )
+    bench_parser.add_argument(
+        "-f",
+        "--format",
+        choices=("table", "json"),
+        default="table",
+        help="Report format.",
+    )
+    bench_parser.add_argument("-o", "--output", help="Write JSON report to a file.")
+    add_module_argument(bench_parser)
+    bench_parser.set_defaults(command=execute)
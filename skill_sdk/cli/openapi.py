@@ -0,0 +1,78 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""CLI: "openapi" command"""
+
+#
+# Generates OpenAPI schema (with intent invoke examples) at build time:
+#
+#   the schema file is served when "OPENAPI_SCHEMA_FILE" is set,
+#   so the skill does not generate it at runtime
+#
+
+import json
+import argparse
+import logging
+import pathlib
+from contextlib import closing
+
+from skill_sdk.cli import (
+    add_env_file_argument,
+    add_module_argument,
+    import_module_app,
+    process_env_file,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def execute(arguments):
+    """Write OpenAPI schema to a file"""
+
+    from skill_sdk import log
+
+    process_env_file(arguments)
+
+    # Set default log level to ERROR, if not explicitly overridden with "--verbose"/"--debug"
+    loglevel = getattr(arguments, "loglevel", None) or logging.ERROR
+    log.setup_logging(loglevel)
+
+    _, app = import_module_app(arguments.module)
+
+    with closing(app):
+        schema = app.openapi(cached=False)
+
+    output = pathlib.Path(arguments.output)
+    output.write_text(json.dumps(schema, indent=2))
+    logger.info("OpenAPI schema written to %s", repr(str(output)))
+
+
+def add_subparser(subparsers):
+    """
+    Command arguments parser
+
+    :param subparsers:
+    :return:
+    """
+
+    openapi_parser = subparsers.add_parser(
+        "openapi",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="Generate OpenAPI schema file.",
+        description="Generate OpenAPI schema to serve with OPENAPI_SCHEMA_FILE setting.",
+    )
+    add_env_file_argument(openapi_parser)
+    openapi_parser.add_argument(
+        "-o",
+        "--output",
+        default="openapi.json",
+        help="Output file name.",
+    )
+    add_module_argument(openapi_parser)
+    openapi_parser.set_defaults(command=execute)
@@ -0,0 +1,263 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Pre-fork server: a master process with an imported app forks and supervises worker processes"""
+
+import gc
+import os
+import time
+import select
+import signal
+import socket
+import logging
+from typing import Callable, Dict, List, Optional, Set
+
+import uvicorn
+
+from skill_sdk.cli.server import Server
+
+logger = logging.getLogger(__name__)
+
+# Worker exited sooner than this after start (in seconds) is considered crashed on startup:
+# restart is delayed to avoid busy fork loop
+MIN_WORKER_LIFETIME = 1.0
+
+# Supervisor loop interval in seconds
+SUPERVISE_INTERVAL = 0.5
+
+
+class Master:
+    """
+    Pre-fork master process:
+
+        - binds the listening socket,
+        - freezes the objects created while importing the app (`gc.freeze`),
+          so the garbage collector does not touch (and copy) the pages shared with workers,
+        - forks the workers, restarts them if they exit,
+        - replaces the workers one by one on SIGHUP (rolling reload),
+        - stops the workers on SIGINT/SIGTERM.
+
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        on_fork: Callable[[], None] = None,
+        on_exit: Callable[[], None] = None,
+        on_reload: Callable[[], None] = None,
+        timeout: float = 30,
+    ) -> None:
+        """
+        :param config:      Uvicorn config with the loaded app
+        :param workers:     number of worker processes
+        :param on_fork:     called in a worker process right after fork
+        :param on_exit:     called in a worker process before exit
+        :param on_reload:   called in a worker process started after reload (after `on_fork`)
+        :param timeout:     time in seconds to wait for workers to start or stop
+        """
+        self.config = config
+        self.number_of_workers = workers
+        self.on_fork = on_fork
+        self.on_exit = on_exit
+        self.on_reload = on_reload
+        self.timeout = timeout
+
+        # Worker PIDs with start time, and workers being replaced by reload
+        self.workers: Dict[int, float] = {}
+        self.retiring: Set[int] = set()
+
+        self.should_exit = False
+        self.should_reload = False
+
+        # Set by the first reload: since then workers do not share the master's configuration
+        self.reloaded = False
+        self.sock: Optional[socket.socket] = None
+
+    def run(self) -> None:
+        """Start the workers and supervise until SIGINT/SIGTERM received"""
+
+        self.sock = self.config.bind_socket()
+
+        # Everything allocated so far is shared with the workers:
+        # move it to the permanent generation to keep the pages shared
+        gc.collect()
+        gc.freeze()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.handle_exit)
+        signal.signal(signal.SIGHUP, self.handle_reload)
+
+        logger.info(
+            "Started master process [%d] with %d workers.",
+            os.getpid(),
+            self.number_of_workers,
+        )
+        try:
+            for _ in range(self.number_of_workers):
+                self.spawn()
+
+            while not self.should_exit:
+                self.reap()
+                if self.should_reload:
+                    self.should_reload = False
+                    self.reload()
+                time.sleep(SUPERVISE_INTERVAL)
+        finally:
+            self.stop()
+            self.sock.close()
+
+        logger.info("Stopped master process [%d].", os.getpid())
+
+    def handle_exit(self, sig, frame) -> None:
+        """Signal handler: stop the master loop"""
+        self.should_exit = True
+
+    def handle_reload(self, sig, frame) -> None:
+        """Signal handler: reload the workers"""
+        self.should_reload = True
+
+    def spawn(self, wait: bool = False) -> int:
+        """
+        Fork a worker process
+
+        :param wait:    if `True`, wait for the worker to complete startup
+        :return:        worker PID (0 if the worker failed to start)
+        """
+        ready_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover: runs in a child process
+            os.close(ready_fd)
+            self.worker(write_fd)
+
+        os.close(write_fd)
+        self.workers[pid] = time.monotonic()
+        logger.info("Started worker [%d].", pid)
+
+        try:
+            if wait and not self.wait_ready(ready_fd):
+                logger.error("Worker [%d] did not start in time.", pid)
+                return 0
+        finally:
+            os.close(ready_fd)
+        return pid
+
+    def wait_ready(self, ready_fd: int) -> bool:
+        """Wait for a worker to report completed startup (`False` if worker exits or times out)"""
+
+        readable, _, _ = select.select([ready_fd], [], [], self.timeout)
+        return bool(readable) and os.read(ready_fd, 1) == b"1"
+
+    def worker(
+        self, ready_fd: int
+    ) -> None:  # pragma: no cover: runs in a child process
+        """Worker process: serve requests until stopped, never returns"""
+
+        exit_code = 0
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+        # Reload is handled by master: ignore SIGHUP sent to the whole process group
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        try:
+            if self.on_fork is not None:
+                self.on_fork()
+            if self.reloaded and self.on_reload is not None:
+                self.on_reload()
+            Server(self.config, ready_fd).run(
+                sockets=[self.sock] if self.sock else None
+            )
+        except BaseException:  # NOSONAR
+            logger.exception("Worker [%d] failed.", os.getpid())
+            exit_code = 1
+        finally:
+            if self.on_exit is not None:
+                self.on_exit()
+            os._exit(exit_code)  # noqa
+
+    def reap(self) -> None:
+        """Collect exited workers and start the replacements"""
+
+        for pid, started in list(self.workers.items()):
+            try:
+                _pid, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                _pid, status = pid, 0
+            if _pid == 0:
+                continue
+
+            del self.workers[pid]
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                logger.info("Worker [%d] retired.", pid)
+                continue
+            if self.should_exit:
+                continue
+
+            logger.error(
+                "Worker [%d] exited with status %d, restarting.",
+                pid,
+                os.waitstatus_to_exitcode(status)
+                if hasattr(os, "waitstatus_to_exitcode")
+                else status,
+            )
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            self.spawn()
+
+    def reload(self) -> None:
+        """
+        Rolling reload: replace the workers one at a time
+
+            a new worker is started first, and the old one is stopped only when the new one is ready,
+            the old worker stops accepting connections, and exits when in-flight requests are completed
+            (with SIGINT: no shutdown grace period, the other workers keep the readiness probe green)
+
+        """
+        old: List[int] = [pid for pid in self.workers if pid not in self.retiring]
+        logger.info("Reloading %d workers.", len(old))
+        self.reloaded = True
+
+        for pid in old:
+            if self.should_exit:
+                break
+            if not self.spawn(wait=True):
+                logger.error("Reload aborted, old workers are kept running.")
+                break
+            self.retiring.add(pid)
+            self.kill(pid, signal.SIGINT)
+            self.reap()
+
+    def stop(self) -> None:
+        """Stop the workers gracefully, kill the workers not stopped within timeout"""
+
+        for pid in self.workers:
+            self.kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.timeout
+        while self.workers and time.monotonic() < deadline:
+            for pid in list(self.workers):
+                try:
+                    _pid, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    _pid = pid
+                if _pid:
+                    del self.workers[pid]
+            time.sleep(0.1)
+
+        for pid in self.workers:
+            logger.warning("Worker [%d] did not stop in time, killing.", pid)
+            self.kill(pid, signal.SIGKILL)
+        self.workers.clear()
+
+    @staticmethod
+    def kill(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
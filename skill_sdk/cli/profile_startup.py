@@ -0,0 +1,289 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""CLI: "profile-startup" command"""
+
+#
+# Measures the skill cold start in a fresh interpreter:
+#
+#   - import times (as reported by "python -X importtime") aggregated by package,
+#   - startup phases: config reload, translations, handler registration, middleware/routes setup,
+#     intent examples and OpenAPI schema generation
+#
+# Report is JSON (or text), "--max-seconds" fails the command if startup is slower
+#
+
+import re
+import sys
+import json
+import time
+import argparse
+import logging
+import functools
+import subprocess
+import tempfile
+import pathlib
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Text
+
+from skill_sdk.cli import (
+    add_env_file_argument,
+    add_module_argument,
+    import_module_app,
+)
+
+logger = logging.getLogger(__name__)
+
+# "import time:  self [us] | cumulative | imported package" line of "-X importtime" output
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$")
+
+
+def import_tree(lines: Iterable[Text], depth: int = 2) -> Dict[Text, Any]:
+    """
+    Aggregate "-X importtime" output by package
+
+    :param lines:   "-X importtime" output
+    :param depth:   package nesting level to aggregate to ("fastapi" - 1, "fastapi.openapi" - 2)
+    :return:        {package: {"seconds": self time of the package modules, "modules": count, "packages": {...}}}
+    """
+    tree: Dict[Text, Any] = {}
+    for line in lines:
+        match = IMPORT_TIME.match(line)
+        if match is None:
+            continue
+
+        seconds = int(match.group(1)) / 1e6
+        packages = tree
+        for part in match.group(3).split(".")[:depth]:
+            node = packages.setdefault(part, dict(seconds=0.0, modules=0, packages={}))
+            node["seconds"] += seconds
+            node["modules"] += 1
+            packages = node["packages"]
+
+    return _sorted(tree)
+
+
+def _sorted(tree: Dict[Text, Any]) -> Dict[Text, Any]:
+    """Sort packages by import time, round the times"""
+
+    return {
+        name: dict(
+            seconds=round(node["seconds"], 6),
+            modules=node["modules"],
+            packages=_sorted(node["packages"]),
+        )
+        for name, node in sorted(
+            tree.items(), key=lambda item: item[1]["seconds"], reverse=True
+        )
+    }
+
+
+@contextmanager
+def _phases() -> Iterator[Dict[Text, float]]:
+    """Record the time spent in startup functions (the functions are restored on exit)"""
+
+    from skill_sdk import config, i18n, middleware, routes
+    from skill_sdk.intents import handlers
+    from skill_sdk.utils import util
+
+    seconds: Dict[Text, float] = defaultdict(float)
+    targets = (
+        ("config", config.Settings, "reload"),
+        ("translations", i18n, "load_translations"),
+        ("handlers", handlers, "intent_handler"),
+        ("middleware", middleware, "setup_middleware"),
+        ("routes", routes, "setup_routes"),
+        ("examples", util, "populate_intent_examples"),
+    )
+
+    def timed(phase, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            begin = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[phase] += time.perf_counter() - begin
+
+        return wrapper
+
+    originals = [(owner, name, owner.__dict__[name]) for _, owner, name in targets]
+    try:
+        for phase, owner, name in targets:
+            setattr(owner, name, timed(phase, getattr(owner, name)))
+        yield seconds
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+
+def measure(module: Text) -> Dict[Text, Any]:
+    """
+    Import the app and generate OpenAPI schema, timing the startup phases
+
+    :param module:  app module, as in "vs run"
+    :return:
+    """
+    with _phases() as seconds:
+        begin = time.perf_counter()
+        _, app = import_module_app(module)
+        seconds["app"] = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        app.openapi(cached=False)
+        seconds["openapi"] = time.perf_counter() - begin
+        app.close()
+
+    return {phase: round(value, 6) for phase, value in seconds.items()}
+
+
+def _child(module: Text, output: Text, env_file: Optional[Text]) -> None:
+    """Measure startup phases in a child process and write them to the output file"""
+
+    from skill_sdk import config
+
+    if env_file is not None:
+        config.Settings.Config.env_file = env_file
+
+    pathlib.Path(output).write_text(json.dumps(measure(module)))
+
+
+def profile(module: Text, env_file: Text = None, depth: int = 2) -> Dict[Text, Any]:
+    """
+    Profile the startup in a fresh interpreter with "-X importtime"
+
+    :param module:      app module, as in "vs run"
+    :param env_file:    dotenv file location
+    :param depth:       package nesting level of import times
+    :return:
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        output = str(pathlib.Path(tmp) / "phases.json")
+        code = (
+            "from skill_sdk.cli import profile_startup; "
+            f"profile_startup._child({module!r}, {output!r}, {env_file!r})"
+        )
+        begin = time.perf_counter()
+        process = subprocess.run(  # nosec: runs the current interpreter
+            [sys.executable, "-X", "importtime", "-c", code],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        total = time.perf_counter() - begin
+
+        lines = process.stderr.splitlines()
+        if process.returncode != 0:
+            errors = [line for line in lines if not IMPORT_TIME.match(line)]
+            raise RuntimeError(
+                f"Failed to start {module!r}:\n" + "\n".join(errors[-20:])
+            )
+        phases = json.loads(pathlib.Path(output).read_text())
+
+    imports = import_tree(lines, depth)
+    return dict(
+        module=module,
+        python=sys.version.split()[0],
+        total=round(total, 6),
+        imports=round(sum(node["seconds"] for node in imports.values()), 6),
+        phases=phases,
+        packages=imports,
+    )
+
+
+def format_text(report: Dict[Text, Any], limit: int = 20) -> Text:
+    """
+    Format the report as text
+
+    :param report:
+    :param limit:   number of packages shown per level
+    :return:
+    """
+    lines: List[Text] = [
+        f"Startup of {report['module']}: {report['total']:.3f}s "
+        f"(imports: {report['imports']:.3f}s)",
+        "",
+        "Phases:",
+    ]
+    lines += [
+        f"  {phase:<16}{seconds:>10.3f}s" for phase, seconds in report["phases"].items()
+    ]
+    lines += ["", "Imports:"]
+
+    def _packages(packages: Dict[Text, Any], indent: int) -> None:
+        for name, node in list(packages.items())[:limit]:
+            lines.append(
+                f"{' ' * indent}{name:<{32 - indent}}{node['seconds']:>10.3f}s"
+                f"{node['modules']:>6} module(s)"
+            )
+            _packages(node["packages"], indent + 2)
+
+    _packages(report["packages"], 2)
+    return "\n".join(lines)
+
+
+def execute(arguments):
+    """Profile the skill startup and print the report"""
+
+    report = profile(
+        arguments.module,
+        getattr(arguments, "env_file", None),
+        getattr(arguments, "depth", 2),
+    )
+
+    if getattr(arguments, "format", "json") == "text":
+        print(format_text(report))
+    else:
+        print(json.dumps(report, indent=2))
+
+    max_seconds = getattr(arguments, "max_seconds", None)
+    if max_seconds is not None and report["total"] > max_seconds:
+        raise SystemExit(
+            f"Startup time {report['total']:.3f}s exceeds {max_seconds:.3f}s"
+        )
+
+
+def add_subparser(subparsers):
+    """
+    Command arguments parser
+
+    :param subparsers:
+    :return:
+    """
+
+    profile_parser = subparsers.add_parser(
+        "profile-startup",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="Profile the skill startup.",
+        description="Import the skill in a fresh interpreter, "
+        "report import times by package and startup phases durations.",
+    )
+    add_env_file_argument(profile_parser)
+    profile_parser.add_argument(
+        "-f",
+        "--format",
+        choices=("json", "text"),
+        default="json",
+        help="Report format.",
+    )
+    profile_parser.add_argument(
+        "-d",
+        "--depth",
+        type=int,
+        default=2,
+        help="Package nesting level to aggregate import times to.",
+    )
+    profile_parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help="Fail if the startup takes longer.",
+    )
+    add_module_argument(profile_parser)
+    profile_parser.set_defaults(command=execute)
@@ -0,0 +1,389 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""CLI: "replay" command"""
+
+#
+# Replays invoke requests captured with "CAPTURE" setting:
+#
+#   - at recorded pace (1x), N times faster, or as fast as possible ("max"),
+#   - compares response status and shape (JSON structure without values) with the recording,
+#   - reports recorded and replayed latencies, total and per intent
+#
+
+import json
+import time
+import asyncio
+import argparse
+import logging
+import pathlib
+from collections import defaultdict
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Optional, Text
+
+import httpx
+import orjson
+
+from skill_sdk.cli import (
+    add_env_file_argument,
+    add_module_argument,
+    import_module_app,
+    process_env_file,
+)
+from skill_sdk.cli.bench import Stats, connect
+
+logger = logging.getLogger(__name__)
+
+
+def load(files: Iterable[Text]) -> List[Dict[Text, Any]]:
+    """
+    Read the capture files, skipping invalid lines
+
+    :param files:   capture file names (current and rotated files)
+    :return:        capture records sorted by time
+    """
+    records = []
+    for file in files:
+        with open(file, "rb") as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    record = orjson.loads(line)
+                    if isinstance(record, dict) and "request" in record:
+                        records.append(record)
+                        continue
+                except orjson.JSONDecodeError:
+                    pass
+                logger.warning("%s:%d: not a capture record, skipped.", file, number)
+
+    return sorted(records, key=lambda record: record.get("timestamp", 0))
+
+
+def shape(value: Any) -> Any:
+    """
+    JSON structure without the values: objects with keys, types of the values
+
+    :param value:
+    :return:
+    """
+    if isinstance(value, dict):
+        return {key: shape(v) for key, v in sorted(value.items())}
+    if isinstance(value, list):
+        return sorted({json.dumps(shape(v), sort_keys=True) for v in value})
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "null"
+
+
+def parse_speed(value: Text) -> Optional[float]:
+    """
+    Parse replay speed: "1", "2x" or "max" (returns `None`)
+
+    :param value:
+    :return:
+    """
+    if value.lower() == "max":
+        return None
+    speed = float(value.lower().rstrip("x"))
+    if speed <= 0:
+        raise ValueError(f"Replay speed must be positive: {repr(value)}")
+    return speed
+
+
+class IntentReplay:
+    """Recorded and replayed latencies, mismatches of an intent"""
+
+    __slots__ = ("recorded", "replayed", "status_mismatches", "shape_mismatches")
+
+    def __init__(self) -> None:
+        self.recorded = Stats()
+        self.replayed = Stats()
+        self.status_mismatches = 0
+        self.shape_mismatches = 0
+
+    def summary(self, duration: float) -> Dict[Text, Any]:
+        replayed = self.replayed.summary(duration)
+        return dict(
+            requests=replayed["requests"],
+            errors=replayed["errors"],
+            status_mismatches=self.status_mismatches,
+            shape_mismatches=self.shape_mismatches,
+            recorded=self.recorded.summary(duration)["latency"],
+            replayed=replayed["latency"],
+        )
+
+
+class Replay:
+    """Sends the captured requests and compares the responses with the recording"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        path: Text,
+        records: List[Dict[Text, Any]],
+        speed: Optional[float] = 1.0,
+        concurrency: int = 10,
+    ) -> None:
+        """
+        :param client:      HTTP client (with base URL and credentials)
+        :param path:        invoke endpoint path
+        :param records:     capture records sorted by time
+        :param speed:       replay speed relative to the recording (`None` - as fast as possible)
+        :param concurrency: number of concurrent requests (if replayed as fast as possible)
+        """
+        self.client = client
+        self.path = path
+        self.records = records
+        self.speed = speed
+        self.concurrency = concurrency
+
+        self.intents: Dict[Text, IntentReplay] = defaultdict(IntentReplay)
+        self.elapsed = 0.0
+
+    async def run(self) -> Dict[Text, Any]:
+        """Replay the records and return the report"""
+
+        begin = time.perf_counter()
+        if self.speed is None:
+            queue = iter(self.records)
+            await asyncio.gather(*(self.worker(queue) for _ in range(self.concurrency)))
+        else:
+            tasks = []
+            first = self.records[0].get("timestamp", 0) if self.records else 0
+            for record in self.records:
+                offset = (record.get("timestamp", 0) - first) / self.speed
+                delay = begin + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.ensure_future(self.replay(record)))
+            await asyncio.gather(*tasks)
+
+        self.elapsed = time.perf_counter() - begin
+        return self.report()
+
+    async def worker(self, queue) -> None:
+        for record in queue:
+            await self.replay(record)
+
+    async def replay(self, record: Dict[Text, Any]) -> None:
+        """Send a recorded request, compare status and response shape"""
+
+        stats = self.intents[record.get("intent") or "unknown"]
+        stats.recorded.add(record.get("latency", 0.0), True)
+
+        begin = time.perf_counter()
+        try:
+            response = await self.client.post(
+                self.path,
+                content=orjson.dumps(record["request"]),
+                headers={"Content-Type": "application/json"},
+            )
+        except httpx.HTTPError as ex:
+            logger.debug("Replay failed: %s", repr(ex))
+            stats.replayed.add(time.perf_counter() - begin, False)
+            return
+        stats.replayed.add(time.perf_counter() - begin, True)
+
+        if response.status_code != record.get("status"):
+            stats.status_mismatches += 1
+            return
+
+        try:
+            result = response.json() if response.content else None
+        except ValueError:
+            result = None
+        if shape(result) != shape(record.get("response")):
+            stats.shape_mismatches += 1
+
+    def report(self) -> Dict[Text, Any]:
+        """Totals and per intent comparison"""
+
+        total = IntentReplay()
+        for stats in self.intents.values():
+            total.recorded.merge(stats.recorded)
+            total.replayed.merge(stats.replayed)
+            total.status_mismatches += stats.status_mismatches
+            total.shape_mismatches += stats.shape_mismatches
+
+        return dict(
+            target=str(self.client.base_url),
+            speed=self.speed or "max",
+            duration=round(self.elapsed, 3),
+            **total.summary(self.elapsed),
+            intents={
+                intent: stats.summary(self.elapsed)
+                for intent, stats in sorted(self.intents.items())
+            },
+        )
+
+
+def format_table(report: Dict[Text, Any]) -> Text:
+    """
+    Format the report as table
+
+    :param report:
+    :return:
+    """
+    columns = ["mean", "p50", "p95"]
+    header = (
+        f"{'Intent':<32}{'Requests':>10}{'Errors':>8}{'Status!=':>10}{'Shape!=':>9}"
+        + "".join(f"{'rec ' + c:>10}{'new ' + c:>10}" for c in columns)
+    )
+
+    def row(name: Text, summary: Dict[Text, Any]) -> Text:
+        return (
+            f"{name:<32}{summary['requests']:>10}{summary['errors']:>8}"
+            f"{summary['status_mismatches']:>10}{summary['shape_mismatches']:>9}"
+            + "".join(
+                f"{summary['recorded'][c]:>10.2f}{summary['replayed'][c]:>10.2f}"
+                for c in columns
+            )
+        )
+
+    lines = [
+        f"Target: {report['target']}, speed: {report['speed']}, "
+        f"duration: {report['duration']:.1f}s",
+        "",
+        header + "  (latency in ms)",
+        "-" * len(header),
+    ]
+    lines += [row(intent, summary) for intent, summary in report["intents"].items()]
+    lines += ["-" * len(header), row("TOTAL", report)]
+    return "\n".join(lines)
+
+
+async def replay(app, arguments) -> Dict[Text, Any]:
+    """
+    Replay the capture files against the app (in-process) or a running server
+
+    :param app:         skill
+    :param arguments:   command line arguments
+    :return:
+    """
+    from skill_sdk.routes import api_base
+
+    records = load(arguments.capture)
+    concurrency = getattr(arguments, "concurrency", None) or 10
+
+    async with connect(
+        app,
+        getattr(arguments, "url", None),
+        concurrency,
+        bool(getattr(arguments, "dry_run", False)),
+    ) as client:
+        runner = Replay(
+            client,
+            api_base(),
+            records,
+            parse_speed(getattr(arguments, "speed", None) or "1"),
+            concurrency,
+        )
+        return await runner.run()
+
+
+def execute(arguments):
+    """Replay captured requests and print the report"""
+
+    from skill_sdk import log
+    from skill_sdk.utils.util import run_until_complete
+
+    process_env_file(arguments)
+
+    # Set default log level to WARNING, if not explicitly overridden with "--verbose"/"--debug"
+    loglevel = getattr(arguments, "loglevel", None) or logging.WARNING
+    log.setup_logging(loglevel)
+
+    _, app = import_module_app(arguments.module)
+
+    with closing(app):
+        report = run_until_complete(replay(app, arguments))
+
+    if getattr(arguments, "format", "table") == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_table(report))
+
+    output = getattr(arguments, "output", None)
+    if output:
+        pathlib.Path(output).write_text(json.dumps(report, indent=2))
+
+    if getattr(arguments, "strict", False) and (
+        report["errors"] or report["status_mismatches"] or report["shape_mismatches"]
+    ):
+        raise SystemExit("Replayed responses do not match the recording")
+
+    return report
+
+
+def add_subparser(subparsers):
+    """
+    Command arguments parser
+
+    :param subparsers:
+    :return:
+    """
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="Replay captured invoke requests.",
+        description="Replay invoke requests captured with CAPTURE setting "
+        "against the skill (in-process or a running server), "
+        "compare response status, shape and latency with the recording.",
+    )
+    add_env_file_argument(replay_parser)
+    replay_parser.add_argument(
+        "-r",
+        "--capture",
+        action="append",
+        required=True,
+        metavar="FILE",
+        help="Capture file (can be repeated to replay rotated files).",
+    )
+    replay_parser.add_argument(
+        "-s",
+        "--speed",
+        default="1",
+        help='Replay speed: "1" (recorded pace), "N" (N times faster) or "max".',
+    )
+    replay_parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Number of concurrent requests (with max speed).",
+    )
+    replay_parser.add_argument(
+        "-u",
+        "--url",
+        help="URL of a running skill (the app is driven in-process if not set).",
+    )
+    replay_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Do not call partner services (in-process only).",
+    )
+    replay_parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail if any response does not match the recording.",
+    )
+    replay_parser.add_argument(
+        "-f",
+        "--format",
+        choices=("table", "json"),
+        default="table",
+        help="Report format.",
+    )
+    replay_parser.add_argument("-o", "--output", help="Write JSON report to a file.")
+    add_module_argument(replay_parser)
+    replay_parser.set_defaults(command=execute)
@@ -9,9 +9,12 @@
 
 """CLI: "run" command"""
 
+import os
 import argparse
 import logging
+import importlib.util
 from contextlib import closing
+from typing import Any, Dict, Text
 
 import uvicorn
 
@@ -21,6 +24,7 @@ from skill_sdk.cli import (
     import_module_app,
     process_env_file,
 )
+from skill_sdk.cli.server import Server
 
 logger = logging.getLogger(__name__)
 
@@ -51,11 +55,86 @@ def execute(arguments):
     logger.info("Loaded handlers: %s", list(app.intents))
 
     run_config = config.settings.http_config()
+    run_config.update(
+        _implementations(
+            getattr(arguments, "loop", None) or config.settings.HTTP_LOOP,
+            getattr(arguments, "http", None) or config.settings.HTTP_PARSER,
+        )
+    )
+    workers = getattr(arguments, "workers", None) or config.settings.HTTP_WORKERS
+
+    if workers > 1 and not hasattr(os, "fork"):
+        logger.warning("Multiple workers are not supported on this platform.")
+        workers = 1
 
     logger.info("Starting app with config: %s", repr(run_config))
 
-    with closing(app):
-        uvicorn.run(app, **run_config)
+    if workers > 1:
+        serve_workers(app, run_config, workers)
+    else:
+        with closing(app):
+            Server(uvicorn.Config(app, **run_config)).run()
+
+
+def _implementations(loop: Text, http: Text) -> Dict[Text, Any]:
+    """
+    Event loop and HTTP parser implementations:
+        fall back to pure Python implementation if requested one is not installed
+
+    :param loop:    "auto", "asyncio" or "uvloop"
+    :param http:    "auto", "h11" or "httptools"
+    :return:        Uvicorn config values (empty if "auto")
+    """
+    result = {}
+    for key, value, fallback in (("loop", loop, "asyncio"), ("http", http, "h11")):
+        if value == "auto":
+            continue
+        if importlib.util.find_spec(value) is None:
+            logger.warning(
+                "%s is not installed, falling back to %s.", repr(value), repr(fallback)
+            )
+            value = fallback
+        result[key] = value
+    return result
+
+
+def serve_workers(app, run_config: Dict[Text, Any], workers: int) -> None:
+    """
+    Run pre-forked worker processes:
+        the app with intent handlers and translations is loaded in the master process, and shared with workers,
+        on SIGHUP the workers are replaced with the new ones, reloading configuration and translations
+
+    :param app:
+    :param run_config:
+    :param workers:
+    :return:
+    """
+    from skill_sdk import config, i18n, log
+    from skill_sdk.cli.prefork import Master
+
+    # Logging thread does not survive fork: master logs directly, workers start their own queue
+    log.stop_queue_logging()
+
+    def on_fork():
+        if config.settings.LOG_QUEUE:
+            log.start_queue_logging()
+
+    def on_exit():
+        app.close()
+        log.stop_queue_logging()
+
+    def on_reload():
+        config.settings.reload(config.Settings.Config.conf_file)
+        app.translations = i18n.load_translations()
+
+    Master(
+        uvicorn.Config(app, **run_config),
+        workers,
+        on_fork=on_fork,
+        on_exit=on_exit,
+        on_reload=on_reload,
+        timeout=config.settings.DRAIN_GRACE_PERIOD + config.settings.DRAIN_TIMEOUT + 10,
+    ).run()
 
 
 def add_subparser(subparsers):
@@ -73,5 +152,21 @@ def add_subparser(subparsers):
         description="Run the HTTP server as configured to handle requests.",
     )
     add_env_file_argument(run_parser)
+    run_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of worker processes (defaults to HTTP_WORKERS setting).",
+    )
+    run_parser.add_argument(
+        "--loop",
+        choices=("auto", "asyncio", "uvloop"),
+        help="Event loop implementation (defaults to HTTP_LOOP setting).",
+    )
+    run_parser.add_argument(
+        "--http",
+        choices=("auto", "h11", "httptools"),
+        help="HTTP parser implementation (defaults to HTTP_PARSER setting).",
+    )
     add_module_argument(run_parser)
     run_parser.set_defaults(command=execute)
@@ -0,0 +1,83 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Uvicorn server with graceful drain on shutdown"""
+
+import os
+import signal
+import asyncio
+import logging
+from typing import Optional
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Time in seconds for the requests on connections accepted right before shutdown to arrive
+ACCEPT_GRACE_PERIOD = 0.5
+
+
+class Server(uvicorn.Server):
+    """
+    Uvicorn server with graceful shutdown:
+
+        - fails the readiness probe, and keeps accepting connections and invokes for `DRAIN_GRACE_PERIOD`
+          while the endpoints are updated and the traffic is routed away
+          (skipped if stopped with SIGINT: Ctrl+C, or a worker retired by rolling reload),
+        - stops accepting connections, and lets the requests on just accepted connections arrive:
+          otherwise connections without request received yet are dropped,
+        - drains the app: new invokes are rejected, in-flight invokes are completed,
+        - shuts down the connections and runs application shutdown handlers.
+
+    """
+
+    def __init__(self, config: uvicorn.Config, ready_fd: Optional[int] = None) -> None:
+        """
+        :param config:
+        :param ready_fd:    pipe to report completed startup to the pre-fork master process
+        """
+        super().__init__(config)
+        self.ready_fd = ready_fd
+        self.grace_period = True
+
+    async def startup(self, *args, **kwargs) -> None:
+        await super().startup(*args, **kwargs)
+        if self.ready_fd is not None:
+            try:
+                os.write(self.ready_fd, b"1" if self.started else b"0")
+                os.close(self.ready_fd)
+            except OSError:
+                pass
+
+    def handle_exit(self, sig, frame) -> None:
+        if not self.should_exit:
+            self.grace_period = sig != signal.SIGINT
+        super().handle_exit(sig, frame)
+
+    async def shutdown(self, *args, **kwargs) -> None:
+        from skill_sdk.config import settings
+
+        app = self.config.app
+        if self.grace_period and hasattr(app, "draining"):
+            app.draining = True
+            logger.info(
+                "Readiness probe fails, accepting connections for %ss.",
+                settings.DRAIN_GRACE_PERIOD,
+            )
+            await asyncio.sleep(settings.DRAIN_GRACE_PERIOD)
+
+        for server in getattr(self, "servers", ()):
+            server.close()
+        await asyncio.sleep(ACCEPT_GRACE_PERIOD)
+
+        drain = getattr(app, "drain", None)
+        if drain is not None:
+            await drain()
+
+        await super().shutdown(*args, **kwargs)
@@ -0,0 +1,264 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""CLI: soak mode of "bench" command"""
+
+#
+# Resource usage of the skill process sampled at intervals while the benchmark runs:
+#
+#   - RSS, threads, open file descriptors, asyncio tasks and objects tracked by GC,
+#   - linear trend (least squares slope per hour) of every metric after the warm-up,
+#   - the soak fails if a slope exceeds the limit
+#
+
+import gc
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Text, TypeVar
+
+from skill_sdk.utils import memory
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Sampled metrics and default slope limits (growth per hour): RSS in MB, counts for the others
+DEFAULT_SLOPES: Dict[Text, float] = dict(
+    rss=50.0,
+    threads=1.0,
+    fds=1.0,
+    tasks=1.0,
+    objects=10000.0,
+)
+
+# Number of object types reported by growth
+TOP_TYPES = 10
+
+
+def rss() -> Optional[float]:
+    """Resident set size in MB (peak RSS, if current is not available)"""
+
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 3)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ModuleNotFoundError:
+        return None
+
+    # "ru_maxrss" is in bytes on macOS, in kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 3)
+
+
+def fds() -> Optional[int]:
+    """Number of open file descriptors (if the platform lists them)"""
+
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def sample() -> Dict[Text, Any]:
+    """
+    Current resource usage: garbage is collected before counting the objects,
+    so the count reflects the objects that are actually kept
+
+    :return:
+    """
+    gc.collect()
+    return dict(
+        rss=rss(),
+        threads=threading.active_count(),
+        fds=fds(),
+        tasks=len(asyncio.all_tasks()),
+        objects=len(gc.get_objects()),
+    )
+
+
+def slope(points: Iterable[Any]) -> Optional[float]:
+    """
+    Least squares slope of (x, y) points
+
+    :param points:
+    :return:        `None` if there are less than two distinct x values
+    """
+    points = list(points)
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if not variance:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def parse_slopes(values: Optional[Iterable[Text]]) -> Dict[Text, float]:
+    """
+    Parse slope limits: "METRIC=VALUE" values override the defaults
+
+    :param values:
+    :return:        {metric: growth per hour}
+    """
+    slopes = dict(DEFAULT_SLOPES)
+    for value in values or ():
+        metric, _, limit = value.partition("=")
+        if metric not in DEFAULT_SLOPES or not limit:
+            raise ValueError(
+                f"Invalid slope limit {repr(value)}, use METRIC=VALUE with one of {list(DEFAULT_SLOPES)}"
+            )
+        slopes[metric] = float(limit)
+    return slopes
+
+
+def growth(
+    before: Dict[Text, int], after: Dict[Text, int], limit: int = TOP_TYPES
+) -> Dict[Text, int]:
+    """
+    Object types with the largest growth in number
+
+    :param before:  object counts by type
+    :param after:   object counts by type
+    :param limit:
+    :return:
+    """
+    delta = {name: count - before.get(name, 0) for name, count in after.items()}
+    top = sorted(delta.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return {name: count for name, count in top if count > 0}
+
+
+class Sampler:
+    """Samples resource usage while a coroutine is running"""
+
+    def __init__(
+        self,
+        interval: float = 10,
+        warmup: float = 60,
+        slopes: Dict[Text, float] = None,
+    ) -> None:
+        """
+        :param interval:    sampling interval in seconds
+        :param warmup:      seconds ignored in the trends (pools are filled, caches populated)
+        :param slopes:      maximal growth per hour by metric
+        """
+        self.interval = interval
+        self.warmup = warmup
+        self.slopes = dict(DEFAULT_SLOPES if slopes is None else slopes)
+
+        self.samples: List[Dict[Text, Any]] = []
+        self.types: List[Dict[Text, int]] = []
+        self.begin = 0.0
+
+    def take(self) -> None:
+        elapsed = time.perf_counter() - self.begin
+        self.samples.append(dict(time=round(elapsed, 3), **sample()))
+
+        # Object counts by type: at the end of the warm-up and at the end of the soak
+        if elapsed >= self.warmup and not self.types:
+            self.types.append(memory.object_counts(limit=sys.maxsize))
+
+    async def watch(self, coro: Awaitable[T]) -> T:
+        """
+        Sample resource usage until the coroutine is complete
+
+        :param coro:
+        :return:        coroutine result
+        """
+        self.begin = time.perf_counter()
+        self.take()
+
+        # No sample after completion: the benchmark clients are gone by then
+        task = asyncio.ensure_future(coro)
+        while True:
+            await asyncio.wait({task}, timeout=self.interval)
+            if task.done():
+                break
+            self.take()
+
+        self.types.append(memory.object_counts(limit=sys.maxsize))
+        return task.result()
+
+    def trends(self) -> Dict[Text, Dict[Text, Any]]:
+        """
+        Metric values after the warm-up and their slopes per hour
+
+        :return:
+        """
+        samples = [s for s in self.samples if s["time"] >= self.warmup]
+        trends = {}
+        for metric, limit in self.slopes.items():
+            points = [(s["time"], s[metric]) for s in samples if s[metric] is not None]
+            value = slope(points)
+            per_hour = None if value is None else round(value * 3600, 3)
+            trends[metric] = dict(
+                first=points[0][1] if points else None,
+                last=points[-1][1] if points else None,
+                slope=per_hour,
+                limit=limit,
+                ok=per_hour is None or per_hour <= limit,
+            )
+        return trends
+
+    def report(self) -> Dict[Text, Any]:
+        """Samples, trends and object types growth"""
+
+        trends = self.trends()
+        return dict(
+            interval=self.interval,
+            warmup=self.warmup,
+            ok=all(trend["ok"] for trend in trends.values()),
+            trends=trends,
+            growth=growth(self.types[0], self.types[-1]) if self.types else {},
+            samples=self.samples,
+        )
+
+
+def format_table(report: Dict[Text, Any]) -> Text:
+    """
+    Format the soak report as table
+
+    :param report:
+    :return:
+    """
+    header = f"{'Metric':<12}{'First':>14}{'Last':>14}{'Slope/h':>14}{'Limit/h':>14}"
+
+    def value(number: Optional[float]) -> Text:
+        return f"{'n/a' if number is None else number:>14}"
+
+    lines = [
+        f"Soak: {len(report['samples'])} samples every {report['interval']}s, "
+        f"warm-up: {report['warmup']}s",
+        "",
+        header + "  (RSS in MB)",
+        "-" * len(header),
+    ]
+    lines += [
+        f"{metric:<12}{value(trend['first'])}{value(trend['last'])}"
+        f"{value(trend['slope'])}{value(trend['limit'])}  {'OK' if trend['ok'] else 'FAIL'}"
+        for metric, trend in report["trends"].items()
+    ]
+    if report["growth"]:
+        lines += ["", "Object types growth:"]
+        lines += [
+            f"  {name:<40}{count:>+10}" for name, count in report["growth"].items()
+        ]
+    return "\n".join(lines)
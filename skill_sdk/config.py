@@ -232,6 +232,32 @@ class Settings(BaseSettings):
     # Default HTTP port
     HTTP_PORT: int = 4242
 
+    # Warm-up: invoke every intent with synthetic requests on startup, readiness probe fails until completed
+    WARMUP: bool = False
+
+    # Maximal warm-up duration in seconds
+    WARMUP_TIMEOUT: float = 60
+
+    # Graceful shutdown: time in seconds to wait for in-flight invokes to complete
+    DRAIN_TIMEOUT: float = 20
+
+    # Graceful shutdown: time in seconds to keep accepting connections after readiness probe fails,
+    # while the endpoints are updated and the traffic is routed away
+    DRAIN_GRACE_PERIOD: float = 5
+
+    # Lean startup: do not serve OpenAPI schema and docs in production (unless precomputed schema file is set)
+    LEAN_STARTUP: bool = False
+
+    # OpenAPI schema precomputed with "vs openapi": served instead of generating the schema at runtime
+    OPENAPI_SCHEMA_FILE: Optional[Text] = None
+
+    # Number of worker processes started by "vs run"
+    HTTP_WORKERS: int = 1
+
+    # Event loop ("auto", "asyncio", "uvloop") and HTTP parser ("auto", "h11", "httptools") implementations
+    HTTP_LOOP: Text = "auto"
+    HTTP_PARSER: Text = "auto"
+
     # Health endpoints for k8s
     K8S_READINESS: Text = "/k8s/readiness"
     K8S_LIVENESS: Text = "/k8s/liveness"
@@ -239,6 +265,36 @@ class Settings(BaseSettings):
     # Prometheus metrics scraper endpoint
     PROMETHEUS_ENDPOINT: Text = "/prometheus"
 
+    # Add "Server-Timing" header with invoke phases durations to every invoke response
+    # (always enabled in development mode)
+    SERVER_TIMING: bool = False
+
+    # Request header to enable "Server-Timing" for a single (authenticated) invoke request
+    SERVER_TIMING_HEADER: Text = "X-Server-Timing"
+
+    # Sampling profiler endpoint (disabled by default, always requires authentication)
+    PROFILER: bool = False
+    PROFILER_ENDPOINT: Text = "/admin/profile"
+
+    # Maximal profiling session duration in seconds
+    PROFILER_MAX_SECONDS: float = 60
+
+    # Memory diagnostics endpoints (disabled by default, always require authentication)
+    MEMORY_DIAGNOSTICS: bool = False
+    MEMORY_ENDPOINT: Text = "/admin/memory"
+
+    # Maximal number of tracemalloc snapshots kept
+    MEMORY_MAX_SNAPSHOTS: int = 10
+
+    # Event loop watchdog: measure loop lag and log the stack of calls blocking the loop
+    LOOP_WATCHDOG: bool = False
+
+    # Event loop heartbeat interval in seconds
+    LOOP_WATCHDOG_INTERVAL: float = 0.1
+
+    # Log the stack if the loop is blocked longer than this (in seconds)
+    LOOP_WATCHDOG_THRESHOLD: float = 0.5
+
     # Default request time-out value in seconds:
     # used from built-in httpx client
     REQUESTS_TIMEOUT: float = 5
@@ -260,6 +316,47 @@ class Settings(BaseSettings):
     # Maximal length of a string in the log
     LOG_ENTRY_MAX_STRING: int = 150
 
+    # Maximal length of a payload (request, response) rendered in the log (0 is unlimited)
+    LOG_ENTRY_MAX_SIZE: int = 2048
+
+    # Maximal number of error records with the same key logged within LOG_RATE_LIMIT_INTERVAL,
+    # the rest is counted and summarized (0 to disable rate limiting)
+    LOG_RATE_LIMIT: int = 10
+
+    # Rate limiting interval in seconds
+    LOG_RATE_LIMIT_INTERVAL: float = 60
+
+    # Log every n-th suppressed record anyway (0 to suppress all)
+    LOG_RATE_LIMIT_SAMPLE: int = 0
+
+    # Share of requests (by trace ID) to keep DEBUG, INFO and WARNING log records of:
+    # all records of a request are either kept or dropped together
+    LOG_SAMPLE_DEBUG: float = 1.0
+    LOG_SAMPLE_INFO: float = 1.0
+    LOG_SAMPLE_WARNING: float = 1.0
+
+    # Non-blocking logging: records are queued and written by a background thread
+    LOG_QUEUE: bool = False
+
+    # Maximal number of queued log records: the oldest records are dropped when the queue is full
+    LOG_QUEUE_SIZE: int = 10000
+
+    # Traffic capture: a sample of invoke requests (with responses and latencies) is written to a JSONL file
+    CAPTURE: bool = False
+
+    # Capture file name ("{pid}" is replaced with the process ID: use with multiple workers)
+    CAPTURE_FILE: Text = "capture.jsonl"
+
+    # Share of invoke requests captured
+    CAPTURE_SAMPLE_RATE: float = 0.01
+
+    # Capture file is rotated when it reaches the size, number of rotated files kept
+    CAPTURE_MAX_BYTES: int = 10 * 1024 * 1024
+    CAPTURE_BACKUP_COUNT: int = 5
+
+    # Replace session IDs with hashes in captured requests
+    CAPTURE_HASH_SESSION_ID: bool = True
+
     # JSON-formatted list of CORS origins: requests from dev and prod UI
     BACKEND_CORS_ORIGINS: List[Text] = [
         "http://localhost:8080",
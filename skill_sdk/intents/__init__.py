@@ -12,6 +12,8 @@
 
 from skill_sdk.intents.entities import AttributeV2
 
+from skill_sdk.intents.matcher import Match, Matcher
+
 from skill_sdk.intents.request import (
     Context,
     Session,
@@ -10,14 +10,28 @@
 """Intent entities and conversion functions"""
 
 import re
+import copy
 import logging
 import datetime
 import functools
-from typing import Any, Callable, Dict, Generic, List, Optional, Text, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from dateutil import parser, rrule
 from dateutil.tz import tzutc, gettz
 import isodate
 from pydantic import root_validator
+from pydantic.json import ENCODERS_BY_TYPE
 
 from skill_sdk.utils.util import CamelModel
 
@@ -194,20 +208,9 @@ class TimeSet:
         return f'<TimeSet timex="{self.timex}" tz="{self.tz}">'
 
 
-class AttributeV2(CamelModel, Generic[T]):
+class AttributeV2Model(CamelModel, Generic[T]):
     """
-    Attribute V2: indicates the nested and overlapping entities
-
-        Sample usage:
-
-        >>>import datetime
-        >>>from skill_sdk import skill, responses
-        >>>from skill_sdk.intents import AttributeV2
-
-        >>>@skill.intent_handler('Intent')
-        >>>def handler(date: AttributeV2[str]) -> responses.Response:
-        >>>    ...
-
+    Attribute V2 data model: used to validate, export and describe (OpenAPI schema) `AttributeV2` values
     """
 
     # Attribute ID (int32)
@@ -228,6 +231,8 @@ class AttributeV2(CamelModel, Generic[T]):
     class Config:
         """Sample values for Swagger UI"""
 
+        title = "AttributeV2"
+
         schema_extra = {
             "example": {
                 "id": 1,
@@ -242,6 +247,90 @@ class AttributeV2(CamelModel, Generic[T]):
     def remove_none_values(cls, values: Dict):  # pylint: disable=E0213
         return {k: v for k, v in values.items() if v is not None}
 
+
+# OpenAPI definition name (and validation error messages) use the class name: keep "AttributeV2"
+AttributeV2Model.__name__ = AttributeV2Model.__qualname__ = "AttributeV2"
+
+
+def _is_int_list(value: Any) -> bool:
+    """Check if value is a list of integers"""
+    return isinstance(value, list) and all(type(_) is int for _ in value)
+
+
+def _parse_attribute(data: Dict) -> Tuple:
+    """
+    Parse attribute fields from dictionary (camelCase or snake_case keys):
+    well-formed values are taken as is, anything else is validated with the full `AttributeV2Model`
+
+    :param data:
+    :return:    tuple of (id, value, nested_in, overlaps_with, extras)
+    """
+    get = data.get
+    id_, value, extras = get("id"), get("value"), get("extras")
+    nested_in = get("nestedIn", get("nested_in"))
+    overlaps_with = get("overlapsWith", get("overlaps_with"))
+
+    if (
+        type(id_) is int
+        and (nested_in is None or _is_int_list(nested_in))
+        and (overlaps_with is None or _is_int_list(overlaps_with))
+        and (extras is None or isinstance(extras, dict))
+    ):
+        return (
+            id_,
+            value,
+            [] if nested_in is None else nested_in,
+            [] if overlaps_with is None else overlaps_with,
+            extras,
+        )
+
+    model: AttributeV2Model = AttributeV2Model.parse_obj(data)
+    return model.id, model.value, model.nested_in, model.overlaps_with, model.extras
+
+
+class AttributeV2(Generic[T]):
+    """
+    Attribute V2: indicates the nested and overlapping entities
+
+        Attribute values are compact (slotted) objects,
+        full Pydantic model (`AttributeV2Model`) is created only when the value is exported or validated
+
+        Sample usage:
+
+        >>>import datetime
+        >>>from skill_sdk import skill, responses
+        >>>from skill_sdk.intents import AttributeV2
+
+        >>>@skill.intent_handler('Intent')
+        >>>def handler(date: AttributeV2[str]) -> responses.Response:
+        >>>    ...
+
+    """
+
+    # Attribute fields
+    _fields = ("id", "value", "nested_in", "overlaps_with", "extras")
+
+    # "__orig_class__" is set by `typing` on instances of subscripted generics: AttributeV2[int](...)
+    __slots__ = _fields + ("__orig_class__",)
+
+    # Pydantic model: used by Pydantic to create the OpenAPI schema
+    __pydantic_model__ = AttributeV2Model
+
+    # Attribute ID (int32)
+    id: int
+
+    # Attribute value
+    value: T
+
+    # List of attribute IDs this attribute is nested in
+    nested_in: List[int]
+
+    # List of attribute IDs this attribute overlaps with
+    overlaps_with: List[int]
+
+    # Extra information for skills. e.g. literal value
+    extras: Optional[Dict[Text, Text]]
+
     def __init__(
         self,
         value: Union[Dict, "AttributeV2", Text],
@@ -254,20 +343,93 @@ class AttributeV2(CamelModel, Generic[T]):
         :param value:   Value dictionary
         :param mapping: Conversion function
         """
-        if isinstance(value, type(self)):
-            __value = value.dict()
+        if isinstance(value, AttributeV2):
+            fields = list(value.__getstate__())
         elif isinstance(value, dict):
-            __value = value.copy()
+            fields = list(_parse_attribute(value))
         else:
-            __value = dict(value=value, **data)
+            fields = list(_parse_attribute(dict(value=value, **data)))
 
         if mapping:
             try:
-                __value["value"] = mapping(__value["value"])
+                fields[1] = mapping(fields[1])
             except (KeyError, TypeError):
                 pass
 
-        super().__init__(**__value)
+        self.__setstate__(tuple(fields))
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "AttributeV2":
+        """Pydantic validator: create AttributeV2 from dictionary"""
+        return value if isinstance(value, cls) else cls(value)
+
+    @classmethod
+    def parse_obj(cls, obj: Any) -> "AttributeV2":
+        return cls.validate(obj)
+
+    @classmethod
+    def schema(cls, *args, **kwargs) -> Dict[Text, Any]:
+        return cls.__pydantic_model__.schema(*args, **kwargs)
+
+    def model(self) -> AttributeV2Model:
+        """Create (and validate) full Pydantic model"""
+        return self.__pydantic_model__(**dict(self))
+
+    def dict(self, *args, **kwargs) -> Dict[Text, Any]:
+        return self.__pydantic_model__.construct(**dict(self)).dict(*args, **kwargs)
+
+    def json(self, *args, **kwargs) -> Text:
+        return self.__pydantic_model__.construct(**dict(self)).json(*args, **kwargs)
+
+    def copy(self, *, update: Dict[Text, Any] = None, deep: bool = False):
+        """
+        Duplicate attribute
+
+        :param update:  values to change in the new attribute
+        :param deep:    set to `True` to make a deep copy
+        :return:
+        """
+        attr = copy.deepcopy(self) if deep else copy.copy(self)
+        if update:
+            attr.__setstate__(
+                tuple(update.get(name, getattr(attr, name)) for name in self._fields)
+            )
+        return attr
+
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __setstate__(self, state: Tuple) -> None:
+        for name, value in zip(self._fields, state):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        if name == "__orig_class__":
+            object.__setattr__(self, name, value)
+            return
+        raise TypeError(
+            f'"{type(self).__name__}" is immutable and does not support item assignment'
+        )
+
+    def __iter__(self):
+        yield from zip(self._fields, self.__getstate__())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, AttributeV2):
+            return self.__getstate__() == other.__getstate__()
+        return self.dict() == other
+
+    def __repr__(self) -> Text:
+        fields = ", ".join(f"{name}={repr(value)}" for name, value in self)
+        return f"{type(self).__name__}({fields})"
+
+
+# Export AttributeV2 values with Pydantic's JSON encoder
+ENCODERS_BY_TYPE[AttributeV2] = AttributeV2.dict
 
 
 def rank(value: str) -> int:
@@ -327,6 +489,172 @@ def convert(value: str, to_type=None):
     return converter(to_type)(value)
 
 
+#
+# Batch conversion: list-typed handler parameters
+#
+
+# Minimal list size to try a vectorized (NumPy) conversion
+VECTORIZE_MIN_SIZE = 64
+
+# Maximal number of element errors to include into exception message
+BATCH_ERRORS_IN_MESSAGE = 5
+
+# Date/time strings that are parsed equally by NumPy and `dateutil`
+ISO_DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?$")
+
+
+class BatchConversionError(ValueError):
+    """
+    Exception raised when one or more list elements could not be converted:
+    `errors` maps element index to the exception raised while converting the element,
+    `results` are the converted values (failed elements are left unconverted)
+    """
+
+    def __init__(
+        self,
+        values: List[Any],
+        errors: Dict[int, Exception],
+        results: List[Any] = None,
+    ):
+        self.values = values
+        self.errors = errors
+        self.results = values if results is None else results
+        details = ", ".join(
+            f"[{i}] {repr(values[i])}: {repr(ex)}"
+            for i, ex in list(errors.items())[:BATCH_ERRORS_IN_MESSAGE]
+        )
+        super().__init__(
+            f"{len(errors)} of {len(values)} values could not be converted: {details}"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use: it is an optional dependency"""
+    try:
+        import numpy
+
+        return numpy
+    except ModuleNotFoundError:
+        logger.debug("NumPy is not installed, vectorized conversion is disabled.")
+        return None
+
+
+def _vectorized(to_type, values: List[Any]) -> Optional[List[Any]]:
+    """
+    Try to convert a list of strings with NumPy:
+        returns `None` if NumPy is not installed, the list is too short,
+        the type is not supported or any of the values cannot be parsed
+
+    :param to_type:
+    :param values:
+    :return:
+    """
+    if len(values) < VECTORIZE_MIN_SIZE or to_type not in (
+        int,
+        float,
+        datetime.date,
+        datetime.datetime,
+    ):
+        return None
+
+    np = _numpy()
+    if np is None or not all(isinstance(value, str) for value in values):
+        return None
+
+    try:
+        if to_type is int:
+            return np.array(values).astype(np.int64).tolist()
+        if to_type is float:
+            return np.array(values).astype(np.float64).tolist()
+        if not all(ISO_DATETIME.match(value) for value in values):
+            return None
+        array = np.array(values, dtype="datetime64[us]")
+        if to_type is datetime.date:
+            array = array.astype("datetime64[D]")
+        return array.tolist()
+    except (OverflowError, TypeError, ValueError) as ex:
+        logger.debug("Vectorized conversion failed: %s", repr(ex))
+        return None
+
+
+def batch_converter(to_type) -> Callable[[Iterable[Any]], List[Any]]:
+    """
+    Returns conversion function that converts a list of values in one pass:
+    NumPy is used for large lists of `int`, `float`, `datetime.date` and `datetime.datetime` values (if installed),
+    and errors are collected for all elements and reported in a single `BatchConversionError`
+
+    :param to_type: type or callable
+    :return:
+    """
+    convert_one = converter(to_type)
+
+    def convert_all(values: Iterable[Any]) -> List[Any]:
+        """Convert the values and raise BatchConversionError if any element fails"""
+        values = list(values)
+
+        result = _vectorized(to_type, values)
+        if result is not None:
+            return result
+
+        result, errors = [], {}
+        for i, value in enumerate(values):
+            try:
+                result.append(convert_one(value))
+            except Exception as ex:  # NOSONAR
+                result.append(value)
+                errors[i] = ex
+
+        if errors:
+            raise BatchConversionError(values, errors, result)
+
+        return result
+
+    return convert_all
+
+
+def attr_v2_batch_converter(to_type) -> Callable[[Iterable[Any]], List[AttributeV2]]:
+    """
+    Returns conversion function that converts a list of AttributeV2 values in one pass
+
+    :param to_type: type or callable
+    :return:
+    """
+    convert_values = batch_converter(to_type)
+
+    def convert_all(values: Iterable[Any]) -> List[AttributeV2]:
+        """Convert attribute values, leaving values of incompatible type unchanged"""
+        attrs: List[AttributeV2] = [AttributeV2(value) for value in values]
+
+        try:
+            converted = convert_values(attr.value for attr in attrs)
+        except BatchConversionError as ex:
+            # Like `AttributeV2(value, mapping)`, leave the values of incompatible type unconverted
+            if not all(
+                isinstance(e, (KeyError, TypeError)) for e in ex.errors.values()
+            ):
+                raise
+            converted = ex.results
+
+        return [
+            attr.copy(update=dict(value=value)) for attr, value in zip(attrs, converted)
+        ]
+
+    return convert_all
+
+
+def convert_all(values: Iterable[Any], to_type=None) -> List[Any]:
+    """
+    Convert a list of values to type defined in conversion table or using a conversion function provided in `to_type`
+
+    :param values:  values to convert
+    :param to_type: type or callable
+    :return:
+    @throws:        BatchConversionError if one or more values cannot be converted
+    """
+    return batch_converter(to_type)(values)
+
+
 @to_datetime.register(datetime.date)
 def date_to_datetime(value: datetime.date) -> datetime.datetime:
     """Date to datetime with time set to 00:00"""
@@ -9,6 +9,7 @@
 
 """Type hints processing and intent handler invoke"""
 
+import time
 import inspect
 import logging
 from typing import (
@@ -27,6 +28,9 @@ from typing import (
 
 from pydantic.utils import lenient_issubclass
 
+from skill_sdk.log import LazyPayload, RateLimitedLogger
+from skill_sdk.utils import timing
+from skill_sdk.utils.timing import Phase
 from skill_sdk.utils.util import run_in_executor
 from skill_sdk.intents import entities
 from skill_sdk.intents import Context, Request, Session, RequestContextVar
@@ -36,6 +40,7 @@ from functools import wraps, reduce, partial
 
 
 logger = logging.getLogger(__name__)
+rate_limited = RateLimitedLogger(logger)
 AnyType = Type[Any]
 AnyFunc = Callable[..., Any]
 ErrorHandlerType = Callable[[Text, "EntityValueException"], Union[Awaitable, Response]]
@@ -73,16 +78,32 @@ async def invoke(handler: AnyFunc, request: Request) -> Response:
         )
 
         if inspect.iscoroutinefunction(handler):
-            response = await handler(request)
+            with timing.measure(Phase.handler, exclude=Phase.conversion):
+                response = await handler(request)
         else:
-            response = await run_in_executor(handler, request)
+            response = await run_in_executor(_timed(handler), request)
 
-        result = _enrich(response)
+        with timing.measure(Phase.enrich):
+            result = _enrich(response)
 
-        logger.debug("Intent call result: %s", repr(result))
+        logger.debug("Intent call result: %s", LazyPayload(result))
         return result
 
 
+def _timed(handler: AnyFunc) -> AnyFunc:
+    """Wrap sync handler to measure the time spent waiting for a worker thread"""
+
+    submitted = time.perf_counter()
+
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        timing.add(Phase.executor_wait, time.perf_counter() - submitted)
+        with timing.measure(Phase.handler, exclude=Phase.conversion):
+            return handler(*args, **kwargs)
+
+    return wrapper
+
+
 def _is_subtype(cls: Any, class_or_tuple: Any) -> bool:
     """
     Return true if class is a generic subclass of class_or_tuple.
@@ -115,12 +136,12 @@ def _is_attribute_v2(annotation) -> bool:
 
 
 def list_functor(annotation):
-    """Convert to List of type values"""
+    """Convert to List of type values: the whole list is converted in one pass"""
 
     to_type = next(iter(annotation), None)
     if _is_subtype(to_type, entities.AttributeV2):
-        return partial(map, attr_v2_functor(to_type.__args__)), list
-    return partial(map, entities.converter(to_type)), list
+        return (entities.attr_v2_batch_converter(next(iter(to_type.__args__), None)),)
+    return (entities.batch_converter(to_type),)
 
 
 def attr_v2_functor(annotation):
@@ -187,8 +208,12 @@ def apply(value, func: Callable[[Text], Any]) -> Optional[Any]:
     try:
         return func(value)
     except Exception as ex:  # NOSONAR
-        logger.exception(
-            "Exception converting %s with %s: %s ", repr(value), repr(func), repr(ex)
+        rate_limited.exception(
+            type(ex).__name__,
+            "Exception converting %s with %s: %s ",
+            repr(value),
+            repr(func),
+            repr(ex),
         )
         return EntityValueException(ex, value=value, func=func)
 
@@ -299,14 +324,15 @@ def _parse_and_call(
     if isinstance(request, Request):
         # Proceed with skill invoke request if first parameter is invoke request
         kw = _parse_request(request, parameters)
-        logger.debug("Collected arguments: %s", repr(kw))
+        logger.debug("Collected arguments: %s", LazyPayload(kw))
 
         ba = signature.bind(**kw)
-        arguments = {
-            name: converters[name](value) for name, value in ba.arguments.items()
-        }
+        with timing.measure(Phase.conversion):
+            arguments = {
+                name: converters[name](value) for name, value in ba.arguments.items()
+            }
 
-        logger.debug("Converted arguments to: %s", repr(arguments))
+        logger.debug("Converted arguments to: %s", LazyPayload(arguments))
         ba.arguments.update(arguments)
 
         # raises EntityValueException if not silent mode
@@ -336,8 +362,8 @@ def _log_and_call(message: Text, func: Callable, *args, **kwargs):
         "%s: calling %s with: %s, %s",
         message,
         repr(func.__name__),
-        repr(args),
-        repr(kwargs),
+        LazyPayload(args),
+        LazyPayload(kwargs),
     )
     return func(*args, **kwargs)
 
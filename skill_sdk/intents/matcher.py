@@ -0,0 +1,325 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Fuzzy matching of entity values against a catalog"""
+
+import re
+import heapq
+import logging
+import threading
+import unicodedata
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Text,
+    Tuple,
+    Union,
+)
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Catalog entries: list of values or dictionary of values to payloads
+Entries = Union[Iterable[Text], Mapping[Text, Any]]
+
+NON_WORD = re.compile(r"\W+")
+
+# Default n-gram size
+DEFAULT_NGRAM = 3
+
+# Default number of candidates returned
+DEFAULT_TOP_K = 5
+
+# Default minimal score of a candidate
+DEFAULT_THRESHOLD = 0.3
+
+
+def normalize(value: Text) -> Text:
+    """
+    Normalize a value for matching:
+        case-fold, strip diacritics and replace punctuation with single spaces
+
+    :param value:
+    :return:
+    """
+    value = unicodedata.normalize("NFKD", value.casefold())
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(NON_WORD.sub(" ", value).split())
+
+
+def ngrams(value: Text, n: int = DEFAULT_NGRAM) -> Tuple[Text, ...]:
+    """
+    Split normalized value to (unique) n-grams, the value is padded with spaces
+
+    :param value:
+    :param n:
+    :return:
+    """
+    padded = f" {value} "
+    if len(padded) <= n:
+        return (padded,)
+    return tuple({padded[i : i + n] for i in range(len(padded) - n + 1)})
+
+
+class Match(NamedTuple):
+    """Catalog entry matching a value"""
+
+    # Catalog entry
+    value: Text
+
+    # Similarity score: 1.0 is an exact match
+    score: float
+
+    # Payload attached to the catalog entry
+    payload: Any = None
+
+
+class _Index:
+    """Immutable n-gram index: replaced as a whole when catalog is refreshed"""
+
+    __slots__ = ("entries", "payloads", "sizes", "postings", "exact")
+
+    def __init__(
+        self,
+        entries: Entries,
+        n: int,
+        key: Callable[[Text], Text],
+    ):
+        if isinstance(entries, Mapping):
+            items = list(entries.items())
+        else:
+            items = [(entry, None) for entry in entries]
+
+        self.entries: Tuple[Text, ...] = tuple(entry for entry, _ in items)
+        self.payloads: Tuple[Any, ...] = tuple(payload for _, payload in items)
+
+        postings: Dict[Text, List[int]] = {}
+        self.exact: Dict[Text, List[int]] = {}
+        sizes = []
+        for i, entry in enumerate(self.entries):
+            normalized = key(entry)
+            self.exact.setdefault(normalized, []).append(i)
+            grams = ngrams(normalized, n)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+
+        self.sizes: Tuple[int, ...] = tuple(sizes)
+        self.postings: Dict[Text, Tuple[int, ...]] = {
+            gram: tuple(ids) for gram, ids in postings.items()
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Matcher:
+    """
+    Fuzzy matcher: finds catalog entries similar to a spoken entity value.
+
+        The catalog is indexed once (by n-grams of normalized values),
+        every lookup then only touches the entries that share n-grams with the value.
+        Score is the Dice coefficient of n-gram sets: 1.0 for an exact (normalized) match.
+
+        >>> stations = Matcher(["Berlin Hbf", "Bonn Hbf", "München Hbf"])
+        >>> stations.match("münchen")
+        [Match(value='München Hbf', score=0.7778, payload=None)]
+
+        Matcher can be used as a type hint in intent handler to receive the best match:
+
+        >>> @skill.intent_handler("TRAIN__DEPARTURES")
+        >>> def handler(station: stations):
+        >>>     ...
+
+    """
+
+    def __init__(
+        self,
+        entries: Entries = (),
+        *,
+        n: int = DEFAULT_NGRAM,
+        key: Callable[[Text], Text] = normalize,
+        k: int = DEFAULT_TOP_K,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        """
+        Build the catalog index
+
+        :param entries:     catalog: list of values, or dictionary of values to payloads
+        :param n:           n-gram size
+        :param key:         normalization function (can be a phonetic key function)
+        :param k:           default number of candidates to return
+        :param threshold:   default minimal score of a candidate
+        """
+        self.n = n
+        self.key = key
+        self.k = k
+        self.threshold = threshold
+        self._index = _Index(entries, n, key)
+
+    @classmethod
+    def from_file(cls, path: Union[Path, Text], **kwargs) -> "Matcher":
+        """
+        Load catalog from a file:
+            JSON file with a list of values, or a dictionary of values to payloads,
+            or a text file with a value per line
+
+        :param path:
+        :param kwargs:  keyword arguments forwarded to Matcher constructor
+        :return:
+        """
+        return cls(load_catalog(path), **kwargs)
+
+    def __len__(self):
+        return len(self._index)
+
+    def refresh(self, entries: Entries) -> "Matcher":
+        """
+        Rebuild the index with new catalog entries:
+        the new index is built aside and replaces the current one at once,
+        so that lookups are never blocked
+
+        :param entries:
+        :return:
+        """
+        index = _Index(entries, self.n, self.key)
+        self._index = index
+        logger.debug("Catalog refreshed: %d entries", len(index))
+        return self
+
+    def start_refresh(
+        self, loader: Callable[[], Entries], interval: float
+    ) -> threading.Event:
+        """
+        Refresh the catalog periodically in a background thread
+
+        :param loader:      function returning new catalog entries
+        :param interval:    refresh interval in seconds
+        :return:            event to set to stop refreshing
+        """
+        stop = threading.Event()
+
+        def refresh():
+            """Reload catalog until stopped"""
+            while not stop.wait(interval):
+                try:
+                    self.refresh(loader())
+                except Exception as ex:  # NOSONAR
+                    logger.exception("Failed to refresh catalog: %s", repr(ex))
+
+        threading.Thread(target=refresh, name="catalog-refresh", daemon=True).start()
+        return stop
+
+    def match(self, value: Text, k: int = None, threshold: float = None) -> List[Match]:
+        """
+        Find top-k catalog entries similar to the value
+
+        :param value:       value to match
+        :param k:           number of candidates to return
+        :param threshold:   minimal score of a candidate
+        :return:            list of matches, best match first
+        """
+        index = self._index
+        k = self.k if k is None else k
+        threshold = self.threshold if threshold is None else threshold
+
+        normalized = self.key(value)
+        exact = index.exact.get(normalized, ())
+        if len(exact) >= k:
+            return [Match(index.entries[i], 1.0, index.payloads[i]) for i in exact[:k]]
+
+        grams = ngrams(normalized, self.n)
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for i in index.postings.get(gram, ()):
+                counts[i] = counts.get(i, 0) + 1
+
+        size = len(grams)
+        sizes = index.sizes
+        scores = ((2.0 * common / (size + sizes[i]), i) for i, common in counts.items())
+        best = heapq.nlargest(
+            k, (_ for _ in scores if _[0] >= threshold), key=lambda _: _[0]
+        )
+        return [
+            Match(index.entries[i], round(score, 4), index.payloads[i])
+            for score, i in best
+        ]
+
+    def best(self, value: Text, threshold: float = None) -> Optional[Match]:
+        """
+        Return the best matching catalog entry or `None` if nothing matches
+
+        :param value:
+        :param threshold:
+        :return:
+        """
+        return next(iter(self.match(value, 1, threshold)), None)
+
+    def __call__(self, value: Text) -> Match:
+        """
+        Converter: return the best matching catalog entry
+
+        :param value:
+        :return:
+        @throws:    ValueError if no catalog entry matches the value
+        """
+        match = self.best(value)
+        if match is None:
+            raise ValueError(f"No catalog entry matches {repr(value)}")
+        return match
+
+    def top(
+        self, k: int = None, threshold: float = None
+    ) -> Callable[[Text], List[Match]]:
+        """
+        Converter returning top-k candidates:
+
+        >>> @skill.intent_handler("TRAIN__DEPARTURES")
+        >>> def handler(station: stations.top(3)):
+        >>>     ...
+
+        :param k:
+        :param threshold:
+        :return:
+        """
+
+        def converter(value: Text) -> List[Match]:
+            """Return top-k candidates"""
+            return self.match(value, k, threshold)
+
+        return converter
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {len(self)} entries>"
+
+
+def load_catalog(path: Union[Path, Text]) -> Entries:
+    """
+    Load catalog entries from a file
+
+    :param path:
+    :return:
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        catalog = orjson.loads(path.read_bytes())
+        if not isinstance(catalog, (list, dict)):
+            raise ValueError(f"Invalid catalog format in {path}")
+        return catalog
+
+    with path.open(encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -18,6 +18,7 @@ from typing import Any, Dict, List, Optional, Text
 from dateutil import tz
 
 from pydantic import Field
+from pydantic.utils import ValueItems
 
 from skill_sdk.__version__ import __spi_version__
 from skill_sdk.utils.util import CamelModel, DEFAULT_LOCALE
@@ -27,6 +28,40 @@ from skill_sdk.i18n import _, _n, _a, Translations
 logger = logging.getLogger(__name__)
 
 
+def _export(value: Any, include: Any, exclude: Any, options: Dict[Text, Any]) -> Any:
+    """
+    Export AttributeV2 values nested in dictionaries and lists, as Pydantic exports nested models
+
+    :param value:   attribute, list or dictionary of attributes
+    :param include: fields/items to include
+    :param exclude: fields/items to exclude
+    :param options: export options
+    :return:
+    """
+    if isinstance(value, AttributeV2):
+        return value.dict(include=include, exclude=exclude, **options)
+
+    value_include = ValueItems(value, include) if include else None
+    value_exclude = ValueItems(value, exclude) if exclude else None
+    items = [
+        (
+            key,
+            _export(
+                item,
+                value_include and value_include.for_element(key),
+                value_exclude and value_exclude.for_element(key),
+                options,
+            ),
+        )
+        for key, item in (
+            value.items() if isinstance(value, dict) else enumerate(value)
+        )
+        if (value_include is None or value_include.is_included(key))
+        and (value_exclude is None or not value_exclude.is_excluded(key))
+    ]
+    return dict(items) if isinstance(value, dict) else [item for _, item in items]
+
+
 class Context(CamelModel):
     """Intent invocation context"""
 
@@ -57,6 +92,28 @@ class Context(CamelModel):
     # User profile configuration
     user_profile_config: Optional[Text]
 
+    def dict(self, *args, **kwargs) -> Dict[Text, Any]:
+        """Export AttributeV2 values as dictionaries (with the same options as the context)"""
+        result = super().dict(*args, **kwargs)
+
+        # Same defaults as in `skill_sdk.utils.util.BaseModel.dict`
+        options = {
+            "by_alias": kwargs.get("by_alias", True),
+            "exclude_none": kwargs.get("exclude_none", True),
+            "exclude_unset": kwargs.get("exclude_unset", False),
+            "exclude_defaults": kwargs.get("exclude_defaults", False),
+        }
+        key = "attributesV2" if options["by_alias"] else "attributes_v2"
+        if key in result:
+            include, exclude = kwargs.get("include"), kwargs.get("exclude")
+            result[key] = _export(
+                self.attributes_v2,
+                include and ValueItems(self, include).for_element("attributes_v2"),
+                exclude and ValueItems(self, exclude).for_element("attributes_v2"),
+                options,
+            )
+        return result
+
     @staticmethod
     def _(*args, **kwargs):
         return _(*args, **kwargs)
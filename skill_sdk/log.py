@@ -9,13 +9,31 @@
 
 """Logging"""
 
-import os
 import re
 import time
-import json
+import atexit
+import asyncio
+import weakref
 import logging.config
-from traceback import format_exc
-from typing import Dict, Optional
+import logging.handlers
+import threading
+import functools
+from queue import Empty, Full, Queue
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import orjson
+from pydantic import BaseModel
 
 from skill_sdk import config
 
@@ -35,6 +53,9 @@ def setup_logging(
     log_level = log_level or config.settings.LOG_LEVEL
     log_format = log_format or config.settings.LOG_FORMAT
 
+    # Flush queued records before re-configuring handlers
+    stop_queue_logging()
+
     logging.getLogger().setLevel(log_level)
     logging.basicConfig(level=log_level)
 
@@ -55,42 +76,40 @@ def setup_logging(
         #
         if not (log_level == logging.DEBUG and logger.level < logging.DEBUG):
             logger.setLevel(log_level)
-        if log_format == config.FormatType.GELF:
-            for handler in logger.handlers:
+        for handler in logger.handlers:
+            if log_format == config.FormatType.GELF:
                 handler.setFormatter(CloudGELFFormatter())
+            if not any(isinstance(f, TraceSampler) for f in handler.filters):
+                handler.addFilter(TraceSampler())
 
+    if config.settings.LOG_QUEUE:
+        start_queue_logging()
 
-def tracing_headers() -> Dict:
-    """Extract tracing headers from Starlette's context"""
-    from skill_sdk.middleware import HeaderKeys, context
 
-    try:
-        return {
-            key: context.data[key]
-            for key in HeaderKeys
-            if context.data[key] is not None
-        }
-    # If we're not inside a request
-    except RuntimeError:
-        return {}
+def tracing_headers() -> Mapping:
+    """Return tracing headers of the current request (empty if not inside a request)"""
+    from skill_sdk.middleware.log import current
+
+    return current().headers
 
 
 class CloudGELFFormatter(logging.Formatter):
     """Graylog Extended Format (GELF) formatter"""
 
     def format(self, record: logging.LogRecord):
-        from skill_sdk.middleware import HeaderKeys
+        from skill_sdk.middleware.log import current
 
-        headers = tracing_headers()
+        # Queued records carry the context of the request they were logged in
+        request = getattr(record, "request_context", None) or current()
 
         # Cloud log record format
         line = {
             # Timestamp in milliseconds
-            "@timestamp": int(round(time.time() * 1000)),
+            "@timestamp": int(round(record.created * 1000)),
             # Log message level
             "level": record.levelname,
             # Process id
-            "process": os.getpid(),
+            "process": record.process,
             # Thread id
             "thread": str(record.thread),
             # Logger name
@@ -98,24 +117,56 @@ class CloudGELFFormatter(logging.Formatter):
             # Log message
             "message": record.getMessage(),
             # Trace id
-            "traceId": headers.get(HeaderKeys.trace_id, None),
+            "traceId": request.trace_id,
             # Span id
-            "spanId": headers.get(HeaderKeys.span_id, None),
+            "spanId": request.span_id,
             # Testing flag
-            "testing": str(headers.get(HeaderKeys.testing_flag, False)).lower()
-            in ("true", "1"),
+            "testing": str(request.testing_flag).lower() in ("true", "1"),
             # Tenant: a skill is not aware of tenant
-            "tenant": headers.get(HeaderKeys.tenant_id, None),
+            "tenant": request.tenant_id,
             # Magenta Transaction Id
-            "magentaTransactionId": headers.get(
-                HeaderKeys.magenta_transaction_id, None
-            ),
+            "magentaTransactionId": request.magenta_transaction_id,
         }
 
         if record.exc_info:
-            line["_traceback"] = format_exc()
+            line["_traceback"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(line).decode()
+
+
+class TraceSampler(logging.Filter):
+    """
+    Log sampling filter: keeps or drops all records of a request together,
+    based on a hash of request's trace ID and `LOG_SAMPLE_*` rate for the record level
 
-        return json.dumps(line)
+        Errors, records outside of a request (or without trace ID),
+        and records of requests with "X-User-Debug-Log" flag are always kept.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        level = record.levelno
+        if level >= logging.ERROR:
+            return True
+
+        settings = config.settings
+        if level >= logging.WARNING:
+            rate = settings.LOG_SAMPLE_WARNING
+        elif level >= logging.INFO:
+            rate = settings.LOG_SAMPLE_INFO
+        else:
+            rate = settings.LOG_SAMPLE_DEBUG
+
+        if rate >= 1:
+            return True
+
+        from skill_sdk.middleware.log import current
+
+        request = getattr(record, "request_context", None) or current()
+        return (
+            request.sample is None
+            or bool(request.user_debug_log)
+            or request.sample < rate
+        )
 
 
 def get_config_dict(log_level: int, log_format: config.FormatType) -> Dict:
@@ -128,10 +179,14 @@ def get_config_dict(log_level: int, log_format: config.FormatType) -> Dict:
             "formatters": {
                 "standard": {"class": "skill_sdk.log.CloudGELFFormatter"},
             },
+            "filters": {
+                "sampling": {"()": "skill_sdk.log.TraceSampler"},
+            },
             "handlers": {
                 "default": {
                     "level": log_level,
                     "formatter": "standard",
+                    "filters": ["sampling"],
                     "class": "logging.StreamHandler",
                 },
             },
@@ -147,10 +202,14 @@ def get_config_dict(log_level: int, log_format: config.FormatType) -> Dict:
                     "format": "%(asctime)s %(levelname)-8s %(name)s - %(message)s",
                 }
             },
+            "filters": {
+                "sampling": {"()": "skill_sdk.log.TraceSampler"},
+            },
             "handlers": {
                 "default": {
                     "level": log_level,
                     "formatter": "standard",
+                    "filters": ["sampling"],
                     "class": "logging.StreamHandler",
                 },
             },
@@ -165,14 +224,19 @@ def get_config_dict(log_level: int, log_format: config.FormatType) -> Dict:
 
 def patch_logger():
     """
-    Patch the `logging.Logger.isEnabledFor` method.
+    Patch the `logging.Logger.isEnabledFor` method:
+    enable all levels for requests with "X-User-Debug-Log" flag set.
+
+        Unless such request is in flight, the patch costs a single attribute check
+        on top of the original (cached) level check.
 
     :return:
     """
 
-    from skill_sdk.middleware import HeaderKeys, context
+    from skill_sdk.middleware import log as middleware
 
     _super = logging.Logger.isEnabledFor
+    user_debug = middleware.user_debug
 
     def is_enabled_for(instance: logging.Logger, level):
         """
@@ -182,17 +246,13 @@ def patch_logger():
         :param level:       logging level
         :return:
         """
-        try:
-            return context.data[HeaderKeys.user_debug_log] or _super(instance, level)
-        except (KeyError, RuntimeError):
-            return _super(instance, level)
+        if _super(instance, level):
+            return True
+        return middleware.debug_requests > 0 and user_debug.get()
 
     logging.Logger.isEnabledFor = is_enabled_for
 
 
-patch_logger()
-
-
 ###############################################################################
 #                                                                             #
 #   Optional formatter for GunicornLogger                                     #
@@ -222,7 +282,8 @@ except ModuleNotFoundError:  # pragma: no cover
 #  Limit log message size, and hide tokens from logs                          #
 #                                                                             #
 ###############################################################################
-JWT_REGEX = re.compile(r"^eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9._-]*")
+JWT_REGEX = re.compile(r"^(?P<scheme>Bearer )?eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9._-]*")
+JWT_MASK = r"\g<scheme>eyJ*****"
 
 
 def _trim(s):
@@ -245,7 +306,7 @@ def _copy(d, hide_tokens: bool = False):
     elif isinstance(d, (list, tuple)):
         return [_copy(v) for v in d]
     else:
-        return _trim(JWT_REGEX.sub("eyJ*****", d) if hide_tokens else d)
+        return _trim(JWT_REGEX.sub(JWT_MASK, d) if hide_tokens else d)
 
 
 def prepare_for_logging(record, hide_tokens: bool = False):
@@ -257,3 +318,381 @@ def prepare_for_logging(record, hide_tokens: bool = False):
     :return:
     """
     return _copy(record, hide_tokens)
+
+
+def _render(value, hide_tokens: bool) -> Iterator[str]:
+    """Render a value in chunks, trimming long strings and hiding possible JWT tokens"""
+
+    if isinstance(value, str):
+        yield repr(_trim(JWT_REGEX.sub(JWT_MASK, value) if hide_tokens else value))
+    elif isinstance(value, Mapping):
+        yield "{"
+        for i, (k, v) in enumerate(value.items()):
+            yield ", " if i else ""
+            yield from _render(k, hide_tokens)
+            yield ": "
+            yield from _render(v, hide_tokens)
+        yield "}"
+    elif isinstance(value, (list, tuple)):
+        yield "[" if isinstance(value, list) else "("
+        for i, v in enumerate(value):
+            yield ", " if i else ""
+            yield from _render(v, hide_tokens)
+        yield "]" if isinstance(value, list) else ")"
+    elif isinstance(value, BaseModel):
+        yield f"{type(value).__name__}("
+        for i, (k, v) in enumerate(value):
+            yield f", {k}=" if i else f"{k}="
+            yield from _render(v, hide_tokens)
+        yield ")"
+    else:
+        yield repr(value)
+
+
+class LazyPayload:
+    """
+    Payload (request, response, headers) to log: rendered only if the record is actually formatted
+
+        Long strings are trimmed to `LOG_ENTRY_MAX_STRING`, possible JWT tokens are hidden,
+        and rendering stops when the output reaches `LOG_ENTRY_MAX_SIZE`:
+        no copy of the payload is created.
+
+        >>> logger.debug("Response: %s", LazyPayload(response))
+
+    """
+
+    __slots__ = ("value", "hide_tokens", "limit")
+
+    def __init__(self, value: Any, hide_tokens: bool = False, limit: int = None):
+        """
+        :param value:       value to log
+        :param hide_tokens: specifies if JWT-like values should be replaced by asterisks
+        :param limit:       maximal length of the output (defaults to `LOG_ENTRY_MAX_SIZE`, 0 is unlimited)
+        """
+        self.value = value
+        self.hide_tokens = hide_tokens
+        self.limit = limit
+
+    def __str__(self) -> str:
+        limit = config.settings.LOG_ENTRY_MAX_SIZE if self.limit is None else self.limit
+        chunks = []
+        size = 0
+        for chunk in _render(self.value, self.hide_tokens):
+            chunks.append(chunk)
+            size += len(chunk)
+            if limit and size > limit:
+                return "".join(chunks)[:limit] + "..."
+        return "".join(chunks)
+
+    __repr__ = __str__
+
+
+###############################################################################
+#                                                                             #
+#  Rate-limited logging: protect CPU from floods of identical errors          #
+#                                                                             #
+###############################################################################
+
+# Key used for all records when maximal number of keys is exceeded
+OTHER_KEY = "other"
+
+
+@functools.lru_cache(maxsize=None)
+def _suppressed_records_counter():
+    """Prometheus counter of suppressed log records (if Prometheus exporter is installed)"""
+    try:
+        from skill_sdk.middleware.prometheus import Prometheus
+
+        return Prometheus.suppressed_log_records()
+    except ModuleNotFoundError:
+        return None
+
+
+# Rate-limited loggers: summaries of suppressed records are flushed periodically and on shutdown
+_rate_limited_loggers: "weakref.WeakSet[RateLimitedLogger]" = weakref.WeakSet()
+
+
+class RateLimitedLogger:
+    """
+    Logger wrapper that keeps first `LOG_RATE_LIMIT` records per key within `LOG_RATE_LIMIT_INTERVAL` seconds,
+    and counts the rest. When the interval is over, a summary with a number of suppressed records is logged.
+
+        Suppressed records are neither created nor formatted:
+        a flood of bad requests cannot turn traceback formatting into a CPU denial of service.
+
+        >>> rate_limited = RateLimitedLogger(logger)
+        >>> try:
+        >>>     ...
+        >>> except ValueError as ex:
+        >>>     rate_limited.exception(type(ex).__name__, "Conversion error: %s", repr(ex))
+
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        *,
+        max_keys: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param logger:      logger to write records to
+        :param max_keys:    maximal number of distinct keys: the rest is counted under "other" key
+        :param clock:       time function
+        """
+        self.logger = logger
+        self.max_keys = max_keys
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        # Key -> [window start, records logged, records suppressed]
+        self._windows: Dict[Hashable, List[Any]] = {}
+        _rate_limited_loggers.add(self)
+
+    def allow(self, key: Hashable) -> bool:
+        """
+        Check if a record with this key should be logged, count it otherwise
+
+        :param key:
+        :return:
+        """
+        limit = config.settings.LOG_RATE_LIMIT
+        if limit <= 0:
+            return True
+
+        interval = config.settings.LOG_RATE_LIMIT_INTERVAL
+        sample = config.settings.LOG_RATE_LIMIT_SAMPLE
+        now = self.clock()
+        summary = None
+
+        with self._lock:
+            if key not in self._windows and len(self._windows) >= self.max_keys:
+                key = OTHER_KEY
+
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= interval:
+                summary = window[2] if window is not None else None
+                window = self._windows[key] = [now, 0, 0]
+
+            if window[1] < limit:
+                window[1] += 1
+                allowed = True
+            else:
+                window[2] += 1
+                allowed = bool(sample) and window[2] % sample == 0
+
+        if summary:
+            self._summary(key, summary, interval)
+
+        if not allowed:
+            counter = _suppressed_records_counter()
+            if counter is not None:
+                counter.labels(config.settings.SKILL_NAME, self.logger.name).inc()
+
+        return allowed
+
+    def flush(self, expired_only: bool = False) -> None:
+        """
+        Log summaries for the keys with suppressed records, and reset counters
+
+        :param expired_only:    flush only the keys with rate limiting interval over (the rest keeps counting)
+        :return:
+        """
+        interval = config.settings.LOG_RATE_LIMIT_INTERVAL
+        now = self.clock()
+        with self._lock:
+            if expired_only:
+                windows = {
+                    key: window
+                    for key, window in self._windows.items()
+                    if now - window[0] >= interval
+                }
+                for key in windows:
+                    del self._windows[key]
+            else:
+                windows, self._windows = self._windows, {}
+        for key, (_, _, suppressed) in windows.items():
+            if suppressed:
+                self._summary(key, suppressed, interval)
+
+    def _summary(self, key: Hashable, suppressed: int, interval: float) -> None:
+        self.logger.warning(
+            "%d log record(s) with key %s suppressed within %s seconds.",
+            suppressed,
+            repr(key),
+            interval,
+        )
+
+    def log(self, key: Hashable, level: int, msg: str, *args, **kwargs) -> None:
+        """Log a message with level, if not rate-limited"""
+        if self.logger.isEnabledFor(level) and self.allow(key):
+            self.logger.log(level, msg, *args, **kwargs)
+
+    def error(self, key: Hashable, msg: str, *args, **kwargs) -> None:
+        """Log a message with ERROR level, if not rate-limited"""
+        self.log(key, logging.ERROR, msg, *args, **kwargs)
+
+    def exception(self, key: Hashable, msg: str, *args, **kwargs) -> None:
+        """Log a message with ERROR level and exception info, if not rate-limited"""
+        self.log(key, logging.ERROR, msg, *args, exc_info=True, **kwargs)
+
+
+def flush_rate_limited(expired_only: bool = False) -> None:
+    """
+    Log summaries of suppressed records for all rate-limited loggers
+
+    :param expired_only:    flush only the keys with rate limiting interval over
+    :return:
+    """
+    for rate_limited in list(_rate_limited_loggers):
+        rate_limited.flush(expired_only)
+
+
+async def flush_rate_limited_periodically(interval: float = None) -> None:
+    """
+    Flush the summaries of expired rate limiting windows at intervals:
+        otherwise a summary is logged only when a further record with the same key arrives
+
+    :param interval:    time in seconds between the flushes (defaults to `LOG_RATE_LIMIT_INTERVAL`)
+    :return:            immediately, if the interval is not positive
+    """
+    if interval is None:
+        interval = config.settings.LOG_RATE_LIMIT_INTERVAL
+    if interval <= 0:
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        flush_rate_limited(expired_only=True)
+
+
+###############################################################################
+#                                                                             #
+#  Non-blocking logging: records are formatted and written by a background    #
+#  thread, so that slow output never stalls the event loop                    #
+#                                                                             #
+###############################################################################
+
+# Loggers with own handlers: root and Uvicorn loggers (that do not propagate)
+QUEUED_LOGGERS = ("", "uvicorn", "uvicorn.access")
+
+
+@functools.lru_cache(maxsize=None)
+def _dropped_records_counter():
+    """Prometheus counter of dropped log records (if Prometheus exporter is installed)"""
+    try:
+        from skill_sdk.middleware.prometheus import Prometheus
+
+        return Prometheus.dropped_log_records()
+    except ModuleNotFoundError:
+        return None
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking handler: puts records to a bounded queue,
+    the oldest record is dropped if the queue is full.
+
+        Only the message is rendered in the calling thread
+        (so that mutable arguments are logged as they are now),
+        GELF encoding, traceback formatting and writing happen in `QueueListener` thread.
+    """
+
+    queue: Queue
+
+    def __init__(self, queue: Queue, handlers: Sequence[logging.Handler]):
+        """
+        :param queue:       queue shared with `QueueListener`
+        :param handlers:    handlers to write the records with
+        """
+        super().__init__(queue)
+        self.handlers = tuple(handlers)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> Tuple:  # type: ignore
+        from skill_sdk.middleware.log import current
+
+        record.request_context = current()
+        record.msg = record.getMessage()
+        record.args = None
+        return self.handlers, record
+
+    def enqueue(self, record) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except Empty:
+                    continue
+                self.dropped += 1
+                counter = _dropped_records_counter()
+                if counter is not None:
+                    counter.labels(config.settings.SKILL_NAME).inc()
+
+
+class QueueListener(logging.handlers.QueueListener):
+    """Background thread writing queued records with the handlers of originating logger"""
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue, respect_handler_level=True)
+
+    def handle(self, item) -> None:
+        handlers, record = item
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for a free slot: records queued before the sentinel are flushed
+        self.queue.put(self._sentinel)  # type: ignore
+
+
+_listener: Optional[QueueListener] = None
+_queued_handlers: Dict[str, List[logging.Handler]] = {}
+
+
+def start_queue_logging(maxsize: int = None) -> QueueListener:
+    """
+    Replace handlers of root and Uvicorn loggers with a `QueueHandler`
+    and start a background thread writing queued records
+
+    :param maxsize: maximal number of queued records (defaults to `LOG_QUEUE_SIZE`)
+    :return:
+    """
+    global _listener
+
+    stop_queue_logging()
+
+    records: Queue = Queue(maxsize or config.settings.LOG_QUEUE_SIZE)
+    for name in QUEUED_LOGGERS:
+        logger = logging.getLogger(name)
+        if logger.handlers:
+            _queued_handlers[name] = logger.handlers[:]
+            logger.handlers = [QueueHandler(records, logger.handlers)]
+
+    _listener = QueueListener(records)
+    _listener.start()
+    atexit.register(stop_queue_logging)
+
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """Restore original handlers and flush the queued records"""
+    global _listener
+
+    for name, handlers in _queued_handlers.items():
+        logging.getLogger(name).handlers = handlers
+    _queued_handlers.clear()
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        atexit.unregister(stop_queue_logging)
+
+
+patch_logger()
@@ -10,15 +10,12 @@
 
 """Middleware definitions"""
 
-from starlette_context.middleware import RawContextMiddleware
-from starlette_context import context  # noqa
-
 from skill_sdk.middleware import (
     error,
     log,
 )
 
-from skill_sdk.middleware.log import HeaderKeys
+from skill_sdk.middleware.log import HeaderKeys, context  # noqa
 
 
 def setup_middleware(app):
@@ -31,17 +28,7 @@ def setup_middleware(app):
 
     error.setup_middleware(app)
 
-    app.add_middleware(
-        RawContextMiddleware,
-        plugins=(
-            log.TraceIdPlugin(),
-            log.SpanIdIdPlugin(),
-            log.TenantIdIdPlugin(),
-            log.TestingFlagPlugin(),
-            log.UserDebugLogPlugin(),
-            log.MagentaTransactionId(),
-        ),
-    )
+    app.add_middleware(log.ContextMiddleware)
 
     # Since Prometheus metrics exporter is optional,
     # try to load prometheus middleware and simply eat an exception
@@ -51,3 +38,11 @@ def setup_middleware(app):
         setup(app)
     except ModuleNotFoundError:
         pass
+
+    from skill_sdk.config import settings
+
+    if settings.CAPTURE:
+        from skill_sdk.middleware import capture
+        from skill_sdk.routes import api_base
+
+        capture.setup(app, api_base())
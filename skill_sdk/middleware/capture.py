@@ -0,0 +1,251 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Traffic capture: sampled invoke requests with responses are written to a rotating JSONL file"""
+
+import os
+import time
+import random
+import hashlib
+import logging
+import logging.handlers
+from typing import Any, Dict, List, Mapping, Optional, Text
+
+import orjson
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from skill_sdk.config import settings
+from skill_sdk.log import JWT_MASK, JWT_REGEX
+
+logger = logging.getLogger(__name__)
+
+# Replaces the context tokens and authorization values whatever their format (opaque tokens included)
+TOKEN_MASK = "*****"
+
+
+def redact(value: Any) -> Any:
+    """
+    Replace JWT-like values (same as in the logs) and values of "Authorization" keys with asterisks
+
+    :param value:
+    :return:
+    """
+    if isinstance(value, str):
+        return JWT_REGEX.sub(JWT_MASK, value)
+    if isinstance(value, Mapping):
+        return {
+            key: TOKEN_MASK if str(key).lower() == "authorization" else redact(v)
+            for key, v in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+def mask_tokens(body: Dict[Text, Any]) -> Dict[Text, Any]:
+    """
+    Replace every value in context tokens with asterisks
+
+    :param body:    invoke request body
+    :return:
+    """
+    context = body.get("context")
+    if isinstance(context, Mapping) and isinstance(context.get("tokens"), Mapping):
+        tokens = {name: TOKEN_MASK for name in context["tokens"]}
+        body = {**body, "context": {**context, "tokens": tokens}}
+    return body
+
+
+def hash_session_id(body: Dict[Text, Any]) -> Dict[Text, Any]:
+    """
+    Replace session ID with its hash: the sessions are still distinguishable, but not traceable
+
+    :param body:    invoke request body
+    :return:
+    """
+    session = body.get("session")
+    if isinstance(session, Mapping) and session.get("id") is not None:
+        digest = hashlib.sha256(str(session["id"]).encode()).hexdigest()[:32]
+        body = {**body, "session": {**session, "id": digest}}
+    return body
+
+
+class CaptureWriter:
+    """
+    Rotating JSONL file writer:
+        the file is opened on first write in the current process,
+        so every worker of a pre-fork server writes its own file, if the name contains "{pid}"
+    """
+
+    def __init__(self, file_name: Text, max_bytes: int, backup_count: int) -> None:
+        """
+        :param file_name:       file name, "{pid}" is replaced with the process ID
+        :param max_bytes:       file size to rotate at
+        :param backup_count:    number of rotated files kept
+        """
+        self.file_name = file_name
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._pid: Optional[int] = None
+        self._handler: Optional[logging.Handler] = None
+
+    def handler(self) -> logging.Handler:
+        pid = os.getpid()
+        if self._handler is None or self._pid != pid:
+            file_name = self.file_name.format(pid=pid)
+            self._handler = logging.handlers.RotatingFileHandler(
+                file_name,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding="utf-8",
+            )
+            self._pid = pid
+            logger.info("Capturing invoke requests to %s", repr(file_name))
+        return self._handler
+
+    def write(self, record: Dict[Text, Any]) -> None:
+        line = orjson.dumps(record).decode()
+        self.handler().handle(logging.makeLogRecord(dict(msg=line)))
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
+
+
+class CaptureMiddleware:
+    """Pure ASGI middleware: records a sample of invoke requests and responses"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path: Text,
+        writer: CaptureWriter,
+        sample_rate: float = 1.0,
+        hash_session: bool = True,
+    ) -> None:
+        """
+        :param app:
+        :param path:            invoke endpoint path
+        :param writer:          capture file writer
+        :param sample_rate:     share of requests captured
+        :param hash_session:    replace session IDs with hashes
+        """
+        self.app = app
+        self.path = path
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.hash_session = hash_session
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] != self.path
+            or random.random() >= self.sample_rate  # nosec: not for security
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_body: List[bytes] = []
+        response_body: List[bytes] = []
+        status = 0
+
+        async def _receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                request_body.append(message.get("body", b""))
+            return message
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        timestamp = time.time()
+        begin = time.perf_counter()
+        await self.app(scope, _receive, _send)
+        latency = time.perf_counter() - begin
+
+        try:
+            self.capture(
+                timestamp,
+                latency,
+                status,
+                b"".join(request_body),
+                b"".join(response_body),
+            )
+        except Exception:  # NOSONAR
+            logger.exception("Failed to capture invoke request.")
+
+    def capture(
+        self,
+        timestamp: float,
+        latency: float,
+        status: int,
+        request: bytes,
+        response: bytes,
+    ) -> None:
+        """Write the capture record: redacted request, response and latency"""
+
+        try:
+            body = orjson.loads(request)
+        except orjson.JSONDecodeError:
+            body = None
+        if not isinstance(body, dict):
+            logger.debug("Invoke request is not a valid JSON object, not captured.")
+            return
+
+        body = mask_tokens(body)
+        if self.hash_session:
+            body = hash_session_id(body)
+
+        try:
+            result = orjson.loads(response) if response else None
+        except orjson.JSONDecodeError:
+            result = None
+
+        self.writer.write(
+            dict(
+                timestamp=round(timestamp, 6),
+                intent=(body.get("context") or {}).get("intent"),
+                latency=round(latency, 6),
+                status=status,
+                request=redact(body),
+                response=redact(result),
+            )
+        )
+
+
+def setup(app: FastAPI, path: Text) -> None:
+    """
+    Add capture middleware to the app
+
+    :param app:
+    :param path:    invoke endpoint path
+    :return:
+    """
+    writer = CaptureWriter(
+        settings.CAPTURE_FILE,
+        settings.CAPTURE_MAX_BYTES,
+        settings.CAPTURE_BACKUP_COUNT,
+    )
+    app.add_middleware(
+        CaptureMiddleware,
+        path=path,
+        writer=writer,
+        sample_rate=settings.CAPTURE_SAMPLE_RATE,
+        hash_session=settings.CAPTURE_HASH_SESSION_ID,
+    )
+    app.add_event_handler("shutdown", writer.close)
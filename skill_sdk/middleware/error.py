@@ -17,9 +17,11 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.encoders import jsonable_encoder
 
+from skill_sdk.log import RateLimitedLogger
 from skill_sdk.responses import ErrorCode
 
 logger = logging.getLogger(__name__)
+rate_limited = RateLimitedLogger(logger)
 
 INTERNAL_ERROR = "Internal error"
 BAD_REQUEST = "Bad request"
@@ -43,7 +45,13 @@ def setup_middleware(app: FastAPI):
     async def handle_400(request, exc):
         """Log the exception and return BAD_REQUEST"""
 
-        logger.exception("%s %s: %s", request.method, request.url, repr(exc))
+        rate_limited.exception(
+            (400, type(exc).__name__),
+            "%s %s: %s",
+            request.method,
+            request.url,
+            repr(exc),
+        )
         return JSONResponse(
             status_code=400,
             content=dict(code=ErrorCode.BAD_REQUEST, text=BAD_REQUEST),
@@ -53,7 +61,13 @@ def setup_middleware(app: FastAPI):
     async def handle_404(request, exc):
         """Log the exception and return NOT_FOUND"""
 
-        logger.exception("%s %s: %s", request.method, request.url, repr(exc))
+        rate_limited.exception(
+            (404, type(exc).__name__),
+            "%s %s: %s",
+            request.method,
+            request.url,
+            repr(exc),
+        )
         return JSONResponse(
             status_code=404,
             content=dict(code=ErrorCode.NOT_FOUND, text=NOT_FOUND),
@@ -63,7 +77,13 @@ def setup_middleware(app: FastAPI):
     async def handle_422(request, exc):
         """Unprocessable entity: raised by Pydantic validators"""
 
-        logger.exception("%s %s: %s", request.method, request.url, repr(exc))
+        rate_limited.exception(
+            (422, type(exc).__name__),
+            "%s %s: %s",
+            request.method,
+            request.url,
+            repr(exc),
+        )
         return JSONResponse(
             status_code=422,
             content=dict(
@@ -77,7 +97,11 @@ def setup_middleware(app: FastAPI):
     async def handle_500(request, exc):
         """Log the exception and return INTERNAL_ERROR"""
 
-        logger.exception("500 error raised, returning internal error: %s", repr(exc))
+        rate_limited.exception(
+            (500, type(exc).__name__),
+            "500 error raised, returning internal error: %s",
+            repr(exc),
+        )
         content = dict(
             code=ErrorCode.INTERNAL_ERROR,
             text=INTERNAL_ERROR,
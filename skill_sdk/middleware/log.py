@@ -10,8 +10,13 @@
 
 """Logging middleware: extract headers for logging"""
 
+import zlib
+import threading
 from enum import Enum
-from starlette_context.plugins.base import Plugin
+from contextvars import ContextVar
+from typing import Dict, Mapping, Optional, Text
+
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 class HeaderKeys(str, Enum):
@@ -25,48 +30,163 @@ class HeaderKeys(str, Enum):
     magenta_transaction_id = "Baggage-X-Magenta-Transaction-Id"
 
 
-class TraceIdPlugin(Plugin):
-    """Extracts trace ID from request"""
-
-    key = HeaderKeys.trace_id
-
+# Raw (lower-case) header names as received in ASGI scope
+_HEADER_NAMES: Dict[bytes, HeaderKeys] = {
+    key.value.lower().encode("latin-1"): key for key in HeaderKeys
+}
 
-class SpanIdIdPlugin(Plugin):
-    """Extracts span ID from request"""
 
-    key = HeaderKeys.span_id
+class TracingHeaders(Dict[HeaderKeys, Text]):
+    """Read-only dictionary of tracing headers: shared by all log records of a request"""
 
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is immutable")
 
-class TenantIdIdPlugin(Plugin):
-    """**IMPORTANT**: for logging purpose only, do not base tenant-specific logic on this header
+    __setitem__ = __delitem__ = _readonly  # type: ignore
+    clear = pop = popitem = setdefault = update = _readonly  # type: ignore
 
-    Extracts tenant ID from request
-    """
 
-    key = HeaderKeys.tenant_id
+def _sample(trace_id: Optional[Text]) -> Optional[float]:
+    """Map trace ID to [0, 1) range: CRC32 is stable across processes, unlike `hash`"""
+    if trace_id is None:
+        return None
+    return zlib.crc32(trace_id.encode("latin-1", "replace")) / 0x100000000
 
 
-class TestingFlagPlugin(Plugin):
+class RequestContext:
     """
-    Extracts "testing" flag from request:
-    testing flag distinguishes testing traffic from production
+    Immutable values of `HeaderKeys` extracted from a request
+
+        **IMPORTANT**: tenant ID is for logging purpose only,
+        do not base tenant-specific logic on this header
     """
 
-    key = HeaderKeys.testing_flag
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "tenant_id",
+        "testing_flag",
+        "user_debug_log",
+        "magenta_transaction_id",
+        "headers",
+        "sample",
+    )
+
+    trace_id: Optional[Text]
+    span_id: Optional[Text]
+    tenant_id: Optional[Text]
+    testing_flag: Optional[Text]
+    user_debug_log: Optional[Text]
+    magenta_transaction_id: Optional[Text]
+
+    # Headers present in request: forwarded to outbound calls
+    headers: TracingHeaders
+
+    # Stable value in [0, 1) derived from trace ID: same for all records of a request
+    sample: Optional[float]
+
+    def __init__(self, headers: Mapping[HeaderKeys, Text] = None) -> None:
+        headers = TracingHeaders(headers or {})
+        for key in HeaderKeys:
+            object.__setattr__(self, key.name, headers.get(key))
+        object.__setattr__(self, "headers", headers)
+        object.__setattr__(self, "sample", _sample(headers.get(HeaderKeys.trace_id)))
+
+    @classmethod
+    def from_scope(cls, scope: Scope) -> "RequestContext":
+        """
+        Extract all tracing headers in a single pass over raw headers list
+
+        :param scope:   ASGI connection scope
+        :return:
+        """
+        headers: Dict[HeaderKeys, Text] = {}
+        for name, value in scope.get("headers", ()):
+            key = _HEADER_NAMES.get(name)
+            # First occurrence wins, same as `request.headers.get`
+            if key is not None and key not in headers:
+                headers[key] = value.decode("latin-1")
+        return cls(headers)
+
+    @property
+    def data(self) -> Dict[HeaderKeys, Optional[Text]]:
+        """All header values (`None` if header is missing)"""
+        return {key: getattr(self, key.name) for key in HeaderKeys}
+
+    def __setattr__(self, name, value):
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.headers)!r})"
+
+
+# Context outside of a request: no headers
+EMPTY_CONTEXT = RequestContext()
+
+_request_context: ContextVar[RequestContext] = ContextVar(
+    "request_context", default=EMPTY_CONTEXT
+)
+
+
+def current() -> RequestContext:
+    """Return tracing context of the current request"""
+    return _request_context.get()
+
+
+# Per-request "user debug log" flag: set by the middleware if request has "X-User-Debug-Log" header
+user_debug: ContextVar[bool] = ContextVar("user_debug", default=False)
+
+# Number of requests in flight with "user debug log" flag:
+# while zero, the patched `logging.Logger.isEnabledFor` costs a single attribute check
+debug_requests = 0
+_debug_lock = threading.Lock()
+
+
+def _count_debug_requests(delta: int) -> None:
+    global debug_requests
+    with _debug_lock:
+        debug_requests += delta
+
+
+class ContextMiddleware:
+    """Pure ASGI middleware: stores tracing headers of every request in a context variable"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestContext.from_scope(scope)
+        token = _request_context.set(request)
+        debug_token = None
+        if request.user_debug_log:
+            debug_token = user_debug.set(True)
+            _count_debug_requests(1)
 
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if debug_token is not None:
+                _count_debug_requests(-1)
+                user_debug.reset(debug_token)
+            _request_context.reset(token)
 
-class UserDebugLogPlugin(Plugin):
-    """
-    Extracts "user debug log" flag from request:
-    the flag is set to temporary activate debug logging for the user
-    """
 
-    key = HeaderKeys.user_debug_log
+class _Context:
+    """
+    Backward compatible accessor to tracing headers:
 
+        >>> from skill_sdk.middleware import context, HeaderKeys
+        >>> context.data[HeaderKeys.trace_id]
 
-class MagentaTransactionId(Plugin):
-    """
-    Extracts Magenta transaction ID
     """
 
-    key = HeaderKeys.magenta_transaction_id
+    @property
+    def data(self) -> Dict[HeaderKeys, Optional[Text]]:
+        return current().data
+
+
+context = _Context()
@@ -13,10 +13,12 @@
 import time
 import logging
 from functools import partial, wraps
-from typing import Any, Callable, Text
+from typing import Any, Callable, Text, TYPE_CHECKING
 from contextlib import contextmanager, ContextDecorator
 from fastapi import FastAPI
-import httpx
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
 
 from skill_sdk.config import settings
 
@@ -24,6 +26,14 @@ logger = logging.getLogger(__name__)
 
 HTTP_REQUESTS_LATENCY_SECONDS = "http_requests_latency_seconds"
 HTTP_PARTNER_REQUEST_COUNT = "http_partner_request_count"
+LOG_RECORDS_SUPPRESSED = "log_records_suppressed"
+LOG_RECORDS_DROPPED = "log_records_dropped"
+INVOKE_PHASE_LATENCY_SECONDS = "invoke_phase_latency_seconds"
+HTTP_PARTNER_REQUEST_LATENCY_SECONDS = "http_partner_request_latency_seconds"
+HTTP_PARTNER_REQUEST_TIMEOUTS = "http_partner_request_timeouts"
+HTTP_PARTNER_CIRCUIT_OPEN = "http_partner_circuit_open"
+EVENT_LOOP_LAG_SECONDS = "event_loop_lag_seconds"
+EVENT_LOOP_BLOCKED = "event_loop_blocked"
 
 try:
     from starlette_exporter import PrometheusMiddleware, handle_metrics
@@ -65,6 +75,126 @@ class Prometheus(PrometheusMiddleware):
             )
         return PrometheusMiddleware._metrics[metric_name]
 
+    @staticmethod
+    def suppressed_log_records():
+        """Log records suppressed by rate limiting counter"""
+
+        metric_name = LOG_RECORDS_SUPPRESSED
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Counter(
+                metric_name,
+                "Log records suppressed by rate limiting",
+                ("job", "logger"),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def dropped_log_records():
+        """Log records dropped from the full logging queue counter"""
+
+        metric_name = LOG_RECORDS_DROPPED
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Counter(
+                metric_name,
+                "Log records dropped from the full logging queue",
+                ("job",),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def invoke_phase_latency():
+        """Intent invoke pipeline phases latency histogram"""
+
+        metric_name = INVOKE_PHASE_LATENCY_SECONDS
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Histogram(
+                metric_name,
+                "Intent invoke latency by phase in seconds",
+                ("job", "intent", "phase"),
+                buckets=(
+                    0.0001,
+                    0.0005,
+                    0.001,
+                    0.005,
+                    0.01,
+                    0.025,
+                    0.05,
+                    0.1,
+                    0.25,
+                    0.5,
+                    1.0,
+                    2.5,
+                    5.0,
+                ),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def partner_requests_latency():
+        """HTTP requests to partner services latency histogram"""
+
+        metric_name = HTTP_PARTNER_REQUEST_LATENCY_SECONDS
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Histogram(
+                metric_name,
+                "HTTP Requests for services latency in seconds",
+                ("job", "partner_name", "endpoint", "status"),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def partner_requests_timeouts():
+        """HTTP requests to partner services timeouts counter"""
+
+        metric_name = HTTP_PARTNER_REQUEST_TIMEOUTS
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Counter(
+                metric_name,
+                "HTTP Requests for services timed out",
+                ("job", "partner_name"),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def partner_circuit_open():
+        """HTTP requests to partner services rejected by open circuit breaker counter"""
+
+        metric_name = HTTP_PARTNER_CIRCUIT_OPEN
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Counter(
+                metric_name,
+                "HTTP Requests for services rejected by open circuit breaker",
+                ("job", "partner_name"),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def event_loop_lag():
+        """Event loop scheduling lag histogram"""
+
+        metric_name = EVENT_LOOP_LAG_SECONDS
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Histogram(
+                metric_name,
+                "Event loop scheduling lag in seconds",
+                ("job",),
+                buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
+    @staticmethod
+    def event_loop_blocked():
+        """Event loop blocked longer than threshold counter"""
+
+        metric_name = EVENT_LOOP_BLOCKED
+        if metric_name not in PrometheusMiddleware._metrics:
+            PrometheusMiddleware._metrics[metric_name] = Counter(
+                metric_name,
+                "Event loop blocked longer than threshold",
+                ("job", "intent"),
+            )
+        return PrometheusMiddleware._metrics[metric_name]
+
 
 class prometheus_latency(ContextDecorator):  # noqa
     """
@@ -94,7 +224,7 @@ class prometheus_latency(ContextDecorator):  # noqa
         Prometheus.requests_latency().labels(*labels).observe(end - self.begin)
 
 
-def _inc_partner_call(partner_name: Text, response: httpx.Response) -> None:
+def _inc_partner_call(partner_name: Text, response: "httpx.Response") -> None:
     try:
         status_code = response.status_code
         labels = [settings.SKILL_NAME, partner_name, status_code]
@@ -130,7 +260,33 @@ def partner_call(partner_name: Text, func: Callable[..., Any]):
     yield wrapper
 
 
-def count_partner_calls(partner_name: Text) -> Callable[[httpx.Response], None]:
+def observe_partner_call(
+    partner_name: Text,
+    endpoint: Text,
+    status: Any,
+    seconds: float,
+) -> None:
+    """
+    Record a partner call: called by `skill_sdk.requests.Client`/`AsyncClient` after every request
+
+    :param partner_name:
+    :param endpoint:    endpoint template
+    :param status:      HTTP status code, or "timeout", "circuit_open", "error"
+    :param seconds:     call duration
+    :return:
+    """
+    job = settings.SKILL_NAME
+    Prometheus.partner_requests_latency().labels(
+        job, partner_name, endpoint, status
+    ).observe(seconds)
+
+    if status == "timeout":
+        Prometheus.partner_requests_timeouts().labels(job, partner_name).inc()
+    elif status == "circuit_open":
+        Prometheus.partner_circuit_open().labels(job, partner_name).inc()
+
+
+def count_partner_calls(partner_name: Text) -> Callable[["httpx.Response"], None]:
     """
     Response hook to count HTTP requests to partner service,
     can be attached to `skill_sdk.requests.Client`/`AsyncClient`
@@ -9,8 +9,11 @@
 
 """HTTP sync/async clients with circuit breaker"""
 
-from typing import Callable, Iterable, List, Union
+from typing import Any, Callable, Iterable, List, Optional, Text, Union
+import time
 import logging
+import functools
+from contextvars import ContextVar
 from warnings import warn
 
 import httpx
@@ -18,17 +21,99 @@ from httpx import codes, HTTPError, Response  # noqa
 
 from aiobreaker import (
     CircuitBreaker,
+    CircuitBreakerError,
     CircuitBreakerState,  # noqa
 )
 
 from skill_sdk.config import settings
 from skill_sdk.log import tracing_headers
+from skill_sdk.utils import timing
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_REQUESTS_TIMEOUT = settings.REQUESTS_TIMEOUT
 
 
+# Dry-run mode (set during warm-up): requests are not sent, an empty response is returned
+dry_run: ContextVar[bool] = ContextVar("dry_run", default=False)
+
+# Endpoint label of partner calls, if endpoint template is not set explicitly:
+# URL paths are not used as labels, dynamic segments would create unbounded number of time series
+UNKNOWN_ENDPOINT = "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def _prometheus():
+    """Prometheus middleware module (if Prometheus exporter is installed)"""
+    try:
+        from skill_sdk.middleware import prometheus
+
+        return prometheus
+    except ModuleNotFoundError:
+        return None
+
+
+def _partner_name(client: Union["Client", "AsyncClient"], url: Any) -> Text:
+    """Partner service name: client name, or host of the requested URL"""
+
+    if client.name:
+        return client.name
+    host: Optional[Text] = client.base_url.host or httpx.URL(str(url)).host
+    return host or "unknown"
+
+
+def _dry_run_response(
+    client: Union["Client", "AsyncClient"],
+    method: Text = "GET",
+    url: Any = "",
+    *args,
+    **kwargs,
+) -> Response:
+    """Empty response returned in dry-run mode instead of sending a request"""
+
+    logger.debug("Dry run: %s %s is not sent.", method, url)
+    return Response(200, json={}, request=client.build_request(method, url))
+
+
+def _record_call(
+    client: Union["Client", "AsyncClient"],
+    begin: float,
+    result: Optional[Response],
+    error: Optional[Exception],
+    endpoint: Optional[Text],
+    method: Text = None,
+    url: Any = "",
+    *args,
+    **kwargs,
+) -> None:
+    """Record partner call duration to request timings and Prometheus metrics"""
+
+    seconds = time.perf_counter() - begin
+    url = kwargs.get("url", url)
+    partner = _partner_name(client, url)
+    timing.add_partner(partner, seconds)
+
+    prometheus = _prometheus()
+    if prometheus is None:
+        return
+
+    if isinstance(error, httpx.HTTPStatusError):
+        result = error.response
+
+    status: Any = (
+        result.status_code
+        if result is not None
+        else "timeout"
+        if isinstance(error, httpx.TimeoutException)
+        else "circuit_open"
+        if isinstance(error, CircuitBreakerError)
+        else "error"
+    )
+    prometheus.observe_partner_call(
+        partner, endpoint or UNKNOWN_ENDPOINT, status, seconds
+    )
+
+
 class Client(httpx.Client):
     """
     Sync HTTP client with a circuit breaker
@@ -42,6 +127,7 @@ class Client(httpx.Client):
         timeout: Union[int, float] = None,
         exclude: Iterable[codes] = None,
         response_hook: Callable[[httpx.Response], None] = None,
+        name: Text = None,
         **kwargs,
     ) -> None:
         """
@@ -54,9 +140,11 @@ class Client(httpx.Client):
         :param timeout:         optional timeout for a request
         :param exclude:         list of HTTP status codes that are treated as "normal" (no exception is raised)
         :param response_hook:   function to be executed after a response is received (with response as argument)
+        :param name:            partner service name to report call durations with (defaults to URL host)
         :param kwargs:          keyword arguments passed over to request
         """
         self.internal = internal
+        self.name = name
 
         # If no custom circuit breaker supplied, we'll create a new instance
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
@@ -70,8 +158,21 @@ class Client(httpx.Client):
         self,
         *args,
         exclude: Iterable[codes] = None,
+        endpoint: Text = None,
         **kwargs,
     ):
+        """
+        Send a request through the circuit breaker, recording duration and status
+
+        :param args:
+        :param exclude:     list of HTTP status codes that are treated as "normal" (no exception is raised)
+        :param endpoint:    endpoint template to report in metrics, e.g. "/items/{id}"
+        :param kwargs:
+        :return:
+        """
+        if dry_run.get():
+            return _dry_run_response(self, *args, **kwargs)
+
         exclude = exclude or self.exclude
 
         # Propagate tracing headers if request is created as "internal"
@@ -94,11 +195,15 @@ class Client(httpx.Client):
 
             return _r
 
+        begin = time.perf_counter()
+        result: Optional[Response] = None
+        error: Optional[Exception] = None
         try:
-            result = _inner_call(*args, **kwargs)
-            logger.debug("HTTP completed with status code: %d", result.status_code)
+            result = response = _inner_call(*args, **kwargs)
+            logger.debug("HTTP completed with status code: %d", response.status_code)
 
         except HTTPError as e:
+            error = e
             logger.error(
                 "HTTP request [%s, %s] failed with error: %s",
                 repr(args),
@@ -106,6 +211,11 @@ class Client(httpx.Client):
                 repr(e),
             )
             raise
+        except CircuitBreakerError as e:
+            error = e
+            raise
+        finally:
+            _record_call(self, begin, result, error, endpoint, *args, **kwargs)
         return result
 
 
@@ -122,6 +232,7 @@ class AsyncClient(httpx.AsyncClient):
         timeout: Union[int, float] = None,
         exclude: List[codes] = None,
         response_hook: Callable[[httpx.Response], None] = None,
+        name: Text = None,
         **kwargs,
     ) -> None:
         """
@@ -134,9 +245,11 @@ class AsyncClient(httpx.AsyncClient):
         :param timeout:         optional timeout for a request
         :param exclude:         list of HTTP status codes that are treated as "normal" (no exception is raised)
         :param response_hook:   function to be executed after a response is received (with response as argument)
+        :param name:            partner service name to report call durations with (defaults to URL host)
         :param kwargs:          keyword arguments passed over to request
         """
         self.internal = internal
+        self.name = name
 
         # If no custom circuit breaker supplied, we'll create a new instance
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
@@ -150,8 +263,21 @@ class AsyncClient(httpx.AsyncClient):
         self,
         *args,
         exclude: Iterable[codes] = None,
+        endpoint: Text = None,
         **kwargs,
     ):
+        """
+        Send a request through the circuit breaker, recording duration and status
+
+        :param args:
+        :param exclude:     list of HTTP status codes that are treated as "normal" (no exception is raised)
+        :param endpoint:    endpoint template to report in metrics, e.g. "/items/{id}"
+        :param kwargs:
+        :return:
+        """
+        if dry_run.get():
+            return _dry_run_response(self, *args, **kwargs)
+
         exclude = exclude or self.exclude
 
         # Propagate tracing headers if request is created as "internal"
@@ -174,11 +300,15 @@ class AsyncClient(httpx.AsyncClient):
 
             return _r
 
+        begin = time.perf_counter()
+        result: Optional[Response] = None
+        error: Optional[Exception] = None
         try:
-            result = await _inner_call(*args, **kwargs)
-            logger.debug("HTTP completed with status code: %d", result.status_code)
+            result = response = await _inner_call(*args, **kwargs)
+            logger.debug("HTTP completed with status code: %d", response.status_code)
 
         except HTTPError as e:
+            error = e
             logger.error(
                 "HTTP request [%s, %s] failed with error: %s",
                 repr(args),
@@ -186,6 +316,11 @@ class AsyncClient(httpx.AsyncClient):
                 repr(e),
             )
             raise
+        except CircuitBreakerError as e:
+            error = e
+            raise
+        finally:
+            _record_call(self, begin, result, error, endpoint, *args, **kwargs)
         return result
 
 
@@ -10,13 +10,21 @@
 
 """Route definitions"""
 
+import time
 import logging
 import secrets
-from typing import Text
-
-from fastapi import Depends, FastAPI, Request, Security
-from fastapi.responses import JSONResponse, RedirectResponse
+from typing import Any, Callable, Dict, List, Optional, Text
+
+from fastapi import APIRouter, Depends, FastAPI, Query, Request, Security
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    Response,
+)
+from fastapi.routing import APIRoute
 from fastapi.exceptions import HTTPException
+from starlette.types import Receive, Scope, Send
 from fastapi.security.http import (
     HTTPBasic,
     HTTPBasicCredentials,
@@ -27,6 +35,9 @@ import skill_sdk.i18n
 from skill_sdk.config import settings
 from skill_sdk.__version__ import __version__
 from skill_sdk.intents import invoke
+from skill_sdk.utils import timing
+from skill_sdk.utils.timing import Phase
+from skill_sdk.utils.util import run_in_executor
 
 from skill_sdk.responses import SkillInfoResponse, SkillInvokeResponse
 
@@ -87,6 +98,37 @@ async def handle_info_request(request: Request):
     )
 
 
+class InvokeRoute(APIRoute):
+    """
+    Invoke route:
+        counts in-flight invokes (including response background tasks), rejects invokes while draining,
+        starts collecting phase timings before request body is decoded
+    """
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = scope["app"]
+        if app.rejecting:
+            response = JSONResponse(
+                dict(text="Shutting down"),
+                status_code=503,
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        with app.in_flight:
+            await super().handle(scope, receive, send)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timing.start()
+            return await handler(request)
+
+        return timed_handler
+
+
 async def invoke_intent(
     rq: Request,
     request: skill_sdk.intents.Request,
@@ -112,17 +154,44 @@ async def invoke_intent(
             return skill_sdk.i18n.Translations()
         return app.translations[locale]
 
+    timings = timing.current()
+    if timings is not None:
+        timings.add(Phase.decode, time.perf_counter() - timings.begin)
+
     try:
         handler = rq.app.get_handler(request.context.intent)
     except KeyError:
         logger.error("Intent not found: %s", repr(request.context.intent))
         return JSONResponse({"code": 1, "text": "Intent not found!"}, status_code=404)
 
-    response = await invoke(
-        handler,
-        request.with_translation(_get_translation(rq.app, request.context.locale)),
+    with timing.measure(Phase.translation):
+        request = request.with_translation(
+            _get_translation(rq.app, request.context.locale)
+        )
+
+    response = await invoke(handler, request)
+
+    with timing.measure(Phase.serialize):
+        result = JSONResponse(response.dict())
+
+    timing.observe(rq.app.handled_intent(request.context.intent), timings)
+    if timings is not None and _server_timing(rq):
+        result.headers["Server-Timing"] = timings.server_timing()
+
+    return result
+
+
+def _server_timing(rq: Request) -> bool:
+    """
+    Check if "Server-Timing" header should be added to invoke response:
+        in development mode, if enabled in settings, or requested with (trusted) request header
+
+    """
+    return bool(
+        rq.app.debug
+        or settings.SERVER_TIMING
+        or rq.headers.get(settings.SERVER_TIMING_HEADER, "").lower() in ("1", "true")
     )
-    return JSONResponse(response.dict())
 
 
 def api_base():
@@ -161,6 +230,138 @@ async def health(r: Request) -> JSONResponse:
     return JSONResponse(dict(text="Ok"), status_code=200)
 
 
+async def profile(
+    seconds: float = Query(10, gt=0, description="Profiling duration in seconds"),
+    frequency: int = Query(100, gt=0, le=1000, description="Samples per second"),
+    intent: Optional[Text] = Query(None, description="Sample only this intent"),
+) -> PlainTextResponse:
+    """
+    Sampling profiler endpoint
+
+        Samples the stacks of all threads and returns them in "collapsed" format,
+        ready to be rendered as a flame graph (`flamegraph.pl`, speedscope etc.)
+
+    :param seconds:     profiling duration (limited to `PROFILER_MAX_SECONDS`)
+    :param frequency:   sampling frequency
+    :param intent:      if set, only stacks invoking this intent are sampled
+
+    :return:
+    """
+    from skill_sdk.utils.profiler import ProfilerBusy, SamplingProfiler
+
+    profiler = SamplingProfiler(frequency, intent)
+    try:
+        await run_in_executor(profiler.run, min(seconds, settings.PROFILER_MAX_SECONDS))
+    except ProfilerBusy as ex:
+        raise HTTPException(status_code=409, detail=str(ex))
+
+    return PlainTextResponse(profiler.collapsed())
+
+
+memory_router = APIRouter(tags=["Admin endpoints"])
+
+
+@memory_router.post("/tracemalloc/start", name="Start Tracing Allocations")
+async def tracemalloc_start(
+    frames: int = Query(1, gt=0, le=100, description="Frames stored per allocation")
+) -> Dict[Text, Any]:
+    """Start tracing memory allocations"""
+    from skill_sdk.utils import memory
+
+    return memory.start(frames)
+
+
+@memory_router.post("/tracemalloc/stop", name="Stop Tracing Allocations")
+async def tracemalloc_stop() -> Dict[Text, Any]:
+    """Stop tracing memory allocations and discard the snapshots"""
+    from skill_sdk.utils import memory
+
+    return memory.stop()
+
+
+@memory_router.get("/tracemalloc", name="Tracing Status")
+async def tracemalloc_status() -> Dict[Text, Any]:
+    """Tracing status, traced memory size and snapshot names"""
+    from skill_sdk.utils import memory
+
+    return memory.status()
+
+
+@memory_router.post("/snapshots/{name}", name="Take Snapshot")
+async def take_snapshot(name: Text) -> Dict[Text, Any]:
+    """
+    Take a named snapshot of traced allocations
+
+    :param name:    snapshot name
+    :return:
+    """
+    from skill_sdk.utils import memory
+
+    try:
+        return await run_in_executor(
+            memory.take_snapshot, name, settings.MEMORY_MAX_SNAPSHOTS
+        )
+    except RuntimeError as ex:
+        raise HTTPException(status_code=409, detail=str(ex))
+
+
+@memory_router.get("/snapshots/{name}", name="Snapshot Statistics")
+async def snapshot_statistics(
+    name: Text,
+    base: Optional[Text] = Query(None, description="Base snapshot to compare with"),
+    group_by: Text = Query("lineno", regex="^(lineno|traceback|filename)$"),
+    limit: int = Query(20, gt=0),
+) -> List[Dict[Text, Any]]:
+    """
+    Top allocations of a snapshot, or top differences to the base snapshot
+
+    :param name:        snapshot name
+    :param base:        base snapshot name
+    :param group_by:    group allocations by "lineno", "traceback" or "filename"
+    :param limit:       number of top entries
+    :return:
+    """
+    from skill_sdk.utils import memory
+
+    try:
+        return await run_in_executor(memory.statistics, name, base, group_by, limit)
+    except KeyError as ex:
+        raise HTTPException(status_code=404, detail=ex.args[0])
+
+
+@memory_router.get("/objects", name="Live Objects")
+async def object_counts(limit: int = Query(50, gt=0)) -> Dict[Text, int]:
+    """Number of live objects by type"""
+    from skill_sdk.utils import memory
+
+    return await run_in_executor(memory.object_counts, limit)
+
+
+@memory_router.get("/gc", name="GC Statistics")
+async def gc_stats() -> Dict[Text, Any]:
+    """Garbage collector statistics"""
+    from skill_sdk.utils import memory
+
+    return memory.gc_stats()
+
+
+async def readiness(r: Request) -> JSONResponse:
+    """
+    Readiness probe: fails while the skill is warming up or shutting down
+
+    :param r:   starlette's request
+
+    :return:
+    """
+    if getattr(r.app, "draining", False):
+        return JSONResponse(dict(text="Shutting down"), status_code=503)
+
+    if getattr(r.app, "warming_up", False):
+        return JSONResponse(dict(text="Warming up"), status_code=503)
+
+    return await health(r)
+
+
 def setup_routes(app: FastAPI):
     """
     Setup default skill routes:
@@ -169,6 +370,8 @@ def setup_routes(app: FastAPI):
         - POST  /
         - GET   /k8s/readiness
         - GET   /k8s/liveness
+        - GET   /admin/profile (if enabled)
+        - /admin/memory/* (if enabled)
 
     :param app:
     :return:
@@ -189,9 +392,10 @@ def setup_routes(app: FastAPI):
         tags=["Skill endpoints"],
     )
 
-    app.add_api_route(
+    app.router.add_api_route(
         f"{api_base()}",
         invoke_intent,
+        route_class_override=InvokeRoute,
         dependencies=authentication,
         methods=["POST"],
         response_model=SkillInvokeResponse,
@@ -202,7 +406,7 @@ def setup_routes(app: FastAPI):
 
     app.add_route(
         settings.K8S_READINESS,
-        health,
+        readiness,
         name="Readiness Probe",
     )
     app.add_route(
@@ -211,6 +415,31 @@ def setup_routes(app: FastAPI):
         name="Liveness Probe",
     )
 
-    # Redirect root to "/redoc", if not in "debug" mode
-    if not app.debug:
+    if settings.PROFILER:
+        app.add_api_route(
+            settings.PROFILER_ENDPOINT,
+            profile,
+            dependencies=[
+                Depends(
+                    check_credentials(settings.SKILL_API_USER, settings.SKILL_API_KEY)
+                )
+            ],
+            response_class=PlainTextResponse,
+            name="Sampling Profiler",
+            tags=["Admin endpoints"],
+        )
+
+    if settings.MEMORY_DIAGNOSTICS:
+        app.include_router(
+            memory_router,
+            prefix=settings.MEMORY_ENDPOINT,
+            dependencies=[
+                Depends(
+                    check_credentials(settings.SKILL_API_USER, settings.SKILL_API_KEY)
+                )
+            ],
+        )
+
+    # Redirect root to "/redoc", if not in "debug" mode (and docs are not disabled)
+    if not app.debug and app.openapi_url:
         app.add_route("/", RedirectResponse(url=app.redoc_url or "/redoc"))
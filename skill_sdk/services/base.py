@@ -17,6 +17,7 @@ from typing import Dict, Text
 from aiobreaker import CircuitBreaker
 
 from skill_sdk.intents import r
+from skill_sdk.log import LazyPayload
 from skill_sdk.requests import AsyncClient, Client
 
 logger = logging.getLogger(__name__)
@@ -118,7 +119,7 @@ class BaseService:
 
         _headers.update(self._headers)
 
-        logger.debug("Client headers: %s", repr(_headers))
+        logger.debug("Client headers: %s", LazyPayload(_headers, hide_tokens=True))
         return _headers
 
     @property
@@ -131,6 +132,7 @@ class BaseService:
             headers=self.headers,
             timeout=self.timeout,
             circuit_breaker=self.circuit_breaker,
+            name=self.NAME,
         )
 
     @property
@@ -143,4 +145,5 @@ class BaseService:
             headers=self.headers,
             timeout=self.timeout,
             circuit_breaker=self.circuit_breaker,
+            name=self.NAME,
         )
@@ -9,16 +9,20 @@
 
 """Skill runner"""
 
+import json
+import asyncio
+import contextlib
 import inspect
 import logging
 from functools import partial
 from pathlib import Path
 from types import MappingProxyType, ModuleType
-from typing import Any, Callable, Dict, Mapping, Text, Union
+from typing import Any, Callable, Dict, Mapping, Optional, Text, Union
 from fastapi import FastAPI
 
 from skill_sdk import i18n
 from skill_sdk.utils import util
+from skill_sdk.utils.drain import InFlight
 from skill_sdk.intents import handlers, invoke
 from skill_sdk.responses import Response
 
@@ -59,9 +63,120 @@ class Skill(FastAPI):
         self.translations = translations or i18n.load_translations()
         self.intents = MappingProxyType(self.__intents)
 
+        # Invokes in flight, and the flags set on shutdown: readiness probe fails, new invokes are rejected
+        self.in_flight = InFlight()
+        self.draining = False
+        self.rejecting = False
+
+        # Set while warming up: readiness probe fails
+        self.warming_up = False
+
         super().__init__(**kwargs)
 
-        util.populate_intent_examples(self.intents)
+        # Drain before other shutdown handlers (that might close the clients used by intent handlers)
+        self.router.on_startup.insert(0, self.undrain)
+        self.router.on_shutdown.insert(0, self.drain)
+
+        # Summaries of rate-limited log records: flushed when the interval is over, and on shutdown
+        self._log_flush: Optional[asyncio.Task] = None
+        self.router.on_startup.append(self.start_log_flush)
+        self.router.on_shutdown.append(self.stop_log_flush)
+
+    def openapi(self, cached: bool = True) -> Dict[Text, Any]:
+        """
+        OpenAPI schema: loaded from `OPENAPI_SCHEMA_FILE` if precomputed,
+            otherwise generated (with intent invoke examples) when requested for the first time
+
+        :param cached:  if `False`, ignore the precomputed schema file
+        :return:
+        """
+        from skill_sdk.config import settings
+
+        if self.openapi_schema is None:
+            schema_file = settings.OPENAPI_SCHEMA_FILE
+            if cached and schema_file and Path(schema_file).is_file():
+                logger.debug("Loading OpenAPI schema from %s", repr(schema_file))
+                self.openapi_schema = json.loads(Path(schema_file).read_text())
+            else:
+                util.populate_intent_examples(self.intents)
+
+        return super().openapi()
+
+    async def drain(self, timeout: float = None) -> bool:
+        """
+        Graceful shutdown: fail readiness probe, reject new invokes and wait for in-flight invokes to complete
+
+        :param timeout: time in seconds to wait (defaults to `DRAIN_TIMEOUT`)
+        :return:        `False` if invokes are still in flight after timeout
+        """
+        from skill_sdk.config import settings
+
+        self.draining = self.rejecting = True
+        if self.in_flight.count:
+            logger.info("Draining %d in-flight invoke(s).", self.in_flight.count)
+
+        drained = await self.in_flight.wait(
+            settings.DRAIN_TIMEOUT if timeout is None else timeout
+        )
+        if not drained:
+            logger.warning(
+                "Drain timeout: %d invoke(s) still in flight.", self.in_flight.count
+            )
+        return drained
+
+    async def undrain(self) -> None:
+        """Accept invokes (on application startup), start warm-up if enabled"""
+        from skill_sdk.config import settings
+
+        self.draining = self.rejecting = False
+        if settings.WARMUP:
+            self.warming_up = True
+            self._warm_up = asyncio.get_running_loop().create_task(self.warm_up())
+
+    async def start_log_flush(self) -> None:
+        """Start flushing the summaries of rate-limited log records (on application startup)"""
+        from skill_sdk import log
+        from skill_sdk.config import settings
+
+        if settings.LOG_RATE_LIMIT <= 0 or settings.LOG_RATE_LIMIT_INTERVAL <= 0:
+            return
+
+        self._log_flush = asyncio.get_running_loop().create_task(
+            log.flush_rate_limited_periodically()
+        )
+
+    async def stop_log_flush(self) -> None:
+        """Stop periodic flush and log the remaining summaries (on application shutdown)"""
+        from skill_sdk import log
+
+        task, self._log_flush = self._log_flush, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        log.flush_rate_limited()
+
+    async def warm_up(self, timeout: float = None) -> None:
+        """
+        Invoke every intent with synthetic requests, partner services are not called:
+            first invokes are slow (lazy imports, caches, first use of the models), let them be not real ones
+
+        :param timeout: time in seconds (defaults to `WARMUP_TIMEOUT`)
+        :return:
+        """
+        from skill_sdk.config import settings
+        from skill_sdk.utils import warmup
+
+        self.warming_up = True
+        try:
+            await asyncio.wait_for(
+                warmup.warm_up(self),
+                settings.WARMUP_TIMEOUT if timeout is None else timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Warm-up did not complete in time.")
+        finally:
+            self.warming_up = False
 
     def get_handler(self, name: Text):
         """
@@ -86,6 +201,16 @@ class Skill(FastAPI):
 
         return handler
 
+    def handled_intent(self, name: Text) -> Text:
+        """
+        Name of the registered intent handling the request: the intent name itself, or 'FALLBACK_INTENT'
+            (metric labels stay bounded whatever intent name the client sends)
+
+        :param name:    intent name
+        :return:
+        """
+        return name if name in self.intents else FALLBACK_INTENT
+
     def include(
         self,
         intent: Text = None,
@@ -296,6 +421,15 @@ def init_app(
         log.setup_logging()
 
     app_config = {**config.settings.app_config(), **dict(debug=develop)}
+
+    # Lean startup: no schema (and docs) endpoints, unless the schema is precomputed
+    if (
+        config.settings.LEAN_STARTUP
+        and not develop
+        and not config.settings.OPENAPI_SCHEMA_FILE
+    ):
+        app_config.update(openapi_url=None)
+
     logger.debug("App config: %s", app_config)
 
     app = Skill(**app_config)
@@ -303,6 +437,11 @@ def init_app(
     middleware.setup_middleware(app)
     routes.setup_routes(app)
 
+    if config.settings.LOOP_WATCHDOG:
+        from skill_sdk.utils import watchdog
+
+        watchdog.setup(app)
+
     return app.develop() if develop else app
 
 
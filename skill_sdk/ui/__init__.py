@@ -12,6 +12,7 @@
 import time
 import asyncio
 import inspect
+import contextlib
 from json import dumps
 import logging.handlers
 from pathlib import Path
@@ -484,6 +485,9 @@ def setup(app: FastAPI):
         name="Skill Logs",
     )
 
+    # Log handlers and notifier workers started with the app
+    workers: List[Tuple[logging.Handler, asyncio.Future]] = []
+
     @app.on_event("startup")
     async def startup():
         """Initializes websocket listener"""
@@ -509,7 +513,18 @@ def setup(app: FastAPI):
         logger.addHandler(handler)
 
         # Start the notifier's worker
-        asyncio.ensure_future(notifier.worker(queue))
+        workers.append((handler, asyncio.ensure_future(notifier.worker(queue))))
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        """Stops the worker: otherwise the task is left pending when the loop is closed"""
+
+        while workers:
+            handler, worker = workers.pop()
+            logger.removeHandler(handler)
+            worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
 
     # Delete root redirect
     app.router.routes = [
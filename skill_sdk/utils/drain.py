@@ -0,0 +1,63 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""In-flight requests tracking"""
+
+import asyncio
+from typing import Optional
+
+
+class InFlight:
+    """
+    Number of requests in flight:
+
+        >>> in_flight = InFlight()
+        >>> with in_flight:
+        >>>     ...
+        >>> await in_flight.wait(timeout=10)
+
+    """
+
+    __slots__ = ("count", "_idle")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    def __enter__(self) -> "InFlight":
+        self.count += 1
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb) -> None:
+        self.count -= 1
+        if self.count == 0 and self._idle is not None:
+            self._idle.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait for in-flight requests to complete
+
+        :param timeout: time in seconds
+        :return:        `False` if requests are still in flight after timeout
+        """
+        if self.count == 0:
+            return True
+
+        self._idle = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._idle = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.count})"
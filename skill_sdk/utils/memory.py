@@ -0,0 +1,168 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Memory diagnostics: tracemalloc snapshots, live objects and GC statistics"""
+
+import gc
+import logging
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Text
+
+logger = logging.getLogger(__name__)
+
+# Statistics grouping: file name and line number, full traceback, or file name only
+GROUP_BY = ("lineno", "traceback", "filename")
+
+# Allocations made by tracemalloc itself and import machinery are excluded
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_snapshots: "OrderedDict[Text, tracemalloc.Snapshot]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def start(frames: int = 1) -> Dict[Text, Any]:
+    """
+    Start tracing memory allocations
+
+    :param frames:  number of frames stored per allocation (more frames - more overhead)
+    :return:
+    """
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    tracemalloc.start(frames)
+    logger.info("Started tracing memory allocations with %d frame(s).", frames)
+    return status()
+
+
+def stop() -> Dict[Text, Any]:
+    """Stop tracing memory allocations and discard the snapshots"""
+
+    tracemalloc.stop()
+    with _lock:
+        _snapshots.clear()
+    logger.info("Stopped tracing memory allocations.")
+    return status()
+
+
+def status() -> Dict[Text, Any]:
+    """Tracing status, traced memory and snapshot names"""
+
+    current, peak = tracemalloc.get_traced_memory()
+    return dict(
+        tracing=tracemalloc.is_tracing(),
+        frames=tracemalloc.get_traceback_limit(),
+        traced_memory=current,
+        traced_memory_peak=peak,
+        snapshots=list(_snapshots),
+    )
+
+
+def take_snapshot(name: Text, keep: int = 10) -> Dict[Text, Any]:
+    """
+    Take a named snapshot of traced allocations
+
+    :param name:    snapshot name (existing snapshot with the same name is replaced)
+    :param keep:    maximal number of snapshots kept (the oldest snapshot is discarded)
+    :return:
+    :raises:        RuntimeError if memory allocations are not traced
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+    with _lock:
+        _snapshots.pop(name, None)
+        _snapshots[name] = snapshot
+        while len(_snapshots) > keep:
+            _snapshots.popitem(last=False)
+    return dict(
+        name=name,
+        size=sum(trace.size for trace in snapshot.traces),
+        count=len(snapshot.traces),
+    )
+
+
+def _get(name: Text) -> tracemalloc.Snapshot:
+    try:
+        return _snapshots[name]
+    except KeyError:
+        raise KeyError(f"Snapshot {repr(name)} not found") from None
+
+
+def _format(stat: Any, group_by: Text) -> Dict[Text, Any]:
+    """Format `tracemalloc.Statistic`/`StatisticDiff` as dictionary"""
+
+    frames = list(stat.traceback)
+    result = dict(
+        location=str(frames[-1]) if frames else "",
+        size=stat.size,
+        count=stat.count,
+    )
+    if group_by == "traceback":
+        result["traceback"] = [str(frame) for frame in frames]
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        result.update(size_diff=stat.size_diff, count_diff=stat.count_diff)
+    return result
+
+
+def statistics(
+    name: Text,
+    base: Text = None,
+    group_by: Text = "lineno",
+    limit: int = 20,
+) -> List[Dict[Text, Any]]:
+    """
+    Top allocations of a snapshot, or top differences to the base snapshot
+
+    :param name:        snapshot name
+    :param base:        base snapshot name to compare with
+    :param group_by:    "lineno", "traceback" or "filename"
+    :param limit:       number of top entries returned
+    :return:
+    :raises:            KeyError if snapshot not found
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"Unknown grouping {repr(group_by)}, use one of {GROUP_BY}")
+
+    snapshot = _get(name)
+    stats: List[Any]
+    if base is not None:
+        stats = snapshot.compare_to(_get(base), group_by)
+    else:
+        stats = snapshot.statistics(group_by)
+    return [_format(stat, group_by) for stat in stats[:limit]]
+
+
+def object_counts(limit: int = 50) -> Dict[Text, int]:
+    """
+    Number of live objects tracked by the garbage collector by type
+
+    :param limit:   number of most common types returned
+    :return:
+    """
+    counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+    return dict(counts.most_common(limit))
+
+
+def gc_stats() -> Dict[Text, Any]:
+    """Garbage collector statistics per generation"""
+
+    return dict(
+        enabled=gc.isenabled(),
+        counts=gc.get_count(),
+        thresholds=gc.get_threshold(),
+        frozen=gc.get_freeze_count(),
+        garbage=len(gc.garbage),
+        generations=gc.get_stats(),
+    )
@@ -0,0 +1,125 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""In-process sampling profiler"""
+
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Dict, List, Optional, Text
+
+from skill_sdk.utils.watchdog import find_intent
+
+logger = logging.getLogger(__name__)
+
+# Only one profiling session at a time
+_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another profiling session is running"""
+
+
+def _frame_name(frame: FrameType) -> Text:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def collapse(frame: Optional[FrameType]) -> Text:
+    """
+    Format stack as "collapsed" line: frames from outermost to innermost separated by semicolons
+
+    :param frame:   innermost frame
+    :return:
+    """
+    names: List[Text] = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Sampling profiler: takes the stacks of all threads at a given frequency
+
+        no tracing hooks are installed, so the overhead is limited to the sampling thread,
+        which is roughly the cost of walking the stacks `frequency` times per second
+
+    """
+
+    def __init__(self, frequency: int = 100, intent: Optional[Text] = None) -> None:
+        """
+        :param frequency:   samples per second
+        :param intent:      sample only the stacks invoking this intent
+        """
+        self.interval = 1.0 / frequency
+        self.intent = intent
+        self.samples = 0
+        self.stacks: Dict[Text, int] = Counter()
+
+    def sample(self) -> None:
+        """Take a sample of all threads except the current one"""
+
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():  # noqa
+            if thread_id == own:
+                continue
+            if self.intent is not None and find_intent(frame) != self.intent:
+                continue
+            self.stacks[collapse(frame)] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> "SamplingProfiler":
+        """
+        Sample the stacks for a number of seconds: blocks the calling thread
+
+        :param seconds:
+        :return:
+        """
+        if not _lock.acquire(blocking=False):
+            raise ProfilerBusy("Profiling session is already running")
+
+        try:
+            logger.info(
+                "Profiling for %s seconds at %d Hz, intent: %s",
+                seconds,
+                round(1 / self.interval),
+                repr(self.intent),
+            )
+            deadline = time.perf_counter() + seconds
+            next_sample = time.perf_counter()
+            while next_sample < deadline:
+                self.sample()
+                next_sample += self.interval
+                delay = next_sample - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Sampling is slower than requested frequency: skip the missed ticks
+                    next_sample = time.perf_counter()
+        finally:
+            _lock.release()
+
+        return self
+
+    def collapsed(self) -> Text:
+        """
+        Return collapsed stacks, ready for flame graph tools:
+
+            main (app.py:1);run (app.py:10);handler (impl/main.py:5) 42
+
+        """
+        return "\n".join(
+            f"{stack} {count}" for stack, count in sorted(self.stacks.items())
+        )
@@ -0,0 +1,201 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Invoke pipeline phase timings"""
+
+import re
+import time
+import functools
+from enum import Enum
+from contextvars import ContextVar
+from typing import Dict, Optional, Text
+
+
+class Phase(str, Enum):
+    """Phases of the intent invoke pipeline"""
+
+    # Request body decode and validation
+    decode = "decode"
+
+    # Translation lookup
+    translation = "translation"
+
+    # Entity values conversion
+    conversion = "conversion"
+
+    # Sync handler: waiting for a worker thread
+    executor_wait = "executor_wait"
+
+    # Handler execution (without entity conversion)
+    handler = "handler"
+
+    # Response post-processing
+    enrich = "enrich"
+
+    # Response serialization
+    serialize = "serialize"
+
+
+# Characters not allowed in Server-Timing metric name
+NON_TOKEN = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+class Timings:
+    """Accumulated duration of invoke phases and partner calls (in seconds) within a request"""
+
+    __slots__ = ("phases", "partners", "begin")
+
+    def __init__(self) -> None:
+        self.phases: Dict[Phase, float] = {}
+        self.partners: Dict[Text, float] = {}
+        self.begin = time.perf_counter()
+
+    def add(self, phase: Phase, seconds: float) -> None:
+        """
+        Add phase duration
+
+        :param phase:
+        :param seconds:
+        :return:
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_partner(self, name: Text, seconds: float) -> None:
+        """
+        Add partner call duration
+
+        :param name:    partner service name
+        :param seconds:
+        :return:
+        """
+        self.partners[name] = self.partners.get(name, 0.0) + seconds
+
+    def server_timing(self) -> Text:
+        """
+        Format as "Server-Timing" header value (durations in milliseconds):
+
+            decode;dur=0.41, conversion;dur=0.05, partner.weather;dur=42.1, ..., total;dur=45.3
+
+        """
+        metrics = [(phase.value, seconds) for phase, seconds in self.phases.items()]
+        metrics += [
+            (f"partner.{NON_TOKEN.sub('_', name)}", seconds)
+            for name, seconds in self.partners.items()
+        ]
+        metrics += [("total", time.perf_counter() - self.begin)]
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in metrics
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.phases)!r}, {self.partners!r})"
+
+
+_timings: ContextVar[Optional[Timings]] = ContextVar("timings", default=None)
+
+
+def start() -> Timings:
+    """Start collecting phase timings for the current request"""
+    timings = Timings()
+    _timings.set(timings)
+    return timings
+
+
+def current() -> Optional[Timings]:
+    """Return phase timings of the current request (`None` if not collecting)"""
+    return _timings.get()
+
+
+def add(phase: Phase, seconds: float) -> None:
+    """
+    Add phase duration to the current request timings
+
+    :param phase:
+    :param seconds:
+    :return:
+    """
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def add_partner(name: Text, seconds: float) -> None:
+    """
+    Add partner call duration to the current request timings
+
+    :param name:
+    :param seconds:
+    :return:
+    """
+    timings = _timings.get()
+    if timings is not None:
+        timings.add_partner(name, seconds)
+
+
+class measure:  # noqa
+    """
+    Measure phase duration: a no-op if timings are not collected
+
+        >>> with measure(Phase.enrich):
+        >>>     ...
+
+    """
+
+    __slots__ = ("phase", "exclude", "timings", "begin", "excluded")
+
+    def __init__(self, phase: Phase, exclude: Phase = None):
+        """
+        :param phase:
+        :param exclude: nested phase, which duration is not counted
+        """
+        self.phase = phase
+        self.exclude = exclude
+
+    def __enter__(self):
+        self.timings = _timings.get()
+        if self.timings is not None:
+            self.excluded = self.timings.phases.get(self.exclude, 0.0)
+            self.begin = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        if self.timings is not None:
+            seconds = time.perf_counter() - self.begin
+            if self.exclude is not None:
+                seconds -= self.timings.phases.get(self.exclude, 0.0) - self.excluded
+            self.timings.add(self.phase, seconds)
+
+
+@functools.lru_cache(maxsize=None)
+def _phase_histogram():
+    """Prometheus histogram of invoke phases latency (if Prometheus exporter is installed)"""
+    try:
+        from skill_sdk.middleware.prometheus import Prometheus
+
+        return Prometheus.invoke_phase_latency()
+    except ModuleNotFoundError:
+        return None
+
+
+def observe(intent: Text, timings: Optional[Timings]) -> None:
+    """
+    Export phase timings of intent invoke to Prometheus
+
+    :param intent:
+    :param timings:
+    :return:
+    """
+    histogram = _phase_histogram()
+    if histogram is None or timings is None:
+        return
+
+    from skill_sdk.config import settings
+
+    for phase, seconds in timings.phases.items():
+        histogram.labels(settings.SKILL_NAME, intent, phase.value).observe(seconds)
@@ -323,6 +323,38 @@ def intent_examples(intents: Mapping[Text, Callable]) -> Dict[str, Dict]:
     return examples
 
 
+def invoke_examples(
+    intents: Mapping[Text, Callable], locale: Text = DEFAULT_LOCALE
+) -> Dict[Text, Dict]:
+    """
+    Create example invoke request bodies (with both "attributes" and "attributesV2")
+
+    :param intents: List of intents
+    :param locale:  Request locale
+    :return:        {intent name: request body}
+    """
+    from skill_sdk.__version__ import __spi_version__
+
+    bodies = {}
+    for example in intent_examples(intents).values():
+        value = example["value"]
+        attributes = {
+            name: [str(attr["value"]) for attr in attrs]
+            for name, attrs in value["context"]["attributesV2"].items()
+        }
+        bodies[example["summary"]] = {
+            **value,
+            "context": {
+                **value["context"],
+                "attributes": attributes,
+                "locale": locale,
+            },
+            "spiVersion": __spi_version__,
+        }
+
+    return bodies
+
+
 def populate_intent_examples(intents: Mapping[Text, Callable]):
     """
     Create intent invoke examples for Swagger UI
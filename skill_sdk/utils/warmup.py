@@ -0,0 +1,76 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Warm-up: invoke every intent with synthetic requests before the skill reports ready"""
+
+import time
+import logging
+from typing import Any, Dict, Text, Tuple
+
+from starlette.responses import JSONResponse
+
+from skill_sdk import i18n, requests
+from skill_sdk.utils.util import DEFAULT_LOCALE, invoke_examples
+
+logger = logging.getLogger(__name__)
+
+
+async def invoke(app, body: Dict[Text, Any]) -> None:
+    """
+    Run a synthetic request through the invoke pipeline: decode, translation, handler and serialization
+
+    :param app:     skill
+    :param body:    invoke request body
+    :return:
+    """
+    from skill_sdk.intents import Request, invoke as invoke_handler
+
+    request = Request.parse_obj(body)
+    handler = app.get_handler(request.context.intent)
+    request = request.with_translation(
+        app.translations.get(request.context.locale) or i18n.Translations()
+    )
+    response = await invoke_handler(handler, request)
+    JSONResponse(response.dict())
+
+
+async def warm_up(app) -> Tuple[int, int]:
+    """
+    Invoke every intent with example attributes (the ones shown in Swagger UI) in every loaded locale:
+        partner services are not called, `skill_sdk.requests` clients return empty responses
+
+    :param app:     skill
+    :return:        number of invokes, and number of failed invokes
+    """
+    begin = time.perf_counter()
+    locales = list(app.translations) or [DEFAULT_LOCALE]
+    invokes = failed = 0
+
+    token = requests.dry_run.set(True)
+    try:
+        for locale in locales:
+            for intent, body in invoke_examples(app.intents, locale).items():
+                invokes += 1
+                try:
+                    await invoke(app, body)
+                except Exception as ex:  # NOSONAR
+                    # Synthetic values are not necessarily valid: failed invoke has warmed up the code anyway
+                    failed += 1
+                    logger.debug("Warm-up invoke of %s failed: %s", repr(intent), ex)
+    finally:
+        requests.dry_run.reset(token)
+
+    logger.info(
+        "Warm-up: %d invokes (%d failed) in %.3f seconds.",
+        invokes,
+        failed,
+        time.perf_counter() - begin,
+    )
+    return invokes, failed
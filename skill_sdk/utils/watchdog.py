@@ -0,0 +1,186 @@
+#
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""Event loop lag and blocking calls watchdog"""
+
+import sys
+import time
+import asyncio
+import logging
+import functools
+import threading
+import traceback
+from types import FrameType
+from typing import Optional, Text
+
+from fastapi import FastAPI
+
+from skill_sdk import config
+
+logger = logging.getLogger(__name__)
+
+# Intent name reported if blocking call happened outside of intent handler
+UNKNOWN_INTENT = "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def _metrics():
+    """Prometheus lag histogram and blocked loop counter (if Prometheus exporter is installed)"""
+    try:
+        from skill_sdk.middleware.prometheus import Prometheus
+
+        return Prometheus.event_loop_lag(), Prometheus.event_loop_blocked()
+    except ModuleNotFoundError:
+        return None, None
+
+
+def find_intent(frame: Optional[FrameType]) -> Text:
+    """
+    Find the intent being invoked: walk up the stack looking for the skill invoke request
+
+    :param frame:   innermost frame
+    :return:
+    """
+    from skill_sdk.intents import Request
+
+    while frame is not None:
+        request = frame.f_locals.get("request")
+        if isinstance(request, Request):
+            return request.context.intent
+        frame = frame.f_back
+    return UNKNOWN_INTENT
+
+
+class Watchdog:
+    """
+    Event loop watchdog:
+
+        - a heartbeat task measures the event loop scheduling lag,
+        - a monitor thread checks the heartbeats, and if the loop is blocked longer than a threshold,
+          logs the stack of the offending call with intent name.
+
+    """
+
+    def __init__(
+        self, interval: float = None, threshold: float = None, app: FastAPI = None
+    ) -> None:
+        """
+        :param interval:    heartbeat interval in seconds (defaults to `LOOP_WATCHDOG_INTERVAL`)
+        :param threshold:   time in seconds the loop may be blocked (defaults to `LOOP_WATCHDOG_THRESHOLD`)
+        :param app:         the skill: metric is labeled with the intent handling the request
+        """
+        self.interval = interval or config.settings.LOOP_WATCHDOG_INTERVAL
+        self.threshold = threshold or config.settings.LOOP_WATCHDOG_THRESHOLD
+        self.app = app
+
+        self._beat = time.monotonic()
+        self._stop = threading.Event()
+        self._loop_thread = threading.get_ident()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def start(self) -> None:
+        """Start heartbeat task and monitor thread: called on application startup"""
+
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._monitor, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+        logger.debug("Event loop watchdog started.")
+
+    async def stop(self) -> None:
+        """Stop heartbeat task and monitor thread: called on application shutdown"""
+
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+            self._thread = None
+        logger.debug("Event loop watchdog stopped.")
+
+    async def _heartbeat(self) -> None:
+        """Measure how late the loop wakes up the sleeping task"""
+
+        lag_histogram, _ = _metrics()
+        while True:
+            begin = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = now = time.monotonic()
+            if lag_histogram is not None:
+                lag = max(now - begin - self.interval, 0.0)
+                lag_histogram.labels(config.settings.SKILL_NAME).observe(lag)
+
+    def _monitor(self) -> None:
+        """Check the heartbeats, report the blocking call once per stall"""
+
+        reported = None
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked > self.threshold and beat != reported:
+                reported = beat
+                frame = sys._current_frames().get(self._loop_thread)  # noqa
+                self.report(frame, blocked)
+
+    def report(self, frame: Optional[FrameType], blocked: float) -> None:
+        """
+        Log the stack of the blocking call
+
+        :param frame:   current frame of the event loop thread
+        :param blocked: time in seconds the loop is blocked for
+        :return:
+        """
+        intent = find_intent(frame)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        logger.warning(
+            "Event loop blocked for %.3f seconds, intent %s:\n%s",
+            blocked,
+            repr(intent),
+            stack,
+        )
+
+        _, blocked_counter = _metrics()
+        if blocked_counter is not None:
+            blocked_counter.labels(
+                config.settings.SKILL_NAME, self.handled_intent(intent)
+            ).inc()
+
+    def handled_intent(self, intent: Text) -> Text:
+        """
+        Intent name for metric label: the registered intent handling the request (or 'FALLBACK_INTENT')
+
+        :param intent:  intent name sent by the client
+        :return:
+        """
+        handled_intent = getattr(self.app, "handled_intent", None)
+        if intent == UNKNOWN_INTENT or handled_intent is None:
+            return intent
+        return handled_intent(intent)
+
+
+def setup(app: FastAPI) -> Watchdog:
+    """
+    Start the watchdog with the application and stop on shutdown
+
+    :param app:
+    :return:
+    """
+    watchdog = Watchdog(app=app)
+    app.add_event_handler("startup", watchdog.start)
+    app.add_event_handler("shutdown", watchdog.stop)
+    return watchdog
@@ -0,0 +1,200 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+"""
+Hot path benchmarks:
+
+    python -m pytest tests/benchmarks --bench
+
+Every benchmark measures the time per call (the best of several runs),
+and fails if it is slower than the baseline by more than a threshold.
+
+The baseline is scaled by the speed of a reference workload measured in the same session and stored with the baseline:
+uniform slowdowns (different hardware, CPU frequency, noisy neighbours) are not reported as regressions.
+
+Baseline file format:
+
+    {
+        "threshold": 0.5,                       # default allowed slowdown (50%)
+        "thresholds": {"test_name": 0.5},       # per benchmark thresholds
+        "reference": 1e-05,                     # reference workload, seconds per call
+        "results": {"test_name": 1.5e-06}       # seconds per call
+    }
+
+Baselines depend on the hardware: update them on the machine running the benchmarks with "--bench-update".
+"""
+
+import gc
+import json
+import time
+import timeit
+import asyncio
+import inspect
+import pathlib
+from typing import Callable, Dict, Optional
+
+import pytest
+
+# Default allowed slowdown, if not set in the baseline file
+DEFAULT_THRESHOLD = 0.5
+
+# Minimal duration of a single run in seconds: the number of calls is increased until reached
+MIN_RUN_TIME = 0.05
+
+# Number of runs: the best one is taken
+REPEAT = 5
+
+# A regression must reproduce: the benchmark is measured again before it fails
+RETRIES = 2
+
+RESULTS: Dict[str, float] = {}
+
+_reference: Optional[float] = None
+
+
+def _run_sync(func: Callable) -> Callable[[int], float]:
+    timer = timeit.Timer(func)
+    return timer.timeit
+
+
+def _run_async(func: Callable) -> Callable[[int], float]:
+    loop = asyncio.new_event_loop()
+
+    async def batch(number: int) -> float:
+        begin = time.perf_counter()
+        for _ in range(number):
+            await func()
+        return time.perf_counter() - begin
+
+    def run(number: int) -> float:
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return loop.run_until_complete(batch(number))
+        finally:
+            if enabled:
+                gc.enable()
+
+    return run
+
+
+def seconds_per_call(func: Callable) -> float:
+    """Best time per call: the number of calls per run is calibrated to `MIN_RUN_TIME`"""
+
+    run = _run_async(func) if inspect.iscoroutinefunction(func) else _run_sync(func)
+
+    number = 1
+    while True:
+        elapsed = run(number)
+        if elapsed >= MIN_RUN_TIME:
+            break
+        number *= 10 if elapsed < MIN_RUN_TIME / 10 else 2
+
+    return min([elapsed] + [run(number) for _ in range(REPEAT - 1)]) / number
+
+
+def _workload() -> None:
+    """Reference workload: plain Python calls, loops and dictionaries"""
+
+    values = {str(i): i for i in range(50)}
+    sum(int(key) + value for key, value in values.items())
+
+
+def reference(refresh: bool = False) -> float:
+    """Reference workload time per call, measured once per session (or refreshed)"""
+
+    global _reference
+    if _reference is None or refresh:
+        _reference = seconds_per_call(_workload)
+    return _reference
+
+
+def _baseline(config) -> Dict:
+    path = pathlib.Path(config.getoption("bench_baseline"))
+    return json.loads(path.read_text()) if path.is_file() else {}
+
+
+@pytest.fixture
+def measure(request):
+    """
+    Measure a function (or a coroutine function) and compare with the baseline:
+
+        def test_something(measure):
+            measure(lambda: something())
+
+    """
+    config = request.config
+    if not config.getoption("bench"):
+        pytest.skip("Benchmarks are run with --bench option")
+
+    def _measure(func: Callable) -> float:
+        name = request.node.name
+        result = seconds_per_call(func)
+
+        baseline = _baseline(config)
+
+        def expected(refresh: bool = False) -> Optional[float]:
+            value = baseline.get("results", {}).get(name)
+            if value is not None and baseline.get("reference"):
+                value *= reference(refresh) / baseline["reference"]
+            return value
+
+        threshold = config.getoption("bench_threshold")
+        if threshold is None:
+            threshold = baseline.get("thresholds", {}).get(
+                name, baseline.get("threshold", DEFAULT_THRESHOLD)
+            )
+
+        def regression(limit: Optional[float]) -> bool:
+            return (
+                limit is not None
+                and not config.getoption("bench_update")
+                and result > limit * (1 + threshold)
+            )
+
+        limit = expected()
+        for _ in range(RETRIES):
+            if not regression(limit):
+                break
+            # Slowdown of the whole machine shows in the reference workload as well
+            limit = expected(refresh=True)
+            result = min(result, seconds_per_call(func))
+
+        RESULTS[name] = result
+        if limit is not None and regression(limit):
+            pytest.fail(
+                f"{name}: {result * 1e6:.3f}us per call is slower than "
+                f"baseline {limit * 1e6:.3f}us (scaled) by more than {threshold:.0%}"
+            )
+        return result
+
+    return _measure
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not RESULTS:
+        return
+
+    results = {name: float(f"{value:.4g}") for name, value in sorted(RESULTS.items())}
+
+    save = config.getoption("bench_save")
+    if save:
+        report = dict(reference=float(f"{reference():.4g}"), results=results)
+        pathlib.Path(save).write_text(json.dumps(report, indent=2))
+
+    if config.getoption("bench_update"):
+        baseline = _baseline(config)
+        baseline.setdefault("threshold", DEFAULT_THRESHOLD)
+        baseline.setdefault("thresholds", {})
+        baseline["reference"] = float(f"{reference():.4g}")
+        baseline["results"] = {**baseline.get("results", {}), **results}
+        pathlib.Path(config.getoption("bench_baseline")).write_text(
+            json.dumps(baseline, indent=2) + "\n"
+        )
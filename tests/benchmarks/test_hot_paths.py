@@ -0,0 +1,148 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+import datetime
+import logging
+from typing import List
+
+from starlette.responses import JSONResponse
+
+from skill_sdk import tell
+from skill_sdk.i18n import Message, MultiStringTranslation, Translations
+from skill_sdk.intents import entities, handlers, invoke
+from skill_sdk.intents.request import RequestContextVar
+from skill_sdk.log import CloudGELFFormatter
+from skill_sdk.utils.util import create_request
+
+CATALOG = {
+    "de": {
+        "HELLO": ["Hallo", "Hi", "Guten Tag"],
+        "HELLO_NAME": ["Hallo, {name}!"],
+        "BYE": ["Tschüss"],
+    }
+}
+
+
+async def handler(timezone: str, number: int, date: datetime.date):
+    return tell("Hola")
+
+
+REQUEST = create_request(
+    "TEST_INTENT", timezone="Europe/Berlin", number="42", date="2021-12-31"
+).with_translation(Translations())
+
+DECORATED = handlers.intent_handler(handler)
+
+
+#
+# Intent handler: parameter conversion, invoke and response enrichment
+#
+
+
+def test_intent_handler_call(measure):
+    async def call():
+        await DECORATED(REQUEST)
+
+    measure(call)
+
+
+def test_invoke(measure):
+    async def call():
+        await invoke(DECORATED, REQUEST)
+
+    measure(call)
+
+
+def test_request_context_var(measure):
+    def enter_exit():
+        with RequestContextVar(request=REQUEST):
+            pass
+
+    measure(enter_exit)
+
+
+#
+# Entity converters
+#
+
+
+def test_convert_datetime(measure):
+    convert = entities.converter(datetime.datetime)
+    measure(lambda: convert("2021-12-31T12:00:00"))
+
+
+def test_convert_timedelta(measure):
+    convert = entities.converter(datetime.timedelta)
+    measure(lambda: convert("PT1H30M"))
+
+
+def test_convert_bool(measure):
+    convert = entities.converter(bool)
+    measure(lambda: convert("on"))
+
+
+def test_convert_int_list(measure):
+    convert = entities.batch_converter(int)
+    values: List[str] = [str(i) for i in range(32)]
+    measure(lambda: convert(values))
+
+
+#
+# Translations and messages
+#
+
+
+def test_gettext(measure):
+    translation = Translations()
+    measure(lambda: translation.gettext("HELLO"))
+
+
+def test_multistring_gettext(measure):
+    translation = MultiStringTranslation.from_dict("de", CATALOG)
+    measure(lambda: translation.gettext("HELLO"))
+
+
+def test_multistring_getalltexts(measure):
+    translation = MultiStringTranslation.from_dict("de", CATALOG)
+    measure(lambda: translation.getalltexts("HELLO"))
+
+
+def test_message_format(measure):
+    message = Message("Hallo, {name}!", "HELLO_NAME")
+    measure(lambda: message.format(name="Welt"))
+
+
+def test_message_concatenation(measure):
+    hello, bye = Message("Hallo", "HELLO"), Message("Tschüss", "BYE")
+    measure(lambda: hello + " " + bye)
+
+
+#
+# Response serialization
+#
+
+
+def test_response_serialization(measure):
+    response = tell("Hallo").with_card(
+        title_text="Title", text="Text", sub_text="Sub text"
+    )
+    measure(lambda: JSONResponse(response.dict()))
+
+
+#
+# Logging
+#
+
+
+def test_gelf_format(measure):
+    formatter = CloudGELFFormatter()
+    record = logging.makeLogRecord(
+        dict(name="skill", levelname="INFO", msg="Intent %s called", args=("TEST",))
+    )
+    measure(lambda: formatter.format(record))
@@ -0,0 +1,130 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+import sys
+import json
+import pkg_resources
+from argparse import Namespace
+
+import httpx
+import pytest
+
+from skill_sdk.cli import bench, init
+
+APP = "app:app"
+
+
+@pytest.fixture
+def scaffold(monkeypatch):
+    path = pkg_resources.resource_filename(init.__name__, "scaffold")
+    monkeypatch.chdir(path)
+    monkeypatch.syspath_prepend(path)
+    yield path
+    sys.modules.pop("app", None)
+    sys.modules.pop("impl", None)
+
+
+def test_percentile():
+    values = [float(_) for _ in range(1, 101)]
+    assert bench.percentile(values, 50) == 50
+    assert bench.percentile(values, 99) == 99
+    assert bench.percentile(values, 100) == 100
+    assert bench.percentile([1.0], 95) == 1
+    assert bench.percentile([], 95) == 0
+
+
+def test_stats():
+    stats = bench.Stats()
+    stats.add(0.01, True)
+    stats.add(0.03, False)
+    summary = stats.summary(2)
+    assert summary["requests"] == 2
+    assert summary["errors"] == 1
+    assert summary["error_rate"] == 0.5
+    assert summary["rps"] == 1
+    assert summary["latency"]["mean"] == 20
+    assert summary["latency"]["max"] == 30
+
+    assert bench.Stats().summary(0)["latency"]["p99"] == 0
+
+
+def test_stats_reservoir():
+    stats = bench.Stats(reservoir=10)
+    for i in range(1, 1001):
+        stats.add(i / 1000, i % 100 != 0)
+    assert len(stats.latencies) == 10
+    summary = stats.summary(1)
+    assert summary["requests"] == 1000
+    assert summary["errors"] == 10
+    assert summary["latency"]["mean"] == 500.5
+    assert summary["latency"]["max"] == 1000
+
+    total = bench.Stats()
+    total.merge(stats)
+    total.merge(bench.Stats())
+    assert total.summary(1) == summary
+
+
+def test_parse_mix():
+    intents = ["A", "B"]
+    assert bench.parse_mix(None, intents) == {"A": 1, "B": 1}
+    assert bench.parse_mix(["A=3", "B"], intents) == {"A": 3, "B": 1}
+    with pytest.raises(ValueError):
+        bench.parse_mix(["C"], intents)
+
+
+@pytest.mark.asyncio
+async def test_bench_errors():
+    def handler(request: httpx.Request):
+        if b"fail" in request.content:
+            return httpx.Response(500)
+        if b"timeout" in request.content:
+            raise httpx.ReadTimeout("timeout", request=request)
+        return httpx.Response(200, json={})
+
+    bodies = {"OK": {"intent": "ok"}, "FAIL": {"intent": "fail"}, "T": {"t": "timeout"}}
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://test"
+    )
+    runner = bench.Bench(
+        client,
+        "/invoke",
+        bodies,
+        {"OK": 2, "FAIL": 1, "T": 1},
+        concurrency=2,
+        requests=40,
+        seed=1,
+    )
+    report = await runner.run()
+    assert report["requests"] == 40
+    assert report["errors"] == report["status"]["500"] + report["status"]["ReadTimeout"]
+    assert report["intents"]["OK"]["errors"] == 0
+    assert report["intents"]["FAIL"]["error_rate"] == 1
+    assert report["target"] == "http://test"
+
+
+def test_execute(scaffold, capsys, tmp_path):
+    output = tmp_path / "report.json"
+    report = bench.execute(
+        Namespace(module=APP, requests=10, concurrency=2, output=str(output), seed=1)
+    )
+    assert report["requests"] == 10
+    assert report["errors"] == 0
+    assert report["status"] == {"200": 10}
+    assert list(report["intents"]) == ["SMALLTALK__GREETINGS"]
+    assert json.loads(output.read_text()) == report
+
+    out = capsys.readouterr().out
+    assert "SMALLTALK__GREETINGS" in out and "TOTAL" in out
+
+    # Closed app has no intents: import it again
+    sys.modules.pop("app")
+    sys.modules.pop("impl")
+    bench.execute(Namespace(module=APP, requests=1, format="json", dry_run=True))
+    assert json.loads(capsys.readouterr().out)["requests"] == 1
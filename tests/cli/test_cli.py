@@ -8,6 +8,7 @@
 #
 
 import sys
+import json
 import pathlib
 import pkg_resources
 from argparse import Namespace
@@ -17,7 +18,15 @@ import pytest
 from pytest import CaptureFixture
 
 from skill_sdk.__main__ import main
-from skill_sdk.cli import import_module_app, develop, init, run, version, DEFAULT_MODULE
+from skill_sdk.cli import (
+    import_module_app,
+    develop,
+    init,
+    openapi,
+    run,
+    version,
+    DEFAULT_MODULE,
+)
 from skill_sdk.utils.util import run_until_complete
 
 APP = "app:app"
@@ -97,10 +106,40 @@ def test_develop_empty_project(tmpdir, mocker, monkeypatch):
 def test_run(debug_logging, mocker, app):
 
     uv = mocker.patch.object(run, "uvicorn")
+    server = mocker.patch.object(run, "Server")
     assert list(app.intents.keys()) == ["SMALLTALK__GREETINGS"]
 
     run.execute(Namespace(module=APP))
-    uv.run.assert_called_once_with(app, port=4242)
+    uv.Config.assert_called_once_with(app, port=4242)
+    server.assert_called_once_with(uv.Config.return_value)
+    server.return_value.run.assert_called_once()
+
+
+def test_run_workers(debug_logging, mocker, app):
+
+    uv = mocker.patch.object(run, "uvicorn")
+    master = mocker.patch("skill_sdk.cli.prefork.Master")
+
+    run.execute(Namespace(module=APP, workers=2, loop="asyncio", http="h11"))
+    uv.run.assert_not_called()
+    uv.Config.assert_called_once_with(app, port=4242, loop="asyncio", http="h11")
+    master.assert_called_once_with(
+        uv.Config.return_value,
+        2,
+        on_fork=mock.ANY,
+        on_exit=mock.ANY,
+        on_reload=mock.ANY,
+        timeout=35,
+    )
+    master.return_value.run.assert_called_once()
+
+
+def test_run_implementations_fallback(mocker):
+    mocker.patch("importlib.util.find_spec", return_value=None)
+    assert run._implementations("auto", "auto") == {}
+    assert run._implementations("uvloop", "httptools") == dict(
+        loop="asyncio", http="h11"
+    )
 
 
 def test_version(capsys: CaptureFixture, app):
@@ -162,7 +201,18 @@ def test_scaffold(app):
 
 def test_main(app, change_dir, mocker, monkeypatch):
     uv = mocker.patch.object(run, "uvicorn")
+    server = mocker.patch.object(run, "Server")
     monkeypatch.setattr("sys.argv", ["vs", "run", APP])
     monkeypatch.setenv("LOG_FORMAT", "gelf")
     main()
-    uv.run.assert_called_once_with(mock.ANY, port=4242)
+    uv.Config.assert_called_once_with(mock.ANY, port=4242)
+    server.return_value.run.assert_called_once()
+
+
+def test_openapi(app, tmp_path):
+    output = tmp_path / "openapi.json"
+    openapi.execute(Namespace(module=APP, output=str(output)))
+
+    schema = json.loads(output.read_text())
+    assert schema["info"]["title"] == app.title
+    assert "SMALLTALK__GREETINGSExample" in json.dumps(schema)
@@ -0,0 +1,146 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import os
+import sys
+import time
+import socket
+import signal
+import subprocess
+from unittest import mock
+
+import httpx
+import pytest
+
+from skill_sdk.cli import prefork
+from skill_sdk.cli.prefork import Master
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+
+SERVER = """
+import os, sys, uvicorn
+from skill_sdk import init_app
+from skill_sdk.cli.prefork import Master
+
+app = init_app(develop=False)
+app.include("Test_Intent", handler=lambda: "Hola")
+app.add_api_route("/pid", os.getpid)
+Master(uvicorn.Config(app, port=int(sys.argv[1])), 2, timeout=5).run()
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_master_serves_reloads_and_stops():
+    port = free_port()
+    master = subprocess.Popen(
+        [sys.executable, "-c", SERVER, str(port)],
+        env={**os.environ, "DRAIN_GRACE_PERIOD": "0"},
+    )
+    try:
+        for _ in range(100):
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/k8s/liveness")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        assert response.status_code == 200
+
+        # New connection per request: a retiring worker closes its idle keep-alive connections
+        with httpx.Client(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_keepalive_connections=0),
+        ) as client:
+            old = {client.get("/pid").json() for _ in range(10)}
+
+            # Readiness stays green during rolling reload
+            master.send_signal(signal.SIGHUP)
+            pids = set()
+            deadline = time.monotonic() + 10
+            while not (pids and pids.isdisjoint(old)) and time.monotonic() < deadline:
+                assert client.get("/k8s/readiness").status_code == 200
+                pids = {client.get("/pid").json() for _ in range(10)}
+            assert pids.isdisjoint(old)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(10) == 0
+
+
+def test_reap_restarts_worker(monkeypatch):
+    monkeypatch.setattr(prefork, "MIN_WORKER_LIFETIME", 0)
+    master = Master(mock.Mock(), 1)
+    with mock.patch.object(master, "worker", lambda fd: os._exit(3)):
+        pid = master.spawn()
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        master.reap()
+        assert pid not in master.workers and len(master.workers) == 1
+
+        master.should_exit = True
+        (new_pid,) = master.workers
+        os.waitid(os.P_PID, new_pid, os.WEXITED | os.WNOWAIT)
+        master.reap()
+        assert master.workers == {}
+
+
+def test_stop_kills_hanging_worker():
+    master = Master(mock.Mock(), 1, timeout=0.2)
+    with mock.patch.object(
+        master,
+        "worker",
+        lambda fd: (
+            signal.signal(signal.SIGTERM, signal.SIG_IGN),
+            time.sleep(10),
+            os._exit(0),
+        ),
+    ):
+        pid = master.spawn()
+    time.sleep(0.1)
+    master.stop()
+    assert master.workers == {}
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGKILL
+
+
+def ready_worker(fd):
+    os.write(fd, b"1")
+    time.sleep(10)
+    os._exit(0)
+
+
+def test_reload_replaces_workers(monkeypatch):
+    master = Master(mock.Mock(), 2, timeout=5)
+    with mock.patch.object(master, "worker", ready_worker):
+        old = {master.spawn() for _ in range(2)}
+        master.reload()
+
+    assert master.reloaded
+    deadline = time.monotonic() + 5
+    while master.retiring and time.monotonic() < deadline:
+        master.reap()
+        time.sleep(0.01)
+    assert master.retiring == set()
+    assert len(master.workers) == 2 and old.isdisjoint(master.workers)
+    master.stop()
+
+
+def test_reload_aborted_if_worker_fails(monkeypatch):
+    master = Master(mock.Mock(), 1, timeout=5)
+    with mock.patch.object(master, "worker", ready_worker):
+        (old,) = {master.spawn()}
+    with mock.patch.object(master, "worker", lambda fd: os._exit(1)):
+        master.reload()
+
+    # Old worker is kept running
+    assert old in master.workers and master.retiring == set()
+    master.stop()
@@ -0,0 +1,96 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+import sys
+import json
+import pkg_resources
+from argparse import Namespace
+
+import pytest
+
+from skill_sdk import i18n, routes
+from skill_sdk.cli import init, profile_startup
+
+APP = "app:app"
+
+IMPORT_TIME = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   fastapi.openapi
+import time:       200 |        300 | fastapi
+import time:        50 |         50 |     fastapi.openapi.models
+import time:      1000 |       1000 | pydantic
+some other output
+"""
+
+
+@pytest.fixture
+def scaffold(monkeypatch):
+    path = pkg_resources.resource_filename(init.__name__, "scaffold")
+    monkeypatch.chdir(path)
+    monkeypatch.syspath_prepend(path)
+    yield path
+    sys.modules.pop("app", None)
+    sys.modules.pop("impl", None)
+
+
+def test_import_tree():
+    tree = profile_startup.import_tree(IMPORT_TIME.splitlines())
+    assert list(tree) == ["pydantic", "fastapi"]
+    assert tree["fastapi"]["seconds"] == 0.00035
+    assert tree["fastapi"]["modules"] == 3
+    assert tree["fastapi"]["packages"]["openapi"] == dict(
+        seconds=0.00015, modules=2, packages={}
+    )
+
+    tree = profile_startup.import_tree(IMPORT_TIME.splitlines(), depth=1)
+    assert tree["fastapi"]["packages"] == {}
+
+
+def test_measure(scaffold):
+    load_translations, setup_routes = i18n.load_translations, routes.setup_routes
+
+    phases = profile_startup.measure(APP)
+    assert {
+        "config",
+        "translations",
+        "handlers",
+        "middleware",
+        "routes",
+        "examples",
+        "app",
+        "openapi",
+    } == set(phases)
+    assert phases["app"] >= phases["routes"]
+
+    # Original functions are restored
+    assert i18n.load_translations is load_translations
+    assert routes.setup_routes is setup_routes
+
+
+def test_execute(scaffold, capsys):
+    profile_startup.execute(Namespace(module=APP, depth=1))
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["module"] == APP
+    assert report["total"] > report["imports"] > 0
+    assert "fastapi" in report["packages"]
+    assert report["packages"]["skill_sdk"]["packages"] == {}
+    assert report["phases"]["routes"] > 0
+
+    profile_startup.execute(Namespace(module=APP, format="text"))
+    out = capsys.readouterr().out
+    assert out.startswith(f"Startup of {APP}")
+    assert "Phases:" in out and "Imports:" in out
+
+    with pytest.raises(SystemExit):
+        profile_startup.execute(Namespace(module=APP, max_seconds=0.0))
+
+
+def test_execute_failed(scaffold):
+    with pytest.raises(RuntimeError, match="nonexistent"):
+        profile_startup.execute(Namespace(module="nonexistent:app"))
@@ -0,0 +1,149 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+import sys
+import json
+import time
+import pkg_resources
+from argparse import Namespace
+
+import httpx
+import pytest
+
+from skill_sdk.cli import init, replay
+from skill_sdk.utils.util import invoke_examples
+
+APP = "app:app"
+
+
+@pytest.fixture
+def scaffold(monkeypatch):
+    path = pkg_resources.resource_filename(init.__name__, "scaffold")
+    monkeypatch.chdir(path)
+    monkeypatch.syspath_prepend(path)
+    yield path
+    sys.modules.pop("app", None)
+    sys.modules.pop("impl", None)
+
+
+def record(intent, timestamp=0.0, status=200, response=None, **request):
+    return dict(
+        timestamp=timestamp,
+        intent=intent,
+        latency=0.01,
+        status=status,
+        request=dict(context=dict(intent=intent), **request),
+        response=response,
+    )
+
+
+def test_load(tmp_path):
+    capture = tmp_path / "capture.jsonl"
+    capture.write_text(
+        "\n".join(
+            [
+                json.dumps(record("B", 2)),
+                "not a json",
+                json.dumps({"no": "request"}),
+                json.dumps(record("A", 1)),
+            ]
+        )
+    )
+    assert [_["intent"] for _ in replay.load([str(capture)])] == ["A", "B"]
+
+
+def test_shape():
+    assert replay.shape({"text": "Hola", "n": 1, "f": False, "x": None}) == {
+        "f": "boolean",
+        "n": "number",
+        "text": "string",
+        "x": "null",
+    }
+    assert replay.shape([{"a": 1}, {"a": 2}]) == replay.shape([{"a": 3}])
+    assert replay.shape({"text": "Hola"}) != replay.shape({"text": "Hola", "a": 1})
+
+
+def test_parse_speed():
+    assert replay.parse_speed("max") is None
+    assert replay.parse_speed("1") == 1
+    assert replay.parse_speed("10x") == 10
+    with pytest.raises(ValueError):
+        replay.parse_speed("0")
+
+
+@pytest.mark.asyncio
+async def test_replay_mismatches():
+    def handler(request: httpx.Request):
+        intent = json.loads(request.content)["context"]["intent"]
+        if intent == "ERROR":
+            raise httpx.ConnectError("refused", request=request)
+        if intent == "STATUS":
+            return httpx.Response(500)
+        if intent == "SHAPE":
+            return httpx.Response(200, json={"text": 1})
+        return httpx.Response(200, json={"text": "Hallo"})
+
+    records = [
+        record("OK", 0.0, response={"text": "Hola"}),
+        record("STATUS", 0.1, response={"text": "Hola"}),
+        record("SHAPE", 0.2, response={"text": "Hola"}),
+        record("ERROR", 0.3),
+    ]
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://test"
+    )
+
+    begin = time.perf_counter()
+    report = await replay.Replay(client, "/invoke", records, speed=2).run()
+    assert time.perf_counter() - begin >= 0.15
+    assert report["requests"] == 4
+    assert report["errors"] == 1
+    assert report["status_mismatches"] == 1
+    assert report["shape_mismatches"] == 1
+    assert report["intents"]["OK"]["shape_mismatches"] == 0
+    assert report["intents"]["SHAPE"]["shape_mismatches"] == 1
+    assert report["recorded"]["max"] == 10
+
+    report = await replay.Replay(client, "/invoke", records, None, 2).run()
+    assert report["requests"] == 4 and report["speed"] == "max"
+
+
+def test_execute(scaffold, capsys, tmp_path):
+    from skill_sdk.cli import import_module_app
+
+    _, app = import_module_app(APP)
+    body = invoke_examples(app.intents)["SMALLTALK__GREETINGS"]
+    app.close()
+    sys.modules.pop("app")
+    sys.modules.pop("impl")
+
+    capture = tmp_path / "capture.jsonl"
+    capture.write_text(
+        json.dumps(
+            dict(
+                timestamp=1.0,
+                intent="SMALLTALK__GREETINGS",
+                latency=0.01,
+                status=200,
+                request=body,
+                response={"type": "TELL", "text": "Hallo", "result": None},
+            )
+        )
+    )
+
+    report = replay.execute(Namespace(module=APP, capture=[str(capture)], speed="max"))
+    assert report["requests"] == 1
+    assert report["status_mismatches"] == 0
+    assert report["shape_mismatches"] == 1
+    assert "SMALLTALK__GREETINGS" in capsys.readouterr().out
+
+    sys.modules.pop("app")
+    sys.modules.pop("impl")
+    with pytest.raises(SystemExit):
+        replay.execute(Namespace(module=APP, capture=[str(capture)], strict=True))
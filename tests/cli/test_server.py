@@ -0,0 +1,96 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import os
+import signal
+import asyncio
+from unittest import mock
+
+import pytest
+import uvicorn
+
+from skill_sdk import init_app
+from skill_sdk.config import settings
+from skill_sdk.cli import server
+from skill_sdk.cli.server import Server
+
+
+@pytest.mark.asyncio
+async def test_shutdown_drains_app(monkeypatch):
+    monkeypatch.setattr(server, "ACCEPT_GRACE_PERIOD", 0)
+    monkeypatch.setattr(settings, "DRAIN_GRACE_PERIOD", 0)
+    calls = []
+    app = mock.Mock(draining=False)
+    app.drain = mock.AsyncMock(side_effect=lambda: calls.append("drain"))
+    listener = mock.Mock()
+    listener.close.side_effect = lambda: calls.append(("close", app.draining))
+
+    srv = Server(uvicorn.Config(app))
+    srv.servers = [listener]
+    with mock.patch.object(
+        uvicorn.Server,
+        "shutdown",
+        side_effect=lambda *a, **kw: calls.append("shutdown"),
+    ):
+        await srv.shutdown()
+
+    # Readiness probe fails before the listeners are closed
+    assert calls == [("close", True), "drain", "shutdown"]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_grace_period(monkeypatch):
+    monkeypatch.setattr(server, "ACCEPT_GRACE_PERIOD", 0)
+    monkeypatch.setattr(settings, "DRAIN_GRACE_PERIOD", 0.2)
+    app = init_app(develop=False)
+    listener = mock.Mock()
+
+    srv = Server(uvicorn.Config(app))
+    srv.servers = [listener]
+    with mock.patch.object(uvicorn.Server, "shutdown", mock.AsyncMock()):
+        shutdown = asyncio.create_task(srv.shutdown())
+        await asyncio.sleep(0.1)
+
+        # Not ready, but still accepting connections and invokes
+        assert app.draining and not app.rejecting
+        listener.close.assert_not_called()
+
+        await shutdown
+
+    listener.close.assert_called_once()
+    assert app.rejecting
+    app.close()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_sigint_skips_grace_period(monkeypatch):
+    monkeypatch.setattr(server, "ACCEPT_GRACE_PERIOD", 0)
+    monkeypatch.setattr(settings, "DRAIN_GRACE_PERIOD", 10)
+    app = mock.Mock(draining=False, drain=mock.AsyncMock())
+
+    srv = Server(uvicorn.Config(app))
+    srv.handle_exit(signal.SIGINT, None)
+    srv.handle_exit(signal.SIGTERM, None)
+    with mock.patch.object(uvicorn.Server, "shutdown", mock.AsyncMock()):
+        await asyncio.wait_for(srv.shutdown(), 1)
+
+    assert not app.draining
+    app.drain.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_startup_reports_ready():
+    read_fd, write_fd = os.pipe()
+    srv = Server(uvicorn.Config(mock.Mock()), write_fd)
+    srv.started = True
+    with mock.patch.object(uvicorn.Server, "startup", mock.AsyncMock()):
+        await srv.startup()
+    assert os.read(read_fd, 1) == b"1"
+    os.close(read_fd)
@@ -0,0 +1,136 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+import sys
+import asyncio
+import itertools
+import pkg_resources
+from argparse import Namespace
+
+import pytest
+
+from skill_sdk.cli import bench, init, soak
+
+APP = "app:app"
+
+# Effectively no limits: short soak trends are noise
+NO_LIMITS = [f"{metric}=1e12" for metric in soak.DEFAULT_SLOPES]
+
+
+@pytest.fixture
+def scaffold(monkeypatch):
+    path = pkg_resources.resource_filename(init.__name__, "scaffold")
+    monkeypatch.chdir(path)
+    monkeypatch.syspath_prepend(path)
+    yield path
+    sys.modules.pop("app", None)
+    sys.modules.pop("impl", None)
+
+
+@pytest.fixture
+def leaking_threads(monkeypatch):
+    """Every sample reports one thread more"""
+
+    threads = itertools.count(1)
+    monkeypatch.setattr(
+        soak,
+        "sample",
+        lambda: dict(rss=None, threads=next(threads), fds=3, tasks=1, objects=100),
+    )
+
+
+def test_slope():
+    assert soak.slope([(0, 1), (1, 3), (2, 5)]) == 2
+    assert soak.slope([(0, 1), (1, 0), (2, 1), (3, 0)]) == pytest.approx(-0.2)
+    assert soak.slope([(0, 1)]) is None
+    assert soak.slope([(1, 1), (1, 2)]) is None
+
+
+def test_parse_slopes():
+    slopes = soak.parse_slopes(["rss=100", "threads=0"])
+    assert slopes == {**soak.DEFAULT_SLOPES, "rss": 100, "threads": 0}
+    assert soak.parse_slopes(None) == soak.DEFAULT_SLOPES
+    with pytest.raises(ValueError):
+        soak.parse_slopes(["memory=1"])
+    with pytest.raises(ValueError):
+        soak.parse_slopes(["rss"])
+
+
+def test_growth():
+    before = {"dict": 10, "list": 5, "Request": 1}
+    after = {"dict": 12, "list": 4, "Request": 101, "Future": 3}
+    assert soak.growth(before, after) == {"Request": 100, "Future": 3, "dict": 2}
+    assert soak.growth(before, after, limit=1) == {"Request": 100}
+
+
+@pytest.mark.asyncio
+async def test_sample():
+    sample = soak.sample()
+    assert set(sample) == set(soak.DEFAULT_SLOPES)
+    assert sample["threads"] >= 1
+    assert sample["tasks"] >= 1
+    assert sample["objects"] > 0
+
+
+@pytest.mark.asyncio
+async def test_sampler(leaking_threads):
+    sampler = soak.Sampler(interval=0.01, warmup=0.02, slopes={"threads": 1, "fds": 0})
+    assert await sampler.watch(asyncio.sleep(0.3, "done")) == "done"
+
+    report = sampler.report()
+    assert len(report["samples"]) >= 4
+    assert report["samples"][0]["time"] == 0
+    assert not report["ok"]
+    assert not report["trends"]["threads"]["ok"]
+    assert report["trends"]["threads"]["slope"] > 1
+    assert report["trends"]["fds"] == dict(first=3, last=3, slope=0, limit=0, ok=True)
+    assert report["trends"]["threads"]["first"] > 1  # warm-up samples are ignored
+
+    table = soak.format_table(report)
+    assert "FAIL" in table and "OK" in table
+
+
+def test_execute(scaffold, capsys):
+    report = bench.execute(
+        Namespace(
+            module=APP,
+            concurrency=2,
+            duration=0.5,
+            soak=True,
+            soak_interval=0.1,
+            max_slope=NO_LIMITS,
+        )
+    )
+    assert report["soak"]["ok"]
+    assert len(report["soak"]["samples"]) >= 3
+    assert set(report["soak"]["trends"]) == set(soak.DEFAULT_SLOPES)
+    assert "Slope/h" in capsys.readouterr().out
+
+
+def test_execute_fails(scaffold, leaking_threads):
+    with pytest.raises(SystemExit, match="threads"):
+        bench.execute(
+            Namespace(
+                module=APP, duration=0.3, soak=True, soak_interval=0.05, format="json"
+            )
+        )
+
+
+def test_soak_arguments(scaffold):
+    with pytest.raises(ValueError, match="--url"):
+        bench.execute(Namespace(module=APP, soak=True, url="http://localhost:4242"))
+
+    sys.modules.pop("app")
+    sys.modules.pop("impl")
+    with pytest.raises(ValueError, match="too short"):
+        bench.execute(
+            Namespace(
+                module=APP, soak=True, duration=1, soak_warmup=60, soak_interval=1
+            )
+        )
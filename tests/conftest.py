@@ -8,6 +8,7 @@
 #
 #
 
+import pathlib
 from contextlib import closing
 
 import pytest
@@ -18,3 +19,31 @@ from skill_sdk import skill
 def app():
     with closing(skill.init_app(develop=True)) as app:
         yield app
+
+
+def pytest_addoption(parser):
+    """Hot path benchmarks options: see "tests/benchmarks" """
+
+    group = parser.getgroup("bench", "SDK hot path benchmarks")
+    group.addoption(
+        "--bench",
+        action="store_true",
+        help="Run the benchmarks (skipped by default).",
+    )
+    group.addoption(
+        "--bench-baseline",
+        default=str(pathlib.Path(__file__).parent / "benchmarks" / "baseline.json"),
+        help="Baseline file to compare the results with.",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        help="Allowed slowdown relative to the baseline (0.5 is 50%%), "
+        "overrides the thresholds in the baseline file.",
+    )
+    group.addoption(
+        "--bench-update",
+        action="store_true",
+        help="Write the results to the baseline file.",
+    )
+    group.addoption("--bench-save", help="Write the results to a file.")
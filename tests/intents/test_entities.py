@@ -20,6 +20,8 @@ from skill_sdk.intents.entities import (
     on_off_to_boolean,
     rank,
     convert,
+    convert_all,
+    BatchConversionError,
 )
 from skill_sdk.utils.util import mock_datetime_now
 
@@ -316,6 +318,49 @@ class TestEntityAttributeV2:
             == repr(attr)
         )
 
+    def test_compact(self):
+        attr = AttributeV2({"id": 1, "value": "123456"})
+        assert not hasattr(attr, "__dict__")
+        with pytest.raises(TypeError):
+            attr.value = 1
+        assert attr.copy(update=dict(value=1)).value == 1
+        assert attr.copy(deep=True) == attr
+
+    def test_subscripted(self):
+        attr = AttributeV2[int]({"id": 1, "value": "123456"})
+        assert attr == AttributeV2({"id": 1, "value": "123456"})
+        assert attr.__orig_class__ == AttributeV2[int]
+        with pytest.raises(TypeError):
+            attr.id = 2
+
+    def test_validation(self):
+        from pydantic import ValidationError
+
+        attr = AttributeV2({"id": "1", "value": "123456", "nestedIn": ["2"]})
+        assert (attr.id, attr.nested_in) == (1, [2])
+
+        with pytest.raises(ValidationError):
+            AttributeV2({"id": "not an id", "value": "123456"})
+
+        with pytest.raises(ValidationError):
+            AttributeV2({"value": "123456"})
+
+    def test_export(self):
+        attr = AttributeV2({"id": 1, "value": "123456", "nestedIn": [2]})
+        assert attr.dict() == {
+            "id": 1,
+            "value": "123456",
+            "nestedIn": [2],
+            "overlapsWith": [],
+        }
+        assert attr.model() == entities.AttributeV2Model(**attr.dict())
+        assert attr == attr.dict()
+        assert AttributeV2.schema()["title"] == "AttributeV2"
+
+        from skill_sdk.intents.request import Context
+
+        assert "AttributeV2" in Context.schema()["definitions"]
+
 
 class TestConverter:
     def test_converter(self):
@@ -400,3 +445,60 @@ class TestConverter:
         assert entities.to_time(["--12-31"]) == datetime.time(0, 0)
         assert entities.to_time(["--12-31T12:30"]) == datetime.time(12, 30)
         assert entities.to_time([]) == datetime.time.min
+
+
+class TestBatchConverter:
+    def test_convert_all(self):
+        assert convert_all(["1", "2", "3"], int) == [1, 2, 3]
+        assert convert_all(("on", "off"), bool) == [True, False]
+        assert convert_all(["2106-12-31T12:30"], datetime.date) == [
+            datetime.date(2106, 12, 31)
+        ]
+        assert convert_all([]) == []
+
+    def test_errors_reported_in_bulk(self):
+        with pytest.raises(BatchConversionError) as ex:
+            convert_all(["1", "x", "3", "y"], int)
+        assert list(ex.value.errors) == [1, 3]
+        assert all(isinstance(e, ValueError) for e in ex.value.errors.values())
+        assert str(ex.value).startswith("2 of 4 values could not be converted")
+        assert ex.value.results == [1, "x", 3, "y"]
+
+    def test_attr_v2_mixed_types(self):
+        convert_attrs = entities.attr_v2_batch_converter(int)
+        attrs = convert_attrs([{"id": 1, "value": "5"}, {"id": 2, "value": [1]}])
+        assert [attr.value for attr in attrs] == [5, [1]]
+
+        with pytest.raises(BatchConversionError):
+            convert_attrs([{"id": 1, "value": "5"}, {"id": 2, "value": "x"}])
+
+    @pytest.mark.parametrize(
+        "values, to_type",
+        [
+            ([str(i) for i in range(100)], int),
+            ([f"{i}.5" for i in range(100)], float),
+            ([f"2106-12-{1 + i % 28:02}" for i in range(100)], datetime.date),
+            ([f"2106-12-31T{i % 24:02}:30" for i in range(100)], datetime.datetime),
+        ],
+    )
+    def test_vectorized(self, values, to_type):
+        pytest.importorskip("numpy")
+        assert entities._vectorized(to_type, values) == [
+            convert(value, to_type) for value in values
+        ]
+        assert convert_all(values, to_type) == [
+            convert(value, to_type) for value in values
+        ]
+
+    def test_vectorized_fallback(self):
+        pytest.importorskip("numpy")
+        values = ["2106-12-31T12:30Z"] * 100
+        assert entities._vectorized(datetime.datetime, values) is None
+        assert convert_all(values, datetime.datetime)[0] == datetime.datetime(
+            2106, 12, 31, 12, 30, tzinfo=tzutc()
+        )
+
+        values = [str(i) for i in range(99)] + ["not a number"]
+        with pytest.raises(BatchConversionError) as ex:
+            convert_all(values, int)
+        assert list(ex.value.errors) == [99]
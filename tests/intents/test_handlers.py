@@ -130,6 +130,20 @@ class TestHandlerDecorator:
         result = decorated_test(r)
         assert result == [datetime.date(2001, 12, 31), datetime.date(1001, 12, 31)]
 
+    def test_handler_array_errors(self):
+        """Conversion errors of list elements are reported together"""
+        from skill_sdk.intents.entities import BatchConversionError
+
+        @intent_handler
+        def decorated_test(arr: List[int]):
+            return arr
+
+        r = create_request("TEST_CONTEXT", arr=["1", "two", "3", "four"])
+        result = decorated_test(r)
+        assert isinstance(result, EntityValueException)
+        assert isinstance(result.__cause__, BatchConversionError)
+        assert list(result.__cause__.errors) == [1, 3]
+
     def test_handler_date_fail(self):
         """Test date conversion of invalid date"""
 
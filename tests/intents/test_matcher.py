@@ -0,0 +1,93 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import json
+import time
+
+import pytest
+
+from skill_sdk.intents import intent_handler, EntityValueException
+from skill_sdk.intents.matcher import Match, Matcher, normalize
+from skill_sdk.utils.util import create_request
+
+STATIONS = ["Berlin Hbf", "Bonn Hbf", "München Hbf", "Köln Messe/Deutz"]
+
+
+@pytest.fixture
+def matcher():
+    return Matcher(STATIONS)
+
+
+def test_normalize():
+    assert normalize("  Köln  Messe/Deutz ") == "koln messe deutz"
+    assert normalize("Straße") == "strasse"
+
+
+def test_match(matcher):
+    assert matcher.match("münchen") == [Match("München Hbf", 0.7778)]
+    assert matcher.match("Koeln Messe")[0].value == "Köln Messe/Deutz"
+    assert matcher.match("Berlin HBF", k=1) == [Match("Berlin Hbf", 1.0)]
+    assert [m.value for m in matcher.match("hbf", k=2, threshold=0)] == [
+        "Bonn Hbf",
+        "Berlin Hbf",
+    ]
+    assert matcher.match("Hamburg") == []
+    assert matcher.best("Hamburg") is None
+
+
+def test_payloads():
+    matcher = Matcher({"Berlin Hbf": "8011160", "Bonn Hbf": "8000044"})
+    assert matcher.best("berlin").payload == "8011160"
+
+
+def test_from_file(tmp_path):
+    json_file = tmp_path / "catalog.json"
+    json_file.write_text(json.dumps(STATIONS))
+    assert len(Matcher.from_file(json_file)) == 4
+
+    text_file = tmp_path / "catalog.txt"
+    text_file.write_text("\n".join(STATIONS) + "\n\n")
+    assert len(Matcher.from_file(text_file)) == 4
+
+
+def test_refresh(matcher):
+    matcher.refresh(["Hamburg Hbf"])
+    assert matcher.best("hamburg").value == "Hamburg Hbf"
+    assert matcher.best("berlin") is None
+
+    stop = matcher.start_refresh(lambda: STATIONS, 0.01)
+    try:
+        for _ in range(100):
+            if len(matcher) == len(STATIONS):
+                break
+            time.sleep(0.01)
+    finally:
+        stop.set()
+    assert matcher.best("berlin").value == "Berlin Hbf"
+
+
+def test_converter(matcher):
+    @intent_handler
+    def handler(station: matcher, stations: [matcher], candidates: matcher.top(2)):
+        return station, stations, candidates
+
+    r = create_request(
+        "TEST_CONTEXT",
+        station="münchen",
+        stations=["bonn", "berlin"],
+        candidates="hbf",
+    )
+    station, stations, candidates = handler(r)
+    assert station.value == "München Hbf"
+    assert [s.value for s in stations] == ["Bonn Hbf", "Berlin Hbf"]
+    assert len(candidates) == 2
+
+    r = create_request("TEST_CONTEXT", station="Hamburg")
+    assert isinstance(handler(r)[0], EntityValueException)
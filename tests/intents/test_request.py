@@ -67,6 +67,34 @@ class TestContext:
     def test_missing_attribute(self, context):
         assert "Value" == context._get_attr_value("Non-existing", "Value")
 
+    def test_export_attributes_v2(self, context):
+        assert context.dict()["attributesV2"]["timezone"] == [
+            {"id": 0, "value": "Europe/Berlin", "nestedIn": [], "overlapsWith": []}
+        ]
+        assert context.dict(by_alias=False)["attributes_v2"]["timezone"] == [
+            {"id": 0, "value": "Europe/Berlin", "nested_in": [], "overlaps_with": []}
+        ]
+        assert context.dict(by_alias=False, exclude_none=False)["attributes_v2"][
+            "timezone"
+        ] == [
+            {
+                "id": 0,
+                "value": "Europe/Berlin",
+                "nested_in": [],
+                "overlaps_with": [],
+                "extras": None,
+            }
+        ]
+        assert context.dict(
+            include={"attributes_v2": {"timezone": {0: {"value"}}}}
+        ) == {"attributesV2": {"timezone": [{"value": "Europe/Berlin"}]}}
+        exported = context.dict(
+            exclude={"attributes_v2": {"timezone": {"__all__": {"nested_in"}}}}
+        )
+        assert exported["attributesV2"]["timezone"] == [
+            {"id": 0, "value": "Europe/Berlin", "overlapsWith": []}
+        ]
+
 
 def run_thread(func):
     t = threading.Thread(target=func)
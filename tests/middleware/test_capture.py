@@ -0,0 +1,150 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+
+import json
+from contextlib import closing
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from skill_sdk import skill
+from skill_sdk.config import settings
+from skill_sdk.middleware.capture import (
+    CaptureMiddleware,
+    CaptureWriter,
+    hash_session_id,
+    mask_tokens,
+    redact,
+)
+from skill_sdk.utils.util import invoke_examples
+
+TOKEN = "eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxMjM0In0.signature"
+
+
+def test_redact():
+    assert redact(
+        {"tokens": {"cvi": TOKEN}, "list": [f"Bearer {TOKEN}", 1], "text": "Hola"}
+    ) == {"tokens": {"cvi": "eyJ*****"}, "list": ["Bearer eyJ*****", 1], "text": "Hola"}
+
+
+def test_redact_authorization():
+    assert redact({"headers": {"Authorization": "Basic dXNlcjpwYXNz"}}) == {
+        "headers": {"Authorization": "*****"}
+    }
+
+
+def test_mask_tokens():
+    body = {"context": {"intent": "Test_Intent", "tokens": {"oauth": "opaque-1234"}}}
+    assert mask_tokens(body) == {
+        "context": {"intent": "Test_Intent", "tokens": {"oauth": "*****"}}
+    }
+    assert body["context"]["tokens"] == {"oauth": "opaque-1234"}
+    assert mask_tokens({"session": {}}) == {"session": {}}
+
+
+def test_hash_session_id():
+    body = {"session": {"id": "123", "new": True}}
+    hashed = hash_session_id(body)
+    assert hashed["session"]["id"] != "123"
+    assert hashed["session"]["id"] == hash_session_id(body)["session"]["id"]
+    assert hashed["session"]["new"] is True
+    assert body["session"]["id"] == "123"
+
+    assert hash_session_id({"context": {}}) == {"context": {}}
+
+
+def test_writer_rotation(tmp_path):
+    writer = CaptureWriter(str(tmp_path / "capture-{pid}.jsonl"), 100, 2)
+    for i in range(10):
+        writer.write(dict(i=i, text="x" * 50))
+    writer.close()
+
+    files = sorted(_.name for _ in tmp_path.iterdir())
+    assert len(files) == 3
+    assert all(_.startswith("capture-") for _ in files)
+
+
+def test_capture_middleware(tmp_path):
+    app = FastAPI()
+    writer = CaptureWriter(str(tmp_path / "capture.jsonl"), 1024 * 1024, 1)
+    app.add_middleware(CaptureMiddleware, path="/invoke", writer=writer)
+
+    @app.post("/invoke")
+    async def invoke(body: dict):
+        return {"text": "Hola", "token": TOKEN}
+
+    @app.post("/other")
+    async def other():
+        return {}
+
+    client = TestClient(app)
+    body = {
+        "context": {
+            "intent": "Test_Intent",
+            "tokens": {"cvi": TOKEN, "oauth": "opaque-1234"},
+        }
+    }
+    body["session"] = {"id": "123"}
+    assert client.post("/invoke", json=body).status_code == 200
+    assert client.post("/invoke", data=b"not a json").status_code == 422
+    assert client.post("/other", json=body).status_code == 200
+    writer.close()
+
+    [record] = [
+        json.loads(line)
+        for line in (tmp_path / "capture.jsonl").read_text().splitlines()
+    ]
+    assert record["intent"] == "Test_Intent"
+    assert record["status"] == 200
+    assert record["latency"] > 0
+    assert record["request"]["context"]["tokens"] == {"cvi": "*****", "oauth": "*****"}
+    assert "opaque-1234" not in (tmp_path / "capture.jsonl").read_text()
+    assert record["request"]["session"]["id"] != "123"
+    assert record["response"] == {"text": "Hola", "token": "eyJ*****"}
+
+
+def test_capture_sample_rate(tmp_path):
+    app = FastAPI()
+    writer = CaptureWriter(str(tmp_path / "capture.jsonl"), 1024, 1)
+    app.add_middleware(
+        CaptureMiddleware, path="/invoke", writer=writer, sample_rate=0.0
+    )
+
+    @app.post("/invoke")
+    async def invoke():
+        return {}
+
+    TestClient(app).post("/invoke", json={})
+    assert not (tmp_path / "capture.jsonl").exists()
+
+
+def test_capture_setting(monkeypatch, tmp_path):
+    capture = tmp_path / "capture.jsonl"
+    monkeypatch.setenv("CAPTURE", "true")
+    monkeypatch.setenv("CAPTURE_SAMPLE_RATE", "1")
+    monkeypatch.setenv("CAPTURE_FILE", str(capture))
+
+    with closing(skill.init_app(develop=False)) as app:
+        app.include("Test_Intent", handler=lambda: "Hola")
+        with TestClient(app) as client:
+            body = invoke_examples(app.intents)["Test_Intent"]
+            response = client.post(
+                "/v1/skill-noname",
+                json=body,
+                auth=(settings.SKILL_API_USER, settings.SKILL_API_KEY),
+            )
+            assert response.status_code == 200
+
+    [record] = [json.loads(line) for line in capture.read_text().splitlines()]
+    assert record["response"]["text"] == "Hola"
+
+    monkeypatch.delenv("CAPTURE")
+    monkeypatch.delenv("CAPTURE_SAMPLE_RATE")
+    monkeypatch.delenv("CAPTURE_FILE")
+    settings.reload()
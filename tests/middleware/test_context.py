@@ -0,0 +1,119 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from skill_sdk.log import tracing_headers
+from skill_sdk.middleware import context
+from skill_sdk.middleware.log import (
+    ContextMiddleware,
+    HeaderKeys,
+    RequestContext,
+    current,
+)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(ContextMiddleware)
+
+    @app.get("/headers")
+    def headers():
+        request = current()
+        return JSONResponse(
+            dict(
+                headers=tracing_headers(),
+                trace_id=request.trace_id,
+                user_debug_log=request.user_debug_log,
+                data=context.data,
+            )
+        )
+
+    return TestClient(app)
+
+
+def test_context_middleware(client):
+    response = client.get(
+        "/headers",
+        headers={
+            "x-b3-traceid": "trace-id",
+            "X-B3-SpanId": "span-id",
+            "X-User-Debug-Log": "1",
+            "X-Other": "other",
+        },
+    ).json()
+
+    assert response["headers"] == {
+        "X-B3-TraceId": "trace-id",
+        "X-B3-SpanId": "span-id",
+        "X-User-Debug-Log": "1",
+    }
+    assert response["trace_id"] == "trace-id"
+    assert response["user_debug_log"] == "1"
+    assert response["data"][HeaderKeys.tenant_id] is None
+    assert response["data"][HeaderKeys.span_id] == "span-id"
+
+
+def test_context_outside_request():
+    assert tracing_headers() == {}
+    assert current().trace_id is None
+    assert context.data[HeaderKeys.trace_id] is None
+
+
+def test_request_context_immutable():
+    request = RequestContext.from_scope(
+        {
+            "headers": [
+                (b"x-b3-traceid", b"first"),
+                (b"x-b3-traceid", b"second"),
+            ]
+        }
+    )
+    assert request.trace_id == "first"
+    assert request.headers == {HeaderKeys.trace_id: "first"}
+
+    with pytest.raises(TypeError):
+        request.trace_id = "other"
+    with pytest.raises(TypeError):
+        request.headers[HeaderKeys.span_id] = "span"
+    with pytest.raises(TypeError):
+        request.headers.update(other="other")
+
+
+def test_user_debug_flag():
+    import logging
+    from skill_sdk.middleware import log
+
+    app = FastAPI()
+    app.add_middleware(ContextMiddleware)
+    logger = logging.getLogger("test.user_debug")
+    logger.setLevel(logging.INFO)
+
+    @app.get("/debug")
+    def debug():
+        return JSONResponse(
+            dict(
+                flag=log.user_debug.get(),
+                requests=log.debug_requests,
+                enabled=logger.isEnabledFor(logging.DEBUG),
+            )
+        )
+
+    client = TestClient(app)
+    assert client.get("/debug").json() == dict(flag=False, requests=0, enabled=False)
+    assert client.get("/debug", headers={"X-User-Debug-Log": "1"}).json() == dict(
+        flag=True, requests=1, enabled=True
+    )
+    assert log.debug_requests == 0
+    assert logger.isEnabledFor(logging.DEBUG) is False
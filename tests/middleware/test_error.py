@@ -71,3 +71,20 @@ def test_500(app):
     response = client.get("/http-500")
     assert response.status_code == 500
     assert response.json() == dict(code=ErrorCode.INTERNAL_ERROR, text=INTERNAL_ERROR)
+
+
+def test_404_flood(app, caplog):
+    from unittest.mock import patch
+    from skill_sdk import config, log
+    from skill_sdk.middleware import error
+
+    limited = log.RateLimitedLogger(error.logger)
+    client = TestClient(app)
+    with patch.object(error, "rate_limited", limited), patch.object(
+        config.settings, "LOG_RATE_LIMIT", 2
+    ), caplog.at_level("ERROR", error.logger.name):
+        for _ in range(10):
+            assert client.get("/http-404").status_code == 404
+
+    assert len(caplog.records) == 2
+    assert limited._windows[(404, "HTTPException")][2] == 8
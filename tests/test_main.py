@@ -12,7 +12,17 @@ from unittest.mock import patch
 import pytest
 from pytest import CaptureFixture
 from skill_sdk.__main__ import main
-from skill_sdk.cli import init, develop, run, translate, version
+from skill_sdk.cli import (
+    bench,
+    init,
+    develop,
+    openapi,
+    profile_startup,
+    replay,
+    run,
+    translate,
+    version,
+)
 
 
 @pytest.mark.parametrize(
@@ -21,6 +31,10 @@ from skill_sdk.cli import init, develop, run, translate, version
         (["vs", "init"], init),
         (["vs", "run", "impl"], run),
         (["vs", "develop", "impl"], develop),
+        (["vs", "openapi", "impl"], openapi),
+        (["vs", "profile-startup", "impl"], profile_startup),
+        (["vs", "bench", "impl"], bench),
+        (["vs", "replay", "-r", "capture.jsonl", "impl"], replay),
         (["vs", "translate", "impl"], translate),
         (["vs", "version"], version),
     ],
@@ -40,6 +54,8 @@ def test_help(capsys: CaptureFixture):
         with pytest.raises(SystemExit):
             main()
     out = capsys.readouterr()
+    assert "usage: vs [-h] [-v] [-vv] [-q]" in out.out
     assert (
-        "usage: vs [-h] [-v] [-vv] [-q] {init,run,develop,translate,version}" in out.out
+        "{init,run,develop,openapi,profile-startup,bench,replay,translate,version}"
+        in out.out
     )
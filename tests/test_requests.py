@@ -116,3 +116,123 @@ async def test_circuit_breaker():
             c.get(LOCALHOST)
         assert c.circuit_breaker.state.state == CircuitBreakerState.CLOSED
         assert route.called
+
+
+@respx.mock
+def test_partner_timings():
+    import contextvars
+    from skill_sdk.utils import timing
+
+    respx.get(LOCALHOST).mock()
+
+    def run():
+        timings = timing.start()
+        with Client() as c:
+            c.get(LOCALHOST)
+        with Client(name="partner") as c:
+            c.get(LOCALHOST)
+            c.get(LOCALHOST)
+        return timings
+
+    timings = contextvars.copy_context().run(run)
+    assert set(timings.partners) == {"localhost", "partner"}
+
+
+@respx.mock
+@pytest.mark.asyncio
+async def test_dry_run():
+    route = respx.get(LOCALHOST).mock()
+
+    token = skill_sdk.requests.dry_run.set(True)
+    try:
+        with Client() as c:
+            response = c.get(LOCALHOST, params={"q": 1})
+        assert response.status_code == 200 and response.json() == {}
+        assert response.request.url == LOCALHOST
+
+        async with AsyncClient() as c:
+            response = await c.request(method="POST", url=LOCALHOST)
+        assert response.status_code == 200 and response.request.method == "POST"
+    finally:
+        skill_sdk.requests.dry_run.reset(token)
+
+    assert not route.called
+
+
+class TestPartnerMetrics:
+    @staticmethod
+    def sample(name, labels):
+        from prometheus_client import REGISTRY
+
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    @respx.mock
+    def test_latency(self):
+        respx.get("http://partner/api/v1/items/12345").mock()
+        respx.get("http://partner/api/v1/items/by-name/abc").mock()
+        labels = dict(
+            job="skill-noname",
+            partner_name="partner",
+            endpoint="unknown",
+            status="200",
+        )
+        name = "http_partner_request_latency_seconds_count"
+        before = self.sample(name, labels)
+        with Client(name="partner", base_url="http://partner/api") as c:
+            c.get("v1/items/12345")
+            c.get("v1/items/by-name/abc")
+
+        # URL paths are not used as labels
+        assert self.sample(name, labels) - before == 2
+        assert not self.sample(name, dict(labels, endpoint="/api/v1/items/12345"))
+
+    @respx.mock
+    def test_timeout(self):
+        respx.get(LOCALHOST).mock(side_effect=httpx.ConnectTimeout)
+        labels = dict(job="skill-noname", partner_name="localhost")
+        before = self.sample("http_partner_request_timeouts_total", labels)
+        with pytest.raises(httpx.ConnectTimeout):
+            Client().get(LOCALHOST)
+        assert self.sample("http_partner_request_timeouts_total", labels) - before == 1
+
+    @respx.mock
+    def test_circuit_open(self):
+        respx.get(LOCALHOST).mock(return_value=httpx.Response(500))
+        labels = dict(job="skill-noname", partner_name="localhost")
+        before = self.sample("http_partner_circuit_open_total", labels)
+        with Client(circuit_breaker=CircuitBreaker(fail_max=1)) as c:
+            with pytest.raises(Exception):
+                c.get(LOCALHOST)
+            with pytest.raises(Exception):
+                c.get(LOCALHOST)
+        assert self.sample("http_partner_circuit_open_total", labels) - before == 2
+
+    @respx.mock
+    def test_explicit_endpoint(self):
+        respx.get(LOCALHOST + "search").mock()
+        labels = dict(
+            job="skill-noname",
+            partner_name="localhost",
+            endpoint="search",
+            status="200",
+        )
+        name = "http_partner_request_latency_seconds_count"
+        before = self.sample(name, labels)
+        Client().request("GET", LOCALHOST + "search", endpoint="search")
+        assert self.sample(name, labels) - before == 1
+
+    @respx.mock
+    @pytest.mark.asyncio
+    async def test_explicit_endpoint_async(self):
+        respx.get("http://partner/items/42").mock()
+        labels = dict(
+            job="skill-noname",
+            partner_name="partner",
+            endpoint="/items/{id}",
+            status="200",
+        )
+        name = "http_partner_request_latency_seconds_count"
+        before = self.sample(name, labels)
+        async with AsyncClient(name="partner") as c:
+            await c.request("GET", "http://partner/items/42", endpoint="/items/{id}")
+        assert self.sample(name, labels) - before == 1
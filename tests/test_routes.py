@@ -8,6 +8,7 @@
 #
 #
 
+import time
 from base64 import b64encode
 import pytest
 
@@ -181,3 +182,200 @@ def test_response_with_card_and_command(app, client, auth_header):
             "local": True,
         },
     }
+
+
+def test_invoke_phase_timings(app, client, auth_header):
+    from unittest.mock import patch
+    from skill_sdk.utils import timing
+    from skill_sdk.utils.timing import Phase
+
+    @app.intent_handler("Test_Intent")
+    def handler(number: int):
+        return tell(str(number))
+
+    with patch.object(timing, "observe") as observe:
+        response = client.post(
+            ENDPOINT,
+            json=create_request("Test_Intent", number=["1"]).dict(),
+            headers=auth_header,
+        )
+    assert response.status_code == 200
+
+    intent, timings = observe.call_args[0]
+    assert intent == "Test_Intent"
+    assert set(timings.phases) == set(Phase)
+    assert all(seconds >= 0 for seconds in timings.phases.values())
+
+
+def test_invoke_phase_timings_fallback(app, client, auth_header):
+    from unittest.mock import patch
+    from skill_sdk.skill import FALLBACK_INTENT
+    from skill_sdk.utils import timing
+
+    app.include(FALLBACK_INTENT, handler=lambda: "Fallback")
+
+    with patch.object(timing, "observe") as observe:
+        response = client.post(
+            ENDPOINT,
+            json=create_request("Unknown_Intent_42").dict(),
+            headers=auth_header,
+        )
+    assert response.status_code == 200
+
+    intent, _ = observe.call_args[0]
+    assert intent == FALLBACK_INTENT
+
+
+def test_server_timing_header(auth_header):
+    app = init_app(develop=False)
+    app.include("Test_Intent", handler=lambda: "Hola")
+    client = TestClient(app)
+    request = create_request("Test_Intent").dict()
+
+    response = client.post(ENDPOINT, json=request, headers=auth_header)
+    assert "Server-Timing" not in response.headers
+
+    response = client.post(
+        ENDPOINT, json=request, headers={**auth_header, "X-Server-Timing": "1"}
+    )
+    assert "handler;dur=" in response.headers["Server-Timing"]
+    assert "total;dur=" in response.headers["Server-Timing"]
+    app.close()
+
+
+def test_profiler_endpoint(auth_header, monkeypatch):
+    monkeypatch.setenv("PROFILER", "false")
+    app = init_app(develop=True)
+    response = TestClient(app).get(settings.PROFILER_ENDPOINT)
+    assert response.status_code == 404
+    app.close()
+
+    monkeypatch.setenv("PROFILER", "true")
+    app = init_app(develop=True)
+    client = TestClient(app)
+
+    # Authentication is required even in development mode
+    response = client.get(settings.PROFILER_ENDPOINT)
+    assert response.status_code == 401
+
+    response = client.get(
+        settings.PROFILER_ENDPOINT,
+        params={"seconds": 0.05, "frequency": 200},
+        headers=auth_header,
+    )
+    assert response.status_code == 200
+    assert "test_profiler_endpoint" in response.text
+
+    response = client.get(
+        settings.PROFILER_ENDPOINT,
+        params={"seconds": 0.05, "intent": "Not_Invoked"},
+        headers=auth_header,
+    )
+    assert response.status_code == 200
+    assert response.text == ""
+    app.close()
+    monkeypatch.delenv("PROFILER")
+    settings.reload()
+
+
+def test_memory_endpoints(auth_header, monkeypatch):
+    monkeypatch.setenv("MEMORY_DIAGNOSTICS", "true")
+    app = init_app(develop=True)
+    client = TestClient(app)
+    endpoint = settings.MEMORY_ENDPOINT
+
+    assert client.get(f"{endpoint}/gc").status_code == 401
+    assert client.get(f"{endpoint}/gc", headers=auth_header).status_code == 200
+    assert client.get(f"{endpoint}/objects", headers=auth_header).json()["function"] > 0
+
+    response = client.post(f"{endpoint}/snapshots/one", headers=auth_header)
+    assert response.status_code == 409
+
+    response = client.post(f"{endpoint}/tracemalloc/start", headers=auth_header)
+    assert response.json()["tracing"] is True
+    try:
+        client.post(f"{endpoint}/snapshots/one", headers=auth_header)
+        client.post(f"{endpoint}/snapshots/two", headers=auth_header)
+        response = client.get(
+            f"{endpoint}/snapshots/two",
+            params={"base": "one", "limit": 5},
+            headers=auth_header,
+        )
+        assert response.status_code == 200
+        assert len(response.json()) <= 5
+
+        response = client.get(
+            f"{endpoint}/snapshots/two", params={"base": "three"}, headers=auth_header
+        )
+        assert response.status_code == 404
+    finally:
+        response = client.post(f"{endpoint}/tracemalloc/stop", headers=auth_header)
+    assert response.json() == {**response.json(), "tracing": False, "snapshots": []}
+
+    app.close()
+    monkeypatch.delenv("MEMORY_DIAGNOSTICS")
+    settings.reload()
+
+
+@pytest.mark.asyncio
+async def test_drain(auth_header):
+    import asyncio
+    import httpx
+
+    app = init_app(develop=False)
+    release = asyncio.Event()
+
+    async def handler():
+        await release.wait()
+        return "Hola"
+
+    app.include("Test_Intent", handler=handler)
+    request = create_request("Test_Intent").dict()
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get(settings.K8S_READINESS)).status_code == 200
+
+        invoke = asyncio.create_task(
+            client.post(ENDPOINT, json=request, headers=auth_header)
+        )
+        while app.in_flight.count == 0:
+            await asyncio.sleep(0.01)
+
+        drain = asyncio.create_task(app.drain(timeout=5))
+        await asyncio.sleep(0.01)
+
+        assert (await client.get(settings.K8S_READINESS)).status_code == 503
+        assert (await client.get(settings.K8S_LIVENESS)).status_code == 200
+        rejected = await client.post(ENDPOINT, json=request, headers=auth_header)
+        assert rejected.status_code == 503
+        assert not drain.done()
+
+        release.set()
+        assert (await invoke).json()["text"] == "Hola"
+        assert await drain is True
+
+    assert await app.drain(timeout=0)
+    app.close()
+
+
+def test_readiness_while_warming_up(monkeypatch):
+    import threading
+
+    monkeypatch.setenv("WARMUP", "true")
+    app = init_app(develop=False)
+    release = threading.Event()
+    app.include("Test_Intent", handler=lambda: release.wait(5) and "Hola")
+
+    with TestClient(app) as client:
+        assert client.get(settings.K8S_READINESS).status_code == 503
+        assert client.get(settings.K8S_LIVENESS).status_code == 200
+        release.set()
+        for _ in range(100):
+            if not app.warming_up:
+                break
+            time.sleep(0.01)
+        assert client.get(settings.K8S_READINESS).status_code == 200
+
+    app.close()
+    monkeypatch.delenv("WARMUP")
+    settings.reload()
@@ -8,6 +8,7 @@
 #
 #
 
+import json
 from contextlib import closing
 import pytest
 
@@ -154,3 +155,83 @@ def test_init_env_vars(monkeypatch, tmp_path):
 
     with closing(skill.init_app(skill_conf)) as app:
         assert settings.SERVICE_URL == "https://example.com"
+
+
+def test_lean_startup(monkeypatch, tmp_path):
+    from skill_sdk.config import settings
+    from skill_sdk.intents import Context
+
+    monkeypatch.setattr(Context.__config__, "schema_extra", {})
+    monkeypatch.setenv("LEAN_STARTUP", "true")
+
+    with closing(skill.init_app(develop=False)) as app:
+        app.include("Test_Intent", handler=lambda: "Hola")
+        assert app.openapi_url is None
+        client = TestClient(app)
+        assert client.get("/openapi.json").status_code == 404
+        assert client.get("/redoc").status_code == 404
+
+        # Examples are not created at startup
+        assert Context.__config__.schema_extra == {}
+
+        # Precomputed schema is served
+        schema = tmp_path / "openapi.json"
+        schema.write_text(json.dumps(app.openapi(cached=False)))
+        assert "Test_IntentExample" in Context.__config__.schema_extra["examples"]
+
+    monkeypatch.setenv("OPENAPI_SCHEMA_FILE", str(schema))
+    with closing(skill.init_app(develop=False)) as app:
+        client = TestClient(app)
+        assert client.get("/openapi.json").json() == json.loads(schema.read_text())
+
+    monkeypatch.delenv("LEAN_STARTUP")
+    monkeypatch.delenv("OPENAPI_SCHEMA_FILE")
+    settings.reload()
+
+
+def test_rate_limited_log_flushed_on_shutdown(app, caplog):
+    import logging
+    from unittest import mock
+    from skill_sdk import log
+    from skill_sdk.config import settings
+
+    limited = log.RateLimitedLogger(logging.getLogger("test.rate_limited"))
+    with mock.patch.object(settings, "LOG_RATE_LIMIT", 1):
+        limited.allow("key")
+        limited.allow("key")
+
+    with TestClient(app), caplog.at_level(logging.WARNING, "test.rate_limited"):
+        assert not app._log_flush.done()
+        assert caplog.records == []
+
+    assert app._log_flush is None
+    assert [r.getMessage() for r in caplog.records] == [
+        "1 log record(s) with key 'key' suppressed within 60.0 seconds."
+    ]
+
+
+@pytest.mark.parametrize("setting", ["LOG_RATE_LIMIT", "LOG_RATE_LIMIT_INTERVAL"])
+def test_rate_limited_log_flush_disabled(app, setting):
+    from unittest import mock
+    from skill_sdk.config import settings
+
+    with mock.patch.object(settings, setting, 0), TestClient(app):
+        assert app._log_flush is None
+
+
+def test_package_attributes():
+    import subprocess
+    import sys
+
+    code = "; ".join(
+        (
+            "import sys, skill_sdk",
+            "assert 'fastapi' not in sys.modules",
+            "assert skill_sdk.skill.Skill is skill_sdk.Skill",
+            "assert skill_sdk.intents.Request is skill_sdk.Request",
+            "assert skill_sdk.responses.tell is skill_sdk.tell",
+            "assert skill_sdk.i18n.Translations",
+            "assert not hasattr(skill_sdk, 'no_such_module')",
+        )
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -161,6 +161,27 @@ def test_worker_attach(mocker, app):
             pass
 
 
+def test_worker_stopped(mocker, app):
+    import logging
+
+    cancelled = []
+
+    async def worker(queue):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(queue)
+            raise
+
+    mocker.patch.object(ui.notifier, "worker", worker)
+    handlers = list(logging.getLogger().handlers)
+    with TestClient(app):
+        assert len(logging.getLogger().handlers) == len(handlers) + 1
+
+    assert len(cancelled) == 1
+    assert logging.getLogger().handlers == handlers
+
+
 def test_if_ui_generated():
     """Tests files existence, not real UI unit test"""
 
@@ -0,0 +1,33 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import asyncio
+
+import pytest
+
+from skill_sdk.utils.drain import InFlight
+
+
+@pytest.mark.asyncio
+async def test_in_flight():
+    in_flight = InFlight()
+    assert await in_flight.wait(0)
+
+    async def request(delay):
+        with in_flight:
+            await asyncio.sleep(delay)
+
+    task = asyncio.create_task(request(0.05))
+    await asyncio.sleep(0)
+    assert in_flight.count == 1
+    assert not await in_flight.wait(0.01)
+    assert await in_flight.wait(1)
+    assert in_flight.count == 0
+    await task
@@ -0,0 +1,79 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import tracemalloc
+
+import pytest
+
+from skill_sdk.utils import memory
+
+
+class Leak:
+    pass
+
+
+@pytest.fixture
+def tracing():
+    memory.start(frames=5)
+    yield
+    memory.stop()
+
+
+def test_snapshot_diff(tracing):
+    memory.take_snapshot("before")
+    leak = [Leak() for _ in range(1000)]  # noqa
+    memory.take_snapshot("after")
+
+    assert memory.status()["snapshots"] == ["before", "after"]
+
+    top = memory.statistics("after", "before", limit=5)
+    assert any(
+        __file__ in stat["location"] and stat["count_diff"] >= 1000 for stat in top
+    )
+
+    top = memory.statistics("after", "before", group_by="traceback", limit=5)
+    assert all("traceback" in stat for stat in top)
+
+    top = memory.statistics("after", limit=3)
+    assert len(top) == 3 and "size_diff" not in top[0]
+
+    with pytest.raises(KeyError):
+        memory.statistics("after", "missing")
+
+    with pytest.raises(ValueError):
+        memory.statistics("after", group_by="function")
+
+
+def test_snapshots_limit(tracing):
+    for name in "abc":
+        memory.take_snapshot(name, keep=2)
+    assert memory.status()["snapshots"] == ["b", "c"]
+
+
+def test_stop_discards_snapshots(tracing):
+    memory.take_snapshot("one")
+    status = memory.stop()
+    assert status["tracing"] is False and status["snapshots"] == []
+    assert not tracemalloc.is_tracing()
+
+    with pytest.raises(RuntimeError):
+        memory.take_snapshot("two")
+
+
+def test_object_counts():
+    leak = [Leak() for _ in range(100)]  # noqa
+    counts = memory.object_counts(limit=1000)
+    assert counts["Leak"] >= 100
+
+
+def test_gc_stats():
+    stats = memory.gc_stats()
+    assert len(stats["generations"]) == 3
+    assert len(stats["thresholds"]) == 3
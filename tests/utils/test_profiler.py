@@ -0,0 +1,71 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import sys
+import time
+import threading
+
+import pytest
+
+from skill_sdk.utils.util import create_request
+from skill_sdk.utils.profiler import (
+    ProfilerBusy,
+    SamplingProfiler,
+    _lock,
+    collapse,
+)
+
+
+def test_collapse():
+    def inner():
+        return collapse(sys._getframe())
+
+    stack = inner().split(";")
+    assert stack[-1].startswith("inner (")
+    assert stack[-2].startswith("test_collapse (")
+
+
+def busy_handler(request, stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_sampling_profiler():
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=busy_handler, args=(create_request("BUSY_INTENT"), stop)
+    )
+    worker.start()
+    try:
+        all_threads = SamplingProfiler(frequency=500).run(0.05)
+        intent = SamplingProfiler(frequency=500, intent="BUSY_INTENT").run(0.05)
+        other = SamplingProfiler(frequency=500, intent="OTHER_INTENT").run(0.05)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert all_threads.samples > 1
+    assert any("busy_handler" in stack for stack in all_threads.stacks)
+    # Profiler's own thread is not sampled
+    assert not any("SamplingProfiler" in stack for stack in all_threads.stacks)
+
+    assert intent.stacks
+    assert all("busy_handler" in stack for stack in intent.stacks)
+    assert other.stacks == {}
+
+    lines = intent.collapsed().split("\n")
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == intent.samples
+
+
+def test_profiler_busy():
+    with _lock:
+        with pytest.raises(ProfilerBusy):
+            SamplingProfiler().run(0.01)
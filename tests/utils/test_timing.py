@@ -0,0 +1,62 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import contextvars
+
+from skill_sdk.config import settings
+from skill_sdk.utils import timing
+from skill_sdk.utils.timing import Phase
+
+
+def test_not_collecting():
+    def run():
+        with timing.measure(Phase.handler):
+            pass
+        timing.add(Phase.decode, 1)
+        return timing.current()
+
+    assert contextvars.copy_context().run(run) is None
+
+
+def test_measure():
+    def run():
+        timings = timing.start()
+        with timing.measure(Phase.handler, exclude=Phase.conversion):
+            timing.add(Phase.conversion, 100)
+        timing.add(Phase.decode, 1)
+        timing.add(Phase.decode, 2)
+        return timings
+
+    timings = contextvars.copy_context().run(run)
+    assert timings.phases[Phase.conversion] == 100
+    assert timings.phases[Phase.decode] == 3
+    assert timings.phases[Phase.handler] < 0
+
+
+def test_observe():
+    from skill_sdk.middleware.prometheus import Prometheus
+
+    timings = timing.Timings()
+    timings.add(Phase.enrich, 0.5)
+    timing.observe("TEST_INTENT", timings)
+
+    histogram = Prometheus.invoke_phase_latency()
+    sample = histogram.labels(settings.SKILL_NAME, "TEST_INTENT", "enrich")
+    assert sample._sum.get() >= 0.5
+
+
+def test_server_timing():
+    timings = timing.Timings()
+    timings.add(Phase.decode, 0.001)
+    timings.add_partner("weather service", 0.0425)
+    header = timings.server_timing()
+    assert header.startswith(
+        "decode;dur=1.00, partner.weather_service;dur=42.50, total;dur="
+    )
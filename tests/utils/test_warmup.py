@@ -0,0 +1,55 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import asyncio
+
+import pytest
+
+from skill_sdk import Response, init_app
+from skill_sdk.requests import AsyncClient
+from skill_sdk.utils import warmup
+
+
+@pytest.fixture
+def app():
+    app = init_app(develop=False)
+    yield app
+    app.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_up(app):
+    calls = []
+
+    async def weather(city: str):
+        async with AsyncClient() as client:
+            response = await client.get("http://weather.invalid/current")
+        calls.append((city, response.json()))
+        return Response(f"Sunny in {city}")
+
+    def broken():
+        raise RuntimeError("Broken")
+
+    app.include("WEATHER", handler=weather)
+    app.include("BROKEN", handler=broken)
+
+    assert await warmup.warm_up(app) == (2, 1)
+    assert calls == [("value", {})]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_timeout(app):
+    async def slow():
+        await asyncio.sleep(10)
+
+    app.include("SLOW", handler=slow)
+    app.warming_up = True
+    await app.warm_up(timeout=0.01)
+    assert app.warming_up is False
@@ -0,0 +1,83 @@
+#
+# voice-skill-sdk
+#
+# (C) 2021, Deutsche Telekom AG
+#
+# This file is distributed under the terms of the MIT license.
+# For details see the file LICENSE in the top directory.
+#
+#
+
+import time
+import asyncio
+import logging
+
+import pytest
+
+from skill_sdk.utils.util import create_request
+from skill_sdk.utils.watchdog import Watchdog, find_intent, UNKNOWN_INTENT
+
+
+@pytest.mark.asyncio
+async def test_blocking_call(caplog):
+    watchdog = Watchdog(interval=0.01, threshold=0.05)
+    await watchdog.start()
+
+    async def handler(request):
+        time.sleep(0.3)
+
+    with caplog.at_level(logging.WARNING, "skill_sdk.utils.watchdog"):
+        await handler(create_request("BLOCKING_INTENT"))
+        await asyncio.sleep(0.05)
+    await watchdog.stop()
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "intent 'BLOCKING_INTENT'" in message
+    assert "time.sleep(0.3)" in message
+
+
+@pytest.mark.asyncio
+async def test_no_blocking(caplog):
+    watchdog = Watchdog(interval=0.01, threshold=0.05)
+    with caplog.at_level(logging.WARNING, "skill_sdk.utils.watchdog"):
+        await watchdog.start()
+        await asyncio.sleep(0.2)
+        await watchdog.stop()
+    assert caplog.records == []
+
+
+def test_find_intent():
+    import sys
+
+    assert find_intent(sys._getframe()) == UNKNOWN_INTENT
+
+    def inner(request):
+        return find_intent(sys._getframe())
+
+    assert inner(create_request("TEST_INTENT")) == "TEST_INTENT"
+
+
+def test_report_handled_intent():
+    from unittest import mock
+    from skill_sdk import init_app
+    from skill_sdk.skill import FALLBACK_INTENT
+    from skill_sdk.utils import watchdog as module
+
+    app = init_app(develop=False)
+    app.include("Test_Intent", handler=lambda: "Hola")
+    app.include(FALLBACK_INTENT, handler=lambda: "Fallback")
+    watchdog = Watchdog(app=app)
+
+    counter = mock.Mock()
+    with mock.patch.object(module, "_metrics", return_value=(None, counter)):
+        for intent in ("Test_Intent", "Unknown_Intent_42", UNKNOWN_INTENT):
+            with mock.patch.object(module, "find_intent", return_value=intent):
+                watchdog.report(None, 1.0)
+
+    assert [call.args[1] for call in counter.labels.call_args_list] == [
+        "Test_Intent",
+        FALLBACK_INTENT,
+        UNKNOWN_INTENT,
+    ]
+    app.close()